@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+
+# Set to 0 to turn every limiter into a no-op (fixed concurrency, as before)
+ADAPTIVE_LIMITS = os.getenv("ADAPTIVE_LIMITS", "1") != "0"
+
+# Starting point and bounds per kind of resource; a limiter named "host:example.com" uses "host"
+LIMITER_DEFAULTS = {
+    # A desktop call takes 30 ms (a key press) or seconds (a screenshot, a slow command)
+    # depending on what it does, so only throttling and timeouts count as congestion
+    "orgo": {"initial": 8, "min_limit": 1, "max_limit": 64, "latency_tolerance": None},
+    # Response times follow response length, so only a large slowdown counts as congestion
+    "llm": {"initial": 2, "min_limit": 1, "max_limit": 16, "latency_tolerance": 4.0},
+    "host": {"initial": 4, "min_limit": 1, "max_limit": 16},
+}
+
+# Exception class names (anywhere in the MRO) that mean "back off": timeouts from
+# requests/httpx/asyncio and the Google API's throttling and availability errors
+OVERLOAD_ERRORS = {
+    "TimeoutError", "Timeout", "TimeoutException", "DeadlineExceeded",
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+}
+
+
+def is_overload(outcome):
+    """True for a 429/5xx status, or an error carrying one, or a timeout"""
+    if isinstance(outcome, int):
+        return outcome == 429 or outcome >= 500
+    status = getattr(outcome, "status_code", None)
+    if status is None:
+        status = getattr(getattr(outcome, "response", None), "status_code", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    return any(cls.__name__ in OVERLOAD_ERRORS for cls in type(outcome).__mro__)
+
+
+class AIMDLimiter:
+    """Concurrency limit found by additive increase, multiplicative decrease.
+
+    Each healthy call while the limit is in use adds increase/limit, so the
+    limit grows by about `increase` per round of calls. An overloaded call
+    (429, 5xx, timeout) or one slower than latency_tolerance times the
+    lowest recent latency of the same operation cuts the limit by `backoff`,
+    at most once per round trip so one burst of failures counts as one
+    congestion signal. latency_tolerance=None leaves latency out of it.
+    Works from threads (acquire/slot) and event loops (acquire_async/slot_async).
+    """
+
+    def __init__(self, name, initial=4, min_limit=1, max_limit=64, increase=1.0, backoff=0.5,
+                 latency_tolerance=1.5, history=240):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        # operation -> lowest recent latency; operations differ too much to share one floor
+        self.min_latency = {}
+        self.stats = {"calls": 0, "overloads": 0, "slow": 0, "increases": 0, "decreases": 0}
+        # (monotonic time, limit) after every change, for plotting convergence
+        self.history = deque(maxlen=history)
+        self._last_cut = 0.0
+        self._last_sample = {}
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+        self._listeners = []
+
+    @property
+    def current(self):
+        return int(self.limit)
+
+    def subscribe(self, callback):
+        """Call callback(limit) whenever the integer limit changes, e.g. to resize a scheduler"""
+        self._listeners.append(callback)
+
+    def acquire(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < self.current and not self._async_waiters, timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self.in_flight < self.current and not self._async_waiters:
+                self.in_flight += 1
+                return
+            # [loop, future, granted]; a release hands the slot over before waking the waiter
+            waiter = [loop, loop.create_future(), False]
+            self._async_waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._cond:
+                if waiter[2]:
+                    self.in_flight -= 1
+                    self._wake_locked()
+                else:
+                    self._async_waiters.remove(waiter)
+            raise
+
+    def _wake_locked(self):
+        while self._async_waiters and self.in_flight < self.current:
+            waiter = self._async_waiters.popleft()
+            waiter[2] = True
+            self.in_flight += 1
+            loop, future = waiter[0], waiter[1]
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+        self._cond.notify_all()
+
+    def release(self, latency=None, overloaded=False, operation=None):
+        """Free a slot and feed the call's latency and outcome into the limit"""
+        with self._cond:
+            before = self.current
+            self._record_locked(latency, overloaded, operation)
+            self.in_flight -= 1
+            self._wake_locked()
+            after = self.current
+        if after != before:
+            for callback in list(self._listeners):
+                try:
+                    callback(after)
+                except Exception as e:
+                    print(f"⚠️  Warning: Limiter listener failed: {e}")
+
+    def _record_locked(self, latency, overloaded, operation=None):
+        now = time.monotonic()
+        self.stats["calls"] += 1
+        slow = False
+        if latency is not None and not overloaded and self.latency_tolerance:
+            # The floor drifts up 1% a second so a permanently slower service is relearned
+            floor = self.min_latency.get(operation)
+            drift = 1 + 0.01 * (now - self._last_sample.get(operation, now))
+            floor = latency if floor is None else min(latency, floor * drift)
+            self.min_latency[operation] = floor
+            self._last_sample[operation] = now
+            slow = latency > floor * self.latency_tolerance
+        if overloaded or slow:
+            self.stats["overloads" if overloaded else "slow"] += 1
+            if now - self._last_cut >= (latency or 0.0):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_cut = now
+                self.stats["decreases"] += 1
+                self.history.append((now, round(self.limit, 2)))
+        elif self.in_flight * 2 >= self.current and self.limit < self.max_limit:
+            # Only grow when at least half the limit is in use; idle headroom proves nothing
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self.stats["increases"] += 1
+            self.history.append((now, round(self.limit, 2)))
+
+    @contextmanager
+    def slot(self, operation=None):
+        self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.release(time.perf_counter() - started, is_overload(e), operation)
+            raise
+        except BaseException:
+            # Cancelled runs say nothing about the service
+            self.release()
+            raise
+        self.release(time.perf_counter() - started, operation=operation)
+
+    @asynccontextmanager
+    async def slot_async(self, operation=None):
+        await self.acquire_async()
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.release(time.perf_counter() - started, is_overload(e), operation)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.perf_counter() - started, operation=operation)
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._async_waiters),
+                "min_latency_s": {str(op or "*"): round(floor, 4) for op, floor in self.min_latency.items()},
+                **self.stats,
+            }
+
+
+class _Unlimited:
+    """Stand-in when ADAPTIVE_LIMITS=0"""
+
+    current = None
+
+    def subscribe(self, callback):
+        pass
+
+    @contextmanager
+    def slot(self, operation=None):
+        yield
+
+    @asynccontextmanager
+    async def slot_async(self, operation=None):
+        yield
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name):
+    """Shared limiter per resource: "orgo", "llm" or "host:<netloc>" """
+    if not ADAPTIVE_LIMITS:
+        return _Unlimited()
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = AIMDLimiter(name, **LIMITER_DEFAULTS.get(name.split(":")[0], LIMITER_DEFAULTS["host"]))
+        return _limiters[name]
+
+
+def get_limiter_metrics():
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.snapshot() for name, limiter in limiters.items()}
+
+
+def simulate(capacity=12, clients=64, duration=6.0, latency=0.05, fixed=None):
+    """Hammer a fake desktop that slows down past `capacity` calls in flight and throttles past twice that.
+
+    Adaptive by default; fixed=N holds concurrency at N instead, for comparison.
+    """
+    from fakes import FaultInjectingComputer
+    from resilience import ResilientComputer
+
+    fake = FaultInjectingComputer(latency=latency, capacity=capacity)
+    # Judged like the production Orgo limiter: throttling and timeouts only
+    limiter = AIMDLimiter("sim", initial=fixed or 4, min_limit=fixed or 1, max_limit=fixed or clients,
+                          latency_tolerance=LIMITER_DEFAULTS["orgo"]["latency_tolerance"])
+    computer = ResilientComputer(fake, limiter=limiter)
+    counts = {"ok": 0, "throttled": 0}
+    counts_lock = threading.Lock()
+    samples = []
+    stop = threading.Event()
+
+    def client():
+        while not stop.is_set():
+            try:
+                computer.key("a")
+                outcome = "ok"
+            except Exception:
+                outcome = "throttled"
+            with counts_lock:
+                counts[outcome] += 1
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    while time.monotonic() - started < duration:
+        time.sleep(0.1)
+        samples.append(limiter.current)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    settled = samples[len(samples) // 2:]
+    return {
+        "mode": f"fixed {fixed}" if fixed else "adaptive",
+        "capacity": capacity,
+        "calls_per_s": round(counts["ok"] / duration, 1),
+        "throttled": counts["throttled"],
+        "limit_settled_mean": round(sum(settled) / len(settled), 1),
+        "limit_settled_range": (min(settled), max(settled)),
+    }
+
+
+if __name__ == "__main__":
+    for capacity in (12, 30):
+        for fixed in (None, 2, 64):
+            print(f"🎚️  {simulate(capacity=capacity, fixed=fixed)}")
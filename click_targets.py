@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+
+# Used when a screenshot cannot be analysed
+DEFAULT_CLICK_POSITIONS = [(512, 384), (100, 100), (924, 100), (512, 100)]
+
+CELL_SIZE = 8
+# Firefox tabs, toolbar and address bar occupy the top of the desktop
+BROWSER_CHROME_HEIGHT = 90
+# Rough rendered width of a button label: pixels per character plus padding
+CHAR_WIDTH = 8
+BUTTON_PADDING = 24
+
+
+def to_gray(image):
+    """PIL image or HxW[xC] array -> float32 grayscale array"""
+    pixels = np.asarray(image)
+    if pixels.ndim == 3:
+        pixels = pixels[..., :3].astype(np.float32)
+        return pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return pixels.astype(np.float32)
+
+
+def cell_view(array, cell):
+    rows, cols = array.shape[0] // cell, array.shape[1] // cell
+    return array[:rows * cell, :cols * cell].reshape(rows, cell, cols, cell)
+
+
+def label_components(mask):
+    """4-connected component labels via vectorised min-label propagation (0 = background)"""
+    labels = np.where(mask, np.arange(1, mask.size + 1).reshape(mask.shape), 0)
+    big = mask.size + 1
+    while True:
+        padded = np.pad(np.where(mask, labels, big), 1, constant_values=big)
+        neighbours = np.minimum.reduce([
+            padded[1:-1, 1:-1], padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]
+        ])
+        updated = np.where(mask, neighbours, 0)
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def expected_widths(button_texts):
+    """Approximate on-screen widths of buttons with these labels"""
+    lengths = [len(" ".join(str(text).split())) for text in button_texts or []]
+    return np.array([n * CHAR_WIDTH + BUTTON_PADDING for n in lengths if n], dtype=np.float32)
+
+
+def discover_targets(image, max_targets=8, button_texts=None, cell=CELL_SIZE, top_margin=BROWSER_CHROME_HEIGHT):
+    """Rank screen regions that look like clickable controls.
+
+    Combines edge density, local contrast and colour blobs that stand out
+    from the page background, groups them into connected components and
+    scores each by size, shape and contrast. With button_texts (from the
+    scrape) a region about as wide as one of the labels would render ranks
+    higher, and no more targets are returned than there are buttons.
+    """
+    gray = to_gray(image)
+    height, width = gray.shape
+    widths = expected_widths(button_texts)
+
+    # Edge map from horizontal and vertical intensity steps
+    edges = np.zeros_like(gray, dtype=bool)
+    edges[:, 1:] |= np.abs(np.diff(gray, axis=1)) > 24
+    edges[1:, :] |= np.abs(np.diff(gray, axis=0)) > 24
+
+    cells = cell_view(gray, cell)
+    cell_mean = cells.mean(axis=(1, 3))
+    cell_std = cells.std(axis=(1, 3))
+    edge_density = cell_view(edges, cell).mean(axis=(1, 3))
+
+    background = np.median(cell_mean)
+    blob = np.abs(cell_mean - background) > 40
+    mask = (edge_density > 0.08) | blob
+    mask[: (top_margin + cell - 1) // cell, :] = False
+
+    labels = label_components(mask)
+    ids, counts = np.unique(labels[labels > 0], return_counts=True)
+    if not len(ids):
+        return []
+
+    rows, cols = np.indices(labels.shape)
+    flat = labels.ravel()
+    order = np.argsort(flat, kind="stable")
+    sorted_labels = flat[order]
+    starts = np.searchsorted(sorted_labels, ids)
+    ends = starts + counts
+
+    targets = []
+    for component, start, end in zip(ids, starts, ends):
+        members = order[start:end]
+        r, c = rows.ravel()[members], cols.ravel()[members]
+        top, bottom, left, right = r.min(), r.max() + 1, c.min(), c.max() + 1
+        box_cells = (bottom - top) * (right - left)
+        fill = len(members) / box_cells
+        aspect = (right - left) / (bottom - top)
+
+        contrast = float(cell_std.ravel()[members].mean() + np.abs(cell_mean.ravel()[members] - background).mean())
+        # Controls are compact, fairly solid and wider than tall; large text blocks and slivers are not
+        size_score = np.exp(-((np.log(box_cells) - np.log(24)) ** 2) / 2.0)
+        shape_score = 1.0 if 1.0 <= aspect <= 8.0 else 0.4
+        score = float(size_score * shape_score * (0.5 + fill) * (contrast / 64.0))
+        if len(widths):
+            # Up to double the score for a box whose width matches a scraped label
+            box_width = (right - left) * cell
+            score *= 1.0 + float(np.exp(-(np.log(box_width / widths) ** 2) / 0.08).max())
+
+        targets.append({
+            "x": int((left + right) * cell // 2),
+            "y": int((top + bottom) * cell // 2),
+            "bbox": (int(left * cell), int(top * cell), int(right * cell), int(bottom * cell)),
+            "score": round(score, 4),
+        })
+
+    targets.sort(key=lambda t: t["score"], reverse=True)
+    limit = max_targets if not len(widths) else min(max_targets, len(widths))
+    return targets[:limit]
+
+
+def click_positions_from_screenshot(screenshot, max_targets=4, button_texts=None):
+    """Ranked (x, y) click positions, falling back to the fixed grid if analysis fails"""
+    try:
+        targets = discover_targets(screenshot, max_targets=max_targets, button_texts=button_texts)
+    except Exception:
+        targets = []
+    if not targets:
+        return list(DEFAULT_CLICK_POSITIONS), "default"
+    return [(t["x"], t["y"]) for t in targets], "discovered"
+
+
+def make_synthetic_screenshot(seed=0, size=(768, 1024), buttons=5, paragraphs=4):
+    """Synthetic page capture with known button boxes, for measuring accuracy"""
+    rng = np.random.default_rng(seed)
+    height, width = size
+    frame = np.full((height, width, 3), 250, dtype=np.uint8)
+    frame[:BROWSER_CHROME_HEIGHT] = 225
+    frame[40:70, 150:900] = 255
+
+    occupied = np.zeros((height, width), dtype=bool)
+    occupied[:BROWSER_CHROME_HEIGHT + 10] = True
+
+    def place(h, w):
+        for _ in range(200):
+            y = int(rng.integers(BROWSER_CHROME_HEIGHT + 20, height - h - 10))
+            x = int(rng.integers(10, width - w - 10))
+            if not occupied[y - 10:y + h + 10, x - 10:x + w + 10].any():
+                occupied[y - 10:y + h + 10, x - 10:x + w + 10] = True
+                return y, x
+        return None
+
+    # Paragraphs: rows of dark "words" separated by gaps
+    for _ in range(paragraphs):
+        spot = place(90, 420)
+        if spot:
+            y, x = spot
+            for line in range(0, 90, 14):
+                cursor = x
+                while cursor < x + 400:
+                    word = int(rng.integers(15, 60))
+                    frame[y + line:y + line + 8, cursor:min(cursor + word, x + 420)] = 60
+                    cursor += word + 6
+
+    # One photo-like image block
+    spot = place(150, 200)
+    if spot:
+        y, x = spot
+        frame[y:y + 150, x:x + 200] = rng.integers(0, 255, size=(150, 200, 3))
+
+    boxes = []
+    for _ in range(buttons):
+        h, w = int(rng.integers(28, 48)), int(rng.integers(80, 180))
+        spot = place(h, w)
+        if not spot:
+            continue
+        y, x = spot
+        frame[y:y + h, x:x + w] = rng.integers(20, 160, size=3)
+        frame[y + h // 2 - 3:y + h // 2 + 3, x + 12:x + w - 12] = 255
+        boxes.append((x, y, x + w, y + h))
+    return frame, boxes
+
+
+def evaluate(frames=50, max_targets=4):
+    """Precision of the top targets and button recall on synthetic screenshots"""
+    hits = clicks = found = total = 0
+    elapsed = 0.0
+    for seed in range(frames):
+        frame, boxes = make_synthetic_screenshot(seed)
+        started = time.perf_counter()
+        targets = discover_targets(frame, max_targets=max_targets)
+        elapsed += time.perf_counter() - started
+
+        def inside(target, box):
+            return box[0] <= target["x"] < box[2] and box[1] <= target["y"] < box[3]
+
+        clicks += len(targets)
+        hits += sum(1 for t in targets if any(inside(t, b) for b in boxes))
+        found += sum(1 for b in boxes if any(inside(t, b) for t in targets))
+        total += min(len(boxes), max_targets)
+
+    return {
+        "frames": frames,
+        "precision": round(hits / clicks, 3) if clicks else 0.0,
+        "recall": round(min(found, total) / total, 3) if total else 0.0,
+        "ms_per_frame": round(elapsed / frames * 1000, 2),
+    }
+
+
+if __name__ == "__main__":
+    print(f"🎯 Click target discovery on synthetic screenshots: {evaluate()}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+import time
+import random
+import asyncio
+import threading
+
+
+class FakeScreenshot:
+    def __init__(self, size):
+        self.size = size
+
+
+class ThrottledError(ConnectionError):
+    """What an overloaded API answers with: HTTP 429"""
+
+    status_code = 429
+
+
+class FaultInjectingComputer:
+    """In-memory stand-in for orgo.Computer that injects latency and failures.
+
+    failure_rate applies to every call; fail_ops maps an operation name to the
+    number of times it should fail before succeeding. With a capacity, calls
+    slow down in proportion once more than `capacity` are in flight and are
+    throttled (ThrottledError) past twice that, like a rate-limited API.
+    exec_outputs maps a command substring to the output exec returns for it,
+    e.g. {"xclip": fixture_html} to stand in for the desktop browser's page.
+    """
+
+    def __init__(self, failure_rate=0.0, latency=0.0, fail_ops=None, hang_ops=None, seed=None, screen_size=(1024, 768),
+                 capacity=None, exec_outputs=None):
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.fail_ops = dict(fail_ops or {})
+        self.hang_ops = set(hang_ops or ())
+        self.screen_size = screen_size
+        self.capacity = capacity
+        self.exec_outputs = dict(exec_outputs or {})
+        self.in_flight = 0
+        self.calls = []
+        self.destroyed = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, operation, *args):
+        with self._lock:
+            self.calls.append((operation, args))
+            remaining = self.fail_ops.get(operation, 0)
+            if remaining:
+                self.fail_ops[operation] = remaining - 1
+            fail = remaining > 0 or self._random.random() < self.failure_rate
+            self.in_flight += 1
+            load = self.in_flight / self.capacity if self.capacity else 1.0
+        try:
+            if load > 2:
+                raise ThrottledError(f"429 Too Many Requests for {operation}")
+            if operation in self.hang_ops:
+                time.sleep(3600)
+            if self.latency:
+                time.sleep(self.latency * max(1.0, load))
+            if fail:
+                raise ConnectionError(f"Injected failure in {operation}")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def exec(self, command):
+        self._call("exec", command)
+        output = next((text for marker, text in self.exec_outputs.items() if marker in command), "")
+        return {"success": True, "output": output, "error": None}
+
+    def left_click(self, x, y):
+        self._call("left_click", x, y)
+        return True
+
+    def type(self, text):
+        self._call("type", text)
+        return True
+
+    def key(self, key):
+        self._call("key", key)
+        return True
+
+    def scroll(self, direction, amount=1):
+        self._call("scroll", direction, amount)
+        return True
+
+    def screenshot(self):
+        self._call("screenshot")
+        return FakeScreenshot(self.screen_size)
+
+    def status(self):
+        self._call("status")
+        return {"status": "running"}
+
+    def destroy(self):
+        self._call("destroy")
+        self.destroyed = True
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Stand-in for genai.GenerativeModel that streams a canned analysis with per-chunk latency"""
+
+    def __init__(self, text="The page is clear and functional. " * 20, chunks=10, latency=0.0):
+        self.text = text
+        self.chunks = chunks
+        self.latency = latency
+        self.prompts = []
+
+    def _pieces(self):
+        size = max(1, len(self.text) // self.chunks)
+        return [self.text[i:i + size] for i in range(0, len(self.text), size)]
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        for piece in self._pieces():
+            time.sleep(self.latency)
+            yield FakeChunk(piece)
+
+    async def generate_content_async(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        return self._stream_async()
+
+    async def _stream_async(self):
+        for piece in self._pieces():
+            await asyncio.sleep(self.latency)
+            yield FakeChunk(piece)
@@ -4,30 +4,152 @@ import os
 import time
 import json
 import re
-import requests
+import uuid
+import asyncio
+import hashlib
+import threading
+import httpx
 from bs4 import BeautifulSoup
 from orgo import Computer
 from dotenv import load_dotenv
 import google.generativeai as genai
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.text import Text
-from rich.layout import Layout
-from rich.columns import Columns
+from prompt_builder import PromptBuilder, estimate_tokens
+from run_history import get_history_store
+from resilience import AsyncComputer, resilient_get_async, run_in_orgo_thread, get_resilience_metrics
+from run_control import CancelToken, RunCancelled
+from click_targets import click_positions_from_screenshot
+from visual_regression import BaselineStore, check_screenshot
+from link_checker import AsyncLinkChecker, get_link_cache, normalize_links, summarize
+from text_dedup import extract_blocks
+from site_metrics import timed_get, performance_report, tracked_metrics
+from resource_sampler import ResourceSampler, SAMPLE_INTERVAL
+from renderers import make_renderer
+from adaptive_limiter import get_limiter
 
 load_dotenv()
 
-class IntelligentWebsiteTester:
-    def __init__(self):
+# Where page content is scraped from: "http" fetches the page itself, "desktop" reads
+# the HTML Firefox rendered on the Orgo desktop, so the page is fetched once and JS runs
+CONTENT_SOURCE = os.getenv("CONTENT_SOURCE", "http")
+CONTENT_SOURCES = ("http", "desktop")
+
+# One exec that prints the URL in Firefox's address bar (where any redirects ended), then the
+# page's live DOM saved with Save Page As, head included. Without a saved file it falls back to
+# copying the page as HTML, which only has the body. Override for desktops without xdotool/xclip;
+# output that does not start with a URL line is read as HTML alone.
+DESKTOP_DOM_COMMAND = os.getenv("DESKTOP_DOM_COMMAND", (
+    "W=$(xdotool search --onlyvisible --class firefox | tail -1); F=/tmp/orgo_page.html; rm -rf $F /tmp/orgo_page_files; "
+    "xdotool windowactivate --sync $W key --clearmodifiers ctrl+s && sleep 1 && "
+    "xdotool type --delay 0 $F && xdotool key Return; "
+    "for i in $(seq 40); do [ -s $F ] && sleep 0.5 && break; sleep 0.25; done; "
+    "[ -s $F ] || { xdotool key --clearmodifiers Escape ctrl+a ctrl+c && sleep 0.5; "
+    "echo \"<title>$(xdotool getwindowname $W | sed 's/ [-—] Mozilla Firefox$//')</title>\" > $F; "
+    "xclip -selection clipboard -o -t text/html >> $F; }; "
+    "xdotool key --clearmodifiers ctrl+l ctrl+c Escape && sleep 0.3; "
+    "xclip -selection clipboard -o; echo; cat $F"
+))
+# Bytes of a page read over HTTP for the head a copied body fragment lacks
+PAGE_HEAD_LIMIT = 64 * 1024
+
+_HEAD_TAG = re.compile(r"<head[\s>]", re.I)
+
+# Seconds a scenario's "Wait for ..." step waits
+SCENARIO_WAIT = 2
+
+# Scenario steps (rendered utils.SCENARIOS templates) that map to a desktop action; the rest are checks
+_SCENARIO_ACTIONS = (
+    ("open", re.compile(r"^Open (Firefox|the browser)", re.I)),
+    ("navigate", re.compile(r"^Navigate to (\S+)", re.I)),
+    ("fill", re.compile(r"^Fill .+? with '?(.*?)'?$", re.I)),
+    ("submit", re.compile(r"^(Click the .*(login|submit)|Submit)", re.I)),
+    ("click", re.compile(r"^Click\b", re.I)),
+    ("scroll", re.compile(r"^Scroll (up|down)\b", re.I)),
+    ("wait", re.compile(r"^Wait\b", re.I)),
+    ("screenshot", re.compile(r"^Take (a|another) screenshot", re.I)),
+    ("report", re.compile(r"^Report the result", re.I)),
+)
+# Steps that ask for something to be done the tester cannot do; they fail instead of becoming checks
+_UNSUPPORTED_ACTION = re.compile(
+    r"^(Open|Go to|Select|Choose|Hover|Drag|Drop|Upload|Press|Type|Enter|Tap|Toggle|Scroll|Double-click|Right-click)\b", re.I
+)
+
+
+def scenario_action(step):
+    """(action, argument) for a scenario step.
+
+    ("check", step) when it is something to verify rather than do, and
+    ("unsupported", step) when it asks for an action with no desktop mapping.
+    """
+    step = re.sub(r"^\d+\.\s*", "", step.strip())
+    for action, pattern in _SCENARIO_ACTIONS:
+        match = pattern.search(step)
+        if match:
+            return action, match.group(1).lower() if action == "scroll" else (
+                match.group(1) if action in ("navigate", "fill") else None
+            )
+    if _UNSUPPORTED_ACTION.search(step):
+        return "unsupported", step
+    return "check", step
+
+class AsyncIntelligentWebsiteTester:
+    """The intelligent tester on asyncio: one event loop can drive many runs at once.
+
+    HTTP goes through httpx, waits through asyncio, and the blocking Orgo
+    SDK through AsyncComputer's shared thread pool. computer_factory and
+    model replace the Orgo desktop and the Gemini model, e.g. with fakes.
+    boilerplate is the BoilerplateFilter of a multi-page run this page belongs to.
+    """
+
+    def __init__(self, prompt_token_budget=None, cancel_token=None, update_baseline=False, renderer=None,
+                 computer_factory=None, model=None, skip_checks=(), content_source=None, scenario_steps=None,
+                 boilerplate=None):
         self.computer = None
+        # Rendered scenario steps run in place of the generic interactions; its checks go to the AI analysis,
+        # judged from the page as the browser shows it after the steps (scenario_content)
+        self.scenario_steps = list(scenario_steps or [])
+        self.scenario_checks = []
+        self.scenario_content = {}
+        self.computer_factory = computer_factory
+        # Optional checks a run plan left out: "links" and/or "visual"
+        self.skip_checks = set(skip_checks)
+        self.content_source = content_source or CONTENT_SOURCE
+        if self.content_source not in CONTENT_SOURCES:
+            raise ValueError(f"Unknown content source '{self.content_source}', expected one of: {', '.join(CONTENT_SOURCES)}")
+        self.link_task = None
+        self.update_baseline = update_baseline
+        self.baseline_store = BaselineStore()
+        self.visual_check = {}
+        self.link_report = {}
+        self.link_cache = get_link_cache()
+        # Only pages of the same multi-page run share one, so later pages drop the site's nav/footer text
+        self.boilerplate = boilerplate
+        self.performance = {}
+        self.resource_sampler = None
+        self.resource_usage = {}
         self.test_results = []
         self.scraped_content = {}
-        self.console = Console()
-        self.setup_gemini()
+        self.analysis_metrics = {}
+        self.ai_analysis = None
+        # Optional callable receiving each streamed chunk of the AI analysis
+        self.on_analysis_chunk = None
+        self.run_id = str(uuid.uuid4())
+        self.stage_timings = {}
+        self.history_store = get_history_store()
+        self.cancel_token = cancel_token or CancelToken()
+        self.resources_freed_at = None
+        self._desktop_lock = threading.Lock()
+        self.prompt_builder = PromptBuilder(prompt_token_budget)
+        # rich, plain, json or none; status messages also reach console.on_message
+        self.console = make_renderer(renderer)
+        self.summary = {}
+        self.setup_gemini(model)
+        
+    def setup_gemini(self, model=None):
+        if model is not None:
+            self.model = model
+            self.gemini_available = True
+            return
         
-    def setup_gemini(self):
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             print("⚠️  Warning: GOOGLE_API_KEY not found. Text analysis will be limited.")
@@ -43,21 +165,36 @@ class IntelligentWebsiteTester:
             print(f"⚠️  Warning: Gemini setup failed: {e}")
             self.gemini_available = False
         
-    def start_virtual_desktop(self):
+    async def start_virtual_desktop(self):
         orgo_key = os.getenv("ORGO_API_KEY")
-        if not orgo_key:
+        if not orgo_key and not self.computer_factory:
             raise ValueError("ORGO_API_KEY not found in environment variables")
         
-        self.computer = Computer(api_key=orgo_key)
+        self.cancel_token.check()
+        computer = await run_in_orgo_thread(self.computer_factory or (lambda: Computer(api_key=orgo_key)))
+        self.computer = AsyncComputer(computer, cancel_token=self.cancel_token)
+        # Free the desktop the moment the run is cancelled, not when the worker notices
+        self.cancel_token.on_cancel(self.destroy_virtual_desktop)
         self.console.print("✅ Virtual desktop started successfully", style="green")
         
     def destroy_virtual_desktop(self):
-        if self.computer:
-            try:
-                self.computer.destroy()
-                self.console.print("✅ Virtual desktop destroyed successfully", style="green")
-            except Exception as e:
-                self.console.print(f"⚠️  Warning: Error destroying virtual desktop: {e}", style="yellow")
+        # Called from the run's own finally block and from cancel callbacks; only the first call destroys
+        with self._desktop_lock:
+            computer, self.computer = self.computer, None
+            if computer:
+                try:
+                    computer.sync.destroy()
+                    self.console.print("✅ Virtual desktop destroyed successfully", style="green")
+                except Exception as e:
+                    self.console.print(f"⚠️  Warning: Error destroying virtual desktop: {e}", style="yellow")
+            if self.resources_freed_at is None:
+                self.resources_freed_at = time.perf_counter()
+    
+    def cancel_latency(self):
+        """Seconds between the cancel request and the desktop being released"""
+        if self.cancel_token.cancelled_at is None or self.resources_freed_at is None:
+            return None
+        return round(max(0.0, self.resources_freed_at - self.cancel_token.cancelled_at), 3)
     
     def log_test_result(self, test_name, status, details=""):
         result = {
@@ -72,8 +209,60 @@ class IntelligentWebsiteTester:
         status_style = "green" if status == "PASS" else "red" if status == "FAIL" else "yellow"
         self.console.print(f"{status_icon} {test_name}: {status} {details}", style=status_style)
     
-    def scrape_website_content(self, url):
-        """Scrape website content using requests and BeautifulSoup"""
+    def extract_content(self, url, final_url, html, filter_boilerplate=True):
+        """Page HTML -> the scraped content dict the tests and the AI analysis work from"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract different types of content with better selectors
+        content = {
+            'url': url,
+            'final_url': final_url,
+            'title': soup.title.string if soup.title else 'No title found',
+            'headings': [h.get_text().strip() for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) if h.get_text().strip()],
+            'links': [a.get('href') for a in soup.find_all('a', href=True) if a.get('href').startswith(('http', '/', '#'))],
+            'buttons': [btn.get_text().strip() for btn in soup.find_all(['button', 'input', 'a']) if btn.get_text().strip()],
+            'meta_description': soup.find('meta', attrs={'name': 'description'})['content'] if soup.find('meta', attrs={'name': 'description'}) else 'No description found',
+            'images': [img.get('alt', 'No alt text') for img in soup.find_all('img') if img.get('alt')],
+            'forms': len(soup.find_all('form')),
+            'total_text': soup.get_text()[:5000]  # First 5000 characters for analysis
+        }
+        
+        # Nested p/div/span repeat each other's text: keep each piece once, in its outermost block
+        boilerplate = self.boilerplate if filter_boilerplate else None
+        paragraphs, page_paragraphs, content['dedup'] = extract_blocks(soup, final_url, boilerplate)
+        content['paragraphs'] = paragraphs
+        
+        # Filter out empty or very short content
+        content['headings'] = [h for h in content['headings'] if len(h) > 2]
+        content['buttons'] = [b for b in content['buttons'] if len(b) > 1]
+        
+        # If no content found, try alternative selectors
+        if not page_paragraphs and not content['headings']:
+            self.console.print("⚠️  [yellow]No content found with standard selectors, trying alternative methods...[/yellow]")
+            
+            # Try to find any text content
+            all_text = soup.get_text()
+            if all_text:
+                # Split by lines and find meaningful content
+                lines = [line.strip() for line in all_text.split('\n') if line.strip() and len(line.strip()) > 10]
+                content['paragraphs'] = lines[:10]  # Take first 10 meaningful lines
+            
+            # Try to find any headings or titles
+            if not content['headings']:
+                # Look for any text that might be headings
+                potential_headings = []
+                for tag in soup.find_all(['div', 'span', 'p']):
+                    text = tag.get_text().strip()
+                    if text and len(text) < 100 and any(char.isupper() for char in text[:10]):
+                        potential_headings.append(text)
+                content['headings'] = potential_headings[:5]
+        
+        # Taken before boilerplate seen on other pages was dropped, so it only changes with this page
+        content['fingerprint'] = self.fingerprint(content['title'], content['headings'], page_paragraphs or content['paragraphs'])
+        return content
+    
+    async def scrape_website_content(self, url):
+        """Scrape website content using httpx and BeautifulSoup"""
         self.console.print("\n🔍 [bold blue]Scraping Website Content[/bold blue]")
         
         try:
@@ -86,68 +275,93 @@ class IntelligentWebsiteTester:
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            async with httpx.AsyncClient(headers=headers, timeout=15, follow_redirects=True) as client:
+                response = await resilient_get_async(url, lambda target: timed_get(client, target))
             response.raise_for_status()
+            self.performance = performance_report(response)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract different types of content with better selectors
-            content = {
-                'url': url,
-                'title': soup.title.string if soup.title else 'No title found',
-                'headings': [h.get_text().strip() for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) if h.get_text().strip()],
-                'paragraphs': [p.get_text().strip() for p in soup.find_all(['p', 'div', 'span']) if p.get_text().strip() and len(p.get_text().strip()) > 20],
-                'links': [a.get('href') for a in soup.find_all('a', href=True) if a.get('href').startswith(('http', '/', '#'))],
-                'buttons': [btn.get_text().strip() for btn in soup.find_all(['button', 'input', 'a']) if btn.get_text().strip()],
-                'meta_description': soup.find('meta', attrs={'name': 'description'})['content'] if soup.find('meta', attrs={'name': 'description'}) else 'No description found',
-                'images': [img.get('alt', 'No alt text') for img in soup.find_all('img') if img.get('alt')],
-                'forms': len(soup.find_all('form')),
-                'total_text': soup.get_text()[:5000]  # First 5000 characters for analysis
-            }
-            
-            # Filter out empty or very short content
-            content['paragraphs'] = [p for p in content['paragraphs'] if len(p) > 10]
-            content['headings'] = [h for h in content['headings'] if len(h) > 2]
-            content['buttons'] = [b for b in content['buttons'] if len(b) > 1]
-            
-            # If no content found, try alternative selectors
-            if not content['paragraphs'] and not content['headings']:
-                self.console.print("⚠️  [yellow]No content found with standard selectors, trying alternative methods...[/yellow]")
-                
-                # Try to find any text content
-                all_text = soup.get_text()
-                if all_text:
-                    # Split by lines and find meaningful content
-                    lines = [line.strip() for line in all_text.split('\n') if line.strip() and len(line.strip()) > 10]
-                    content['paragraphs'] = lines[:10]  # Take first 10 meaningful lines
-                
-                # Try to find any headings or titles
-                if not content['headings']:
-                    # Look for any text that might be headings
-                    potential_headings = []
-                    for tag in soup.find_all(['div', 'span', 'p']):
-                        text = tag.get_text().strip()
-                        if text and len(text) < 100 and any(char.isupper() for char in text[:10]):
-                            potential_headings.append(text)
-                    content['headings'] = potential_headings[:5]
+            # Parsing is CPU-bound; keep it off the event loop the other runs share
+            content = await asyncio.to_thread(self.extract_content, url, str(response.url), response.content)
             
             self.scraped_content = content
             
-            # Provide more detailed logging
-            total_content = len(content['paragraphs']) + len(content['headings']) + len(content['buttons'])
-            
-            if total_content > 0:
-                self.log_test_result("Content Scraping", "PASS", f"Extracted {len(content['paragraphs'])} paragraphs, {len(content['headings'])} headings, {len(content['buttons'])} buttons")
-            else:
-                self.log_test_result("Content Scraping", "WARNING", "Limited content found - site may use JavaScript or be protected")
-            
+            perf = self.performance
+            self.log_test_result(
+                "Site Performance", "PASS",
+                f"TTFB {perf['ttfb_ms']:.0f}ms, total {perf['total_ms']:.0f}ms, "
+                f"{perf['transfer_bytes'] / 1024:.1f} KB transferred ({perf['compression'] or 'uncompressed'}), "
+                f"{perf['redirects']} redirect(s)"
+            )
+            self.log_scraped_content(content)
             return True
             
         except Exception as e:
             self.log_test_result("Content Scraping", "FAIL", f"Error: {str(e)}")
             return False
     
-    def analyze_content_with_gemini(self):
+    async def scrape_desktop_content(self, url):
+        """Single-fetch mode: scrape the HTML Firefox rendered on the desktop instead of fetching the page again"""
+        self.console.print("\n🔍 [bold blue]Scraping Rendered Page from the Desktop[/bold blue]")
+        
+        try:
+            html, final_url = await self.read_desktop_html()
+            content = await asyncio.to_thread(self.extract_content, url, final_url or url, html)
+            if not _HEAD_TAG.search(html):
+                await self.read_page_head(content)
+            self.scraped_content = content
+            self.log_scraped_content(content, source=f"rendered page, {len(html) / 1024:.1f} KB of HTML")
+            return True
+            
+        except Exception as e:
+            # A desktop without the clipboard tools still gets tested, with one extra fetch
+            self.log_test_result("Desktop Scraping", "WARNING", f"{e}; falling back to an HTTP fetch")
+            return await self.scrape_website_content(url)
+    
+    async def read_desktop_html(self):
+        """(HTML, URL) of the page Firefox currently shows on the desktop; the URL is None when not reported"""
+        result = await self.computer.exec(DESKTOP_DOM_COMMAND)
+        output = result.get('output') or ''
+        first_line, _, rest = output.partition('\n')
+        final_url = first_line.strip() if re.match(r"https?://\S+$", first_line.strip()) else None
+        html = rest if final_url else output
+        if not result['success'] or '<' not in html:
+            raise RuntimeError(result.get('error') or "no HTML came back from the desktop browser")
+        return html, final_url
+    
+    async def read_page_head(self, content):
+        """Fill in the title and meta description from the start of the page over HTTP, up to </head>"""
+        head = b""
+        try:
+            async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
+                async with client.stream("GET", content['final_url']) as response:
+                    async for chunk in response.aiter_bytes():
+                        head += chunk
+                        if b"</head>" in head.lower() or len(head) >= PAGE_HEAD_LIMIT:
+                            break
+        except httpx.HTTPError as e:
+            self.console.print(f"⚠️  Warning: Could not read the page head: {e}", style="yellow")
+            return
+        soup = BeautifulSoup(head, 'html.parser')
+        meta = soup.find('meta', attrs={'name': 'description'})
+        if meta and meta.get('content'):
+            content['meta_description'] = meta['content']
+        if soup.title and soup.title.string and content['title'] in (None, '', 'No title found'):
+            content['title'] = soup.title.string
+    
+    def log_scraped_content(self, content, source=None):
+        total_content = len(content['paragraphs']) + len(content['headings']) + len(content['buttons'])
+        if total_content > 0:
+            dedup = content['dedup']
+            self.log_test_result(
+                "Content Scraping", "PASS",
+                f"Extracted {len(content['paragraphs'])} paragraphs, {len(content['headings'])} headings, {len(content['buttons'])} buttons "
+                f"({dedup['nested']} nested, {dedup['near_duplicates']} near-duplicate and {dedup['boilerplate']} boilerplate blocks dropped)"
+                + (f" from the {source}" if source else "")
+            )
+        else:
+            self.log_test_result("Content Scraping", "WARNING", "Limited content found - site may use JavaScript or be protected")
+    
+    async def analyze_content_with_gemini(self):
         """Analyze scraped content using Gemini AI"""
         if not self.gemini_available or not self.scraped_content:
             return None
@@ -155,186 +369,179 @@ class IntelligentWebsiteTester:
         self.console.print("\n🧠 [bold purple]Analyzing Content with AI[/bold purple]")
         
         try:
-            content = self.scraped_content
-            
-            # Check if we have meaningful content to analyze
-            total_content = len(content.get('paragraphs', [])) + len(content.get('headings', []))
+            analysis_prompt, prompt_stats = self.prompt_builder.build(self.scraped_content)
+            if self.scenario_checks and self.scenario_content:
+                analysis_prompt += "\n\n" + self.prompt_builder.scenario_section(self.scenario_checks, self.scenario_content)
+                prompt_stats["prompt_tokens"] = estimate_tokens(analysis_prompt)
+                prompt_stats["prompt_chars"] = len(analysis_prompt)
+            self.console.print(
+                f"📝 Prompt: {prompt_stats['prompt_tokens']}/{prompt_stats['token_budget']} tokens (est.), "
+                f"{prompt_stats['prompt_chars']} chars",
+                style="dim"
+            )
             
-            if total_content == 0:
-                # Handle case where no content was scraped
-                analysis_prompt = f"""
-                Analyze this website based on available information:
-                
-                Website Title: {content.get('title', 'Unknown')}
-                Meta Description: {content.get('meta_description', 'No description available')}
-                URL: {content.get('url', 'Unknown')}
-                
-                Content Status: No readable content was extracted (likely JavaScript-heavy or protected site)
-                
-                Please provide:
-                1. Website Purpose (based on title and URL)
-                2. Technical Assessment (why content might not be accessible)
-                3. Recommendations for testing
-                4. User Experience Considerations
-                5. Security/Protection Analysis
-                
-                Format the response in a clear, structured way suitable for terminal display.
-                Focus on what we can learn from the available information.
-                """
-            else:
-                # Standard analysis with content
-                analysis_prompt = f"""
-                Analyze this website content and provide insights in the following format:
-                
-                Website Title: {content.get('title', 'Unknown')}
-                Meta Description: {content.get('meta_description', 'No description available')}
-                
-                Main Headings: {content.get('headings', [])[:10]}
-                Key Paragraphs: {content.get('paragraphs', [])[:5]}
-                Interactive Elements: {content.get('buttons', [])[:10]}
-                Forms Found: {content.get('forms', 0)}
-                
-                Please provide:
-                1. Website Purpose (1-2 sentences)
-                2. Key Features (bullet points)
-                3. Target Audience
-                4. Content Quality Assessment
-                5. User Experience Insights
-                6. Technical Observations
-                
-                Format the response in a clear, structured way suitable for terminal display.
-                """
+            # Rate limits are shared by every run in the process; 429s shrink the slots
+            async with get_limiter("llm").slot_async():
+                with self.console.progress("Analyzing with Gemini AI...") as progress:
+                    started = time.perf_counter()
+                    time_to_first_token = None
+                    chunks = []
+                    stream = await self.model.generate_content_async(analysis_prompt, stream=True)
+                    async for chunk in stream:
+                        self.cancel_token.check()
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            # Chunks without text parts (e.g. safety metadata) carry nothing to show
+                            continue
+                        if not text:
+                            continue
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - started
+                        chunks.append(text)
+                        if self.on_analysis_chunk:
+                            self.on_analysis_chunk(text)
+                        progress.update(f"Analyzing with Gemini AI... {sum(len(c) for c in chunks)} chars")
+                    response_time = time.perf_counter() - started
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=self.console
-            ) as progress:
-                task = progress.add_task("Analyzing with Gemini AI...", total=None)
-                
-                response = self.model.generate_content(analysis_prompt)
-                progress.update(task, completed=True)
+            self.ai_analysis = "".join(chunks)
+            self.analysis_metrics = dict(
+                prompt_stats,
+                time_to_first_token_s=round(time_to_first_token, 3) if time_to_first_token is not None else None,
+                response_time_s=round(response_time, 3)
+            )
+            first_token_text = f"{time_to_first_token:.2f}s" if time_to_first_token is not None else "n/a"
+            self.console.print(f"⏱️  Gemini first token in {first_token_text}, full response in {response_time:.2f}s", style="dim")
             
-            return response.text
+            return self.ai_analysis
             
         except Exception as e:
             self.console.print(f"❌ AI Analysis failed: {str(e)}", style="red")
             return None
     
-    def display_beautiful_summary(self, url, ai_analysis=None):
-        """Display beautiful formatted summary"""
-        self.console.print("\n" + "="*80)
-        self.console.print("🎯 [bold cyan]INTELLIGENT WEBSITE ANALYSIS REPORT[/bold cyan]", justify="center")
-        self.console.print("="*80)
-        
-        # Website Info Panel
-        website_info = Panel(
-            f"[bold]URL:[/bold] {url}\n"
-            f"[bold]Title:[/bold] {self.scraped_content.get('title', 'N/A')}\n"
-            f"[bold]Analysis Time:[/bold] {time.strftime('%Y-%m-%d %H:%M:%S')}",
-            title="🌐 Website Information",
-            border_style="blue"
-        )
-        
-        # Content Statistics Table
-        stats_table = Table(title="📊 Content Statistics", show_header=True, header_style="bold magenta")
-        stats_table.add_column("Metric", style="cyan")
-        stats_table.add_column("Count", style="green")
-        stats_table.add_column("Details", style="yellow")
-        
+    @staticmethod
+    def fingerprint(title, headings, paragraphs):
+        """Hash of the page's title, headings and text, with digits masked so counters and dates don't count as changes"""
+        text = "\n".join([title or ''] + headings + paragraphs)
+        return hashlib.sha1(re.sub(r"\d+", "#", text).encode("utf-8")).hexdigest()
+    
+    def content_fingerprint(self):
+        """The page's fingerprint, taken before boilerplate seen on other pages was dropped"""
+        return self.scraped_content.get('fingerprint') if self.scraped_content else None
+    
+    def summary_data(self, url, ai_analysis=None):
+        """Everything the final summary shows, as plain data for any renderer"""
         content = self.scraped_content
-        stats_table.add_row("Headings", str(len(content.get('headings', []))), f"Main structure elements")
-        stats_table.add_row("Paragraphs", str(len(content.get('paragraphs', []))), f"Text content blocks")
-        stats_table.add_row("Links", str(len(content.get('links', []))), f"Navigation elements")
-        stats_table.add_row("Buttons", str(len(content.get('buttons', []))), f"Interactive elements")
-        stats_table.add_row("Forms", str(content.get('forms', 0)), f"User input forms")
-        stats_table.add_row("Images", str(len(content.get('images', []))), f"Visual elements")
-        
-        # Test Results Table
-        test_table = Table(title="🧪 Functionality Test Results", show_header=True, header_style="bold green")
-        test_table.add_column("Test", style="cyan")
-        test_table.add_column("Status", style="green")
-        test_table.add_column("Details", style="yellow")
-        test_table.add_column("Time", style="blue")
-        
-        for result in self.test_results:
-            status_icon = "✅" if result["status"] == "PASS" else "❌" if result["status"] == "FAIL" else "⚠️"
-            test_table.add_row(
-                result["test"],
-                f"{status_icon} {result['status']}",
-                result["details"],
-                result["timestamp"]
-            )
-        
-        # Display panels
-        self.console.print(website_info)
-        self.console.print(stats_table)
-        self.console.print(test_table)
-        
-        # AI Analysis Panel
-        if ai_analysis:
-            ai_panel = Panel(
-                ai_analysis,
-                title="🧠 AI-Powered Content Analysis",
-                border_style="purple",
-                width=80
-            )
-            self.console.print(ai_panel)
-        
-        # Key Findings Summary
-        if content.get('headings'):
-            key_headings = content['headings'][:5]
-            findings_panel = Panel(
-                "\n".join([f"• {heading}" for heading in key_headings]),
-                title="📋 Key Page Sections",
-                border_style="green"
-            )
-            self.console.print(findings_panel)
-        
-        # Overall Assessment
         passed_tests = len([r for r in self.test_results if r["status"] == "PASS"])
         total_tests = len(self.test_results)
         success_rate = (passed_tests / total_tests) * 100 if total_tests > 0 else 0
         
-        assessment_style = "green" if success_rate >= 80 else "yellow" if success_rate >= 60 else "red"
-        assessment_text = "Excellent" if success_rate >= 80 else "Good" if success_rate >= 60 else "Needs Improvement"
+        content_statistics = {
+            "Headings": {"count": len(content.get('headings', [])), "details": "Main structure elements"},
+            "Paragraphs": {"count": len(content.get('paragraphs', [])), "details": "Text content blocks, duplicates removed"},
+            "Links": {"count": len(content.get('links', [])), "details": "Navigation elements"},
+        }
+        if self.link_report:
+            content_statistics["Broken Links"] = {"count": self.link_report['broken'], "details": f"Out of {self.link_report['total']} unique links checked"}
+        content_statistics.update({
+            "Buttons": {"count": len(content.get('buttons', [])), "details": "Interactive elements"},
+            "Forms": {"count": content.get('forms', 0), "details": "User input forms"},
+            "Images": {"count": len(content.get('images', [])), "details": "Visual elements"},
+        })
         
-        assessment_panel = Panel(
-            f"[bold]Overall Assessment:[/bold] {assessment_text}\n"
-            f"[bold]Success Rate:[/bold] {success_rate:.1f}% ({passed_tests}/{total_tests} tests passed)\n"
-            f"[bold]Recommendation:[/bold] {'Website is fully functional' if success_rate >= 80 else 'Some improvements needed' if success_rate >= 60 else 'Significant issues detected'}",
-            title="🎯 Final Assessment",
-            border_style=assessment_style
-        )
-        self.console.print(assessment_panel)
+        return {
+            "website_info": {
+                "url": url,
+                "title": content.get('title', 'N/A'),
+                "analysis_time": time.strftime('%Y-%m-%d %H:%M:%S'),
+            },
+            "content_statistics": content_statistics,
+            "performance": self.performance,
+            "resource_usage": self.resource_usage.get('summary', {}),
+            "test_results": self.test_results,
+            "ai_analysis": ai_analysis,
+            "key_sections": content.get('headings', [])[:5],
+            "final_assessment": {
+                "overall": "Excellent" if success_rate >= 80 else "Good" if success_rate >= 60 else "Needs Improvement",
+                "success_rate": f"{success_rate:.1f}% ({passed_tests}/{total_tests} tests passed)",
+                "recommendation": 'Website is fully functional' if success_rate >= 80 else 'Some improvements needed' if success_rate >= 60 else 'Significant issues detected',
+                "passed": passed_tests,
+                "total": total_tests,
+            },
+        }
     
-    def test_browser_functionality(self, url):
+    def display_beautiful_summary(self, url, ai_analysis=None):
+        """Hand the summary to the run's renderer"""
+        self.summary = self.summary_data(url, ai_analysis)
+        self.console.summary(self.summary)
+    
+    def get_test_report(self):
+        return {
+            "total_tests": len(self.test_results),
+            "passed": len([r for r in self.test_results if r["status"] == "PASS"]),
+            "failed": len([r for r in self.test_results if r["status"] == "FAIL"]),
+            "results": self.test_results,
+            "ai_analysis": self.ai_analysis,
+            "analysis_metrics": self.analysis_metrics,
+            "visual_check": self.visual_check,
+            "link_check": self.link_report,
+            "performance": self.performance,
+            "resource_usage": self.resource_usage,
+            "skipped_checks": sorted(self.skip_checks),
+            "fingerprint": self.content_fingerprint(),
+            "resilience": get_resilience_metrics()
+        }
+    
+    def start_resource_sampler(self):
+        """Sample Firefox and system resources on the desktop until stop_resource_sampler"""
+        if self.resource_sampler is None and SAMPLE_INTERVAL > 0 and self.computer:
+            self.resource_sampler = ResourceSampler(self.computer.sync).start_async()
+    
+    async def stop_resource_sampler(self):
+        sampler, self.resource_sampler = self.resource_sampler, None
+        if sampler:
+            self.resource_usage = await sampler.stop_async()
+    
+    async def test_browser_functionality(self, url):
         """Test browser functionality using Orgo"""
         self.console.print(f"\n🌐 [bold blue]Testing Browser Functionality[/bold blue]")
         
         try:
             # Open Firefox and navigate
             self.console.print("🖥️  Opening Firefox...")
-            result = self.computer.exec("firefox --new-window")
+            result = await self.computer.exec("firefox --new-window")
             if result['success']:
                 self.console.print("✅ Firefox launched successfully", style="green")
-            time.sleep(3)
+                self.start_resource_sampler()
+            await self.cancel_token.sleep_async(3)
             
             self.console.print(f"🌐 Navigating to {url}...")
-            result = self.computer.exec(f"firefox {url}")
+            result = await self.computer.exec(f"firefox {url}")
             if result['success']:
                 self.console.print("✅ Navigation command executed", style="green")
-            time.sleep(5)
+            await self.cancel_token.sleep_async(5)
             
             self.log_test_result("Browser Launch", "PASS", "Firefox opened and navigation attempted")
             
             # Take screenshot
-            screenshot = self.computer.screenshot()
+            screenshot = await self.computer.screenshot()
             self.console.print(f"📸 Screenshot captured: {screenshot.size}", style="green")
             self.log_test_result("Screenshot Capture", "PASS", f"Size: {screenshot.size}")
             
-            # Test interactions
-            self.test_interactions()
+            if self.content_source == "desktop":
+                # After the screenshot, since copying the page highlights it, and before the clicks change it
+                if not await self.timed_stage("scrape", self.scrape_desktop_content, url):
+                    return False
+                self.start_link_check(url)
+            
+            # A page that renders blank or differently from its baseline fails here
+            await self.test_visual_regression(url, screenshot)
+            
+            # Test interactions: the requested scenario, or generic clicks, typing and scrolling
+            if self.scenario_steps:
+                await self.timed_stage("scenario", self.run_scenario, url)
+            else:
+                await self.test_interactions(screenshot)
             
             return True
             
@@ -342,91 +549,386 @@ class IntelligentWebsiteTester:
             self.log_test_result("Browser Functionality", "FAIL", f"Error: {str(e)}")
             return False
     
-    def test_interactions(self):
+    async def test_visual_regression(self, url, screenshot):
+        if "visual" in self.skip_checks:
+            self.console.print("⏭️  Visual regression skipped by the run plan", style="dim")
+            return
+        try:
+            status, details, self.visual_check = await asyncio.to_thread(
+                check_screenshot, self.baseline_store, url, screenshot, self.update_baseline
+            )
+            self.log_test_result("Visual Regression", status, details)
+        except Exception as e:
+            self.log_test_result("Visual Regression", "FAIL", f"Error: {str(e)}")
+    
+    async def test_links(self, url, max_reported=10):
+        """Check every scraped link, logging a summary row plus one row per broken link"""
+        started = time.perf_counter()
+        try:
+            links = normalize_links(self.scraped_content.get('final_url', url), self.scraped_content.get('links', []))
+            async with AsyncLinkChecker(cache=self.link_cache) as checker:
+                results = await checker.check(links, should_stop=lambda: self.cancel_token.cancelled)
+            self.link_report = summarize(results)
+            self.link_report["redirect_chains"] = [
+                {"url": r["url"], "final_url": r["final_url"], "hops": [hop["status"] for hop in r["redirects"]]}
+                for r in results if r["redirects"]
+            ]
+            report = self.link_report
+            self.log_test_result(
+                "Link Check", "PASS" if not report["broken"] else "FAIL",
+                f"{report['ok']}/{report['total']} links OK, {report['redirected']} redirected, {report['cached']} from cache"
+            )
+            for broken in report["broken_links"][:max_reported]:
+                self.log_test_result("Broken Link", "FAIL", f"{broken['url']} ({broken['status'] or broken['error']})")
+        except Exception as e:
+            self.log_test_result("Link Check", "FAIL", f"Error: {str(e)}")
+        finally:
+            self.stage_timings["link_check"] = round(time.perf_counter() - started, 3)
+    
+    async def test_interactions(self, screenshot=None):
         """Test various interactions"""
         self.console.print("\n🔍 [bold blue]Testing Interactive Elements[/bold blue]")
         
-        # Test clicks
-        click_positions = [(512, 384), (100, 100), (924, 100), (512, 100)]
+        # Test clicks on regions of the screenshot that look like controls
+        click_positions, source = await asyncio.to_thread(
+            click_positions_from_screenshot, screenshot, button_texts=self.scraped_content.get('buttons')
+        )
+        self.console.print(f"🎯 Click targets: {len(click_positions)} ({source})", style="dim")
         successful_clicks = 0
         
         for x, y in click_positions:
+            self.cancel_token.check()
             try:
-                result = self.computer.left_click(x, y)
+                result = await self.computer.left_click(x, y)
                 if result:
                     successful_clicks += 1
-                time.sleep(1)
+                await self.cancel_token.sleep_async(1)
             except Exception as e:
                 pass
         
-        self.log_test_result("Button Interaction", "PASS", f"{successful_clicks}/{len(click_positions)} clicks successful")
+        self.log_test_result("Button Interaction", "PASS", f"{successful_clicks}/{len(click_positions)} clicks successful ({source} targets)")
         
         # Test keyboard input
         try:
-            self.computer.type("test@example.com")
-            self.computer.key("Tab")
-            self.computer.type("password123")
-            self.computer.key("Enter")
-            time.sleep(2)
+            await self.computer.type("test@example.com")
+            await self.computer.key("Tab")
+            await self.computer.type("password123")
+            await self.computer.key("Enter")
+            await self.cancel_token.sleep_async(2)
             self.log_test_result("Keyboard Input", "PASS", "Text input and special keys tested")
         except Exception as e:
             self.log_test_result("Keyboard Input", "FAIL", f"Error: {str(e)}")
         
         # Test scrolling
         try:
-            self.computer.scroll("down", 2)
-            time.sleep(1)
-            self.computer.scroll("up", 1)
+            await self.computer.scroll("down", 2)
+            await self.cancel_token.sleep_async(1)
+            await self.computer.scroll("up", 1)
             self.log_test_result("Scroll Functionality", "PASS", "Scroll up/down tested")
         except Exception as e:
             self.log_test_result("Scroll Functionality", "FAIL", f"Error: {str(e)}")
     
-    def run_intelligent_test(self, url, test_name="Intelligent Website Test"):
+    async def run_scenario(self, url):
+        """Do a scenario's desktop steps in order; steps to verify are judged by the AI from the page they leave"""
+        self.console.print(f"\n📋 [bold blue]Running Scenario ({len(self.scenario_steps)} steps)[/bold blue]")
+        done = 0
+        checks = 0
+        for number, step in enumerate(self.scenario_steps, 1):
+            self.cancel_token.check()
+            action, argument = scenario_action(step)
+            try:
+                if action == "navigate" and argument.rstrip("/") != url.rstrip("/"):
+                    await self.computer.exec(f"firefox {argument}")
+                    await self.cancel_token.sleep_async(5)
+                elif action == "fill":
+                    await self.computer.type(argument)
+                    await self.computer.key("Tab")
+                elif action == "submit":
+                    await self.computer.key("Enter")
+                elif action == "wait":
+                    await self.cancel_token.sleep_async(SCENARIO_WAIT)
+                elif action == "screenshot":
+                    await self.computer.screenshot()
+                elif action == "click":
+                    if not await self.click_scenario_target() and "if available" not in step.lower():
+                        raise RuntimeError("no clickable target found on the page")
+                elif action == "scroll":
+                    await self.computer.scroll(argument, 3)
+                    await self.cancel_token.sleep_async(1)
+                elif action == "unsupported":
+                    raise RuntimeError("the tester has no desktop action for this step; not performed")
+                elif action == "check":
+                    checks += 1
+                    self.scenario_checks.append(argument)
+                    continue
+                # "open" and navigating to the tested URL were done by the browser stage, "report" is the summary
+                done += 1
+            except RunCancelled:
+                raise
+            except Exception as e:
+                self.log_test_result(f"Scenario Step {number}", "FAIL", f"{step}: {str(e)}")
+        
+        if checks:
+            await self.read_scenario_result(url)
+        judged = "judged by the AI analysis from the page after the steps" if self.scenario_content else "not judged"
+        actions = len(self.scenario_steps) - checks
+        self.log_test_result(
+            "Scenario", "PASS" if done == actions else "FAIL",
+            f"{done}/{actions} steps done, {checks} checks {judged}"
+        )
+    
+    async def click_scenario_target(self):
+        """Click the most control-like region on screen now; False when nothing looks clickable"""
+        screenshot = await self.computer.screenshot()
+        positions, source = await asyncio.to_thread(
+            click_positions_from_screenshot, screenshot, 1, self.scraped_content.get('buttons')
+        )
+        if source == "default":
+            return False
+        await self.computer.left_click(*positions[0])
+        await self.cancel_token.sleep_async(SCENARIO_WAIT)
+        return True
+    
+    async def read_scenario_result(self, url):
+        """Read the page the scenario left in the browser, for its checks; without it they are not judged"""
+        try:
+            html, final_url = await self.read_desktop_html()
+            self.scenario_content = await asyncio.to_thread(self.extract_content, url, final_url or url, html, False)
+        except RunCancelled:
+            raise
+        except Exception as e:
+            self.scenario_content = {}
+            self.log_test_result("Scenario Checks", "WARNING",
+                                 f"Could not read the page after the scenario ({e}); its checks were not judged")
+    
+    async def run(self, url, test_name="Intelligent Website Test"):
         """Run the complete intelligent website test"""
         self.console.print(f"\n🚀 [bold cyan]Starting Intelligent Website Test[/bold cyan]")
         self.console.print(f"🌐 [bold]URL:[/bold] {url}")
         self.console.print(f"🧪 [bold]Test Name:[/bold] {test_name}")
         self.console.print("="*80)
         
+        run_started = time.time()
+        status = "failed"
+        
         try:
-            # Step 1: Scrape content
-            if not self.scrape_website_content(url):
-                return False
+            # Step 1: Scrape content; in single-fetch mode it comes from the desktop browser in step 2
+            if self.content_source == "http":
+                if not await self.timed_stage("scrape", self.scrape_website_content, url):
+                    return False
+                # Links are checked over plain HTTP while the desktop boots
+                self.start_link_check(url)
             
             # Step 2: Start virtual desktop and test functionality
-            self.start_virtual_desktop()
-            if not self.test_browser_functionality(url):
+            await self.timed_stage("desktop_start", self.start_virtual_desktop)
+            browser_ok = await self.timed_stage("browser", self.test_browser_functionality, url)
+            await self.stop_resource_sampler()
+            if not browser_ok:
                 return False
+            if self.link_task:
+                await self.link_task
             
             # Step 3: Analyze content with AI (only once at the end)
             ai_analysis = None
             if self.gemini_available:
-                ai_analysis = self.analyze_content_with_gemini()
+                ai_analysis = await self.timed_stage("analysis", self.analyze_content_with_gemini)
             
             # Step 4: Display beautiful summary
             self.display_beautiful_summary(url, ai_analysis)
             
+            status = "passed"
             return True
             
+        except RunCancelled as e:
+            status = "cancelled"
+            self.console.print(f"🛑 [bold yellow]Test cancelled: {e}[/bold yellow]")
+            return False
+            
         except Exception as e:
+            status = "error"
             self.console.print(f"❌ [bold red]Fatal error during testing: {e}[/bold red]")
             return False
         
         finally:
-            self.destroy_virtual_desktop()
+            if self.link_task and not self.link_task.done():
+                self.link_task.cancel()
+            await self.stop_resource_sampler()
+            await asyncio.to_thread(self.destroy_virtual_desktop)
+            self.cancel_token.finish()
+            self.record_history(url, test_name, status, run_started)
+    
+    def start_link_check(self, url):
+        if "links" not in self.skip_checks:
+            self.link_task = asyncio.create_task(self.test_links(url))
+    
+    async def timed_stage(self, stage, func, *args):
+        self.cancel_token.check()
+        started = time.perf_counter()
+        try:
+            return await func(*args)
+        finally:
+            self.stage_timings[stage] = round(time.perf_counter() - started, 3)
+    
+    def record_history(self, url, test_name, status, started_at):
+        """Write the finished run to the run history store, if enabled"""
+        if not self.history_store:
+            return
+        try:
+            self.history_store.record_run(
+                url, status,
+                test_name=test_name,
+                tester=type(self).__name__,
+                run_id=self.run_id,
+                timestamp=started_at,
+                duration_s=time.time() - started_at,
+                test_results=self.test_results,
+                stage_timings=self.stage_timings,
+                site_metrics=tracked_metrics(self.performance) if self.performance else None,
+                fingerprint=self.content_fingerprint(),
+                report=self.get_test_report()
+            )
+        except Exception as e:
+            self.console.print(f"⚠️  Warning: Could not record run history: {e}", style="yellow")
+
+class IntelligentWebsiteTester(AsyncIntelligentWebsiteTester):
+    """Blocking entry point: each run gets its own event loop on the calling thread"""
+    
+    def run_intelligent_test(self, url, test_name="Intelligent Website Test"):
+        return asyncio.run(self.run(url, test_name))
+
+
+def concurrency_demo(runs=40, latency=0.05):
+    """Drive `runs` full tests from one event loop against a fake desktop, Gemini model and site.
+
+    Every Orgo and Gemini call takes `latency` seconds. Reports the wall time
+    next to a single run's, and the peak number of threads in the process.
+    """
+    from fakes import FaultInjectingComputer, FakeGeminiModel
+    from link_checker import LinkCache, start_fixture_server
+    
+    server, _ = start_fixture_server(links=200)
+    url = f"http://127.0.0.1:{server.server_port}/"
+    link_cache = LinkCache(path=None)
+    
+    def make_tester():
+        tester = AsyncIntelligentWebsiteTester(
+            renderer="none",
+            computer_factory=lambda: FaultInjectingComputer(latency=latency),
+            model=FakeGeminiModel(latency=latency)
+        )
+        tester.history_store = None
+        tester.link_cache = link_cache
+        return tester
+    
+    async def timed(testers):
+        peak_threads = threading.active_count()
+        
+        async def watch_threads():
+            nonlocal peak_threads
+            while True:
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.05)
+        
+        watcher = asyncio.create_task(watch_threads())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(tester.run(url, f"Concurrent run {i}") for i, tester in enumerate(testers)))
+        wall = time.perf_counter() - started
+        watcher.cancel()
+        return results, wall, peak_threads
+    
+    try:
+        _, single, _ = asyncio.run(timed([make_tester()]))
+        testers = [make_tester() for _ in range(runs)]
+        results, wall, peak_threads = asyncio.run(timed(testers))
+    finally:
+        server.shutdown()
+    
+    return {
+        "runs": runs,
+        "passed": sum(1 for ok in results if ok),
+        "single_run_s": round(single, 2),
+        "concurrent_wall_s": round(wall, 2),
+        "sequential_estimate_s": round(single * runs, 2),
+        "speedup": round(single * runs / wall, 1),
+        "peak_threads": peak_threads,
+    }
+
+def single_fetch_demo(links=20):
+    """Test a JavaScript-rendered fixture page with each content source and compare what they see.
+
+    The site serves an empty app shell; the fake desktop's Firefox returns
+    the page as rendered. Reports fetches of the page by the tester and the
+    content each mode extracted.
+    """
+    from fakes import FaultInjectingComputer, FakeGeminiModel
+    from link_checker import LinkCache, start_fixture_server
+    from text_dedup import fixture_page
+    
+    shell = "<html><head><title>Shop</title></head><body><div id='app'></div><script src='/app.js'></script></body></html>"
+    server, hrefs = start_fixture_server(links=links, page=shell)
+    url = f"http://127.0.0.1:{server.server_port}/"
+    rendered = fixture_page(0).replace("</body>", "".join(f'<a href="{h}">link</a>' for h in hrefs) + "</body>")
+    
+    results = {}
+    try:
+        for source in CONTENT_SOURCES:
+            tester = AsyncIntelligentWebsiteTester(
+                renderer="none", content_source=source, skip_checks=("visual",),
+                computer_factory=lambda: FaultInjectingComputer(exec_outputs={"xclip": rendered}),
+                model=FakeGeminiModel()
+            )
+            tester.history_store = None
+            tester.link_cache = LinkCache(path=None)
+            fetches_before = server.page_requests
+            ok = asyncio.run(tester.run(url, f"Single-fetch demo ({source})"))
+            content = tester.scraped_content
+            results[source] = {
+                "passed": ok,
+                "page_fetches": server.page_requests - fetches_before,
+                "paragraphs": len(content.get('paragraphs', [])),
+                "links_checked": tester.link_report.get('total', 0),
+                "scrape_s": tester.stage_timings.get("scrape"),
+            }
+    finally:
+        server.shutdown()
+    return results
+
 
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: python3 intelligent_website_tester.py <url> [test_name]")
+    args = sys.argv[1:]
+    if args and args[0] == "--concurrency-demo":
+        print(f"⚡ One event loop, many runs: {concurrency_demo(int(args[1]) if len(args) > 1 else 40)}")
+        sys.exit(0)
+    if args and args[0] == "--single-fetch-demo":
+        print(f"🖥️  Content sources on a JavaScript-rendered page: {single_fetch_demo()}")
+        sys.exit(0)
+    update_baseline = "--update-baseline" in args
+    args = [arg for arg in args if arg != "--update-baseline"]
+    renderer = None
+    if "--render" in args:
+        index = args.index("--render")
+        renderer = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    content_source = None
+    if "--content-source" in args:
+        index = args.index("--content-source")
+        content_source = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    
+    if not args:
+        print("Usage: python3 intelligent_website_tester.py [--update-baseline] [--render rich|plain|json|none] "
+              "[--content-source http|desktop] <url> [test_name]")
+        print("       python3 intelligent_website_tester.py --concurrency-demo [runs]")
+        print("       python3 intelligent_website_tester.py --single-fetch-demo")
         print("Example: python3 intelligent_website_tester.py https://example.com 'My Test'")
         sys.exit(1)
     
-    url = sys.argv[1]
-    test_name = sys.argv[2] if len(sys.argv) > 2 else "Intelligent Website Test"
+    url = args[0]
+    test_name = args[1] if len(args) > 1 else "Intelligent Website Test"
     
-    tester = IntelligentWebsiteTester()
+    tester = IntelligentWebsiteTester(update_baseline=update_baseline, renderer=renderer, content_source=content_source)
     success = tester.run_intelligent_test(url, test_name)
     
     if success:
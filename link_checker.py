@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import defaultdict
+from urllib.parse import urljoin, urldefrag, urlsplit
+import httpx
+
+LINK_CACHE_DB = os.getenv("LINK_CACHE_DB", "link_cache.db")
+LINK_CACHE_TTL = float(os.getenv("LINK_CACHE_TTL", "3600"))
+# Timeouts, resets and 5xx answers may be gone a minute later, so they are only reused briefly; 0 never reuses them
+LINK_CACHE_ERROR_TTL = float(os.getenv("LINK_CACHE_ERROR_TTL", "60"))
+
+# Servers that reject HEAD outright; retry these with GET
+HEAD_UNSUPPORTED = {403, 405, 501}
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Statuses that say "try again later" rather than anything about the link
+TRANSIENT_CODES = {408, 425, 429}
+
+
+def normalize_links(page_url, hrefs):
+    """Absolute, fragment-free http(s) URLs in first-seen order, without duplicates"""
+    seen = set()
+    links = []
+    for href in hrefs:
+        # Same-page anchors only point back at the page itself
+        if not href or href.startswith("#"):
+            continue
+        absolute, _ = urldefrag(urljoin(page_url, href.strip()))
+        if urlsplit(absolute).scheme not in ("http", "https") or absolute in seen:
+            continue
+        seen.add(absolute)
+        links.append(absolute)
+    return links
+
+
+def is_transient(result):
+    """A failure that says nothing lasting about the link: no response at all, or a 5xx/throttling status"""
+    status = result.get("status")
+    return status is None or status >= 500 or status in TRANSIENT_CODES
+
+
+class LinkCache:
+    """Link results shared across pages and runs: in memory, backed by SQLite.
+
+    Definitive results are reused for ttl seconds, transient failures only for error_ttl.
+    """
+
+    def __init__(self, path=LINK_CACHE_DB, ttl=LINK_CACHE_TTL, error_ttl=LINK_CACHE_ERROR_TTL):
+        self.ttl = ttl
+        self.error_ttl = min(error_ttl, ttl)
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS link_checks (url TEXT PRIMARY KEY, result TEXT NOT NULL, checked_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _fresh(self, result, checked_at, now):
+        return checked_at >= now - (self.error_ttl if is_transient(result) else self.ttl)
+
+    def get_many(self, urls):
+        now = time.time()
+        found = {}
+        with self._lock:
+            missing = []
+            for url in urls:
+                entry = self._memory.get(url)
+                if entry and self._fresh(entry[0], entry[1], now):
+                    found[url] = entry[0]
+                else:
+                    missing.append(url)
+            if self._conn and missing:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT url, result, checked_at FROM link_checks WHERE checked_at >= ? AND url IN ({','.join('?' * len(chunk))})",
+                        [now - self.ttl] + chunk
+                    ).fetchall()
+                    for url, result, checked_at in rows:
+                        result = json.loads(result)
+                        if self._fresh(result, checked_at, now):
+                            found[url] = result
+                            self._memory[url] = (result, checked_at)
+        return found
+
+    def put_many(self, results):
+        now = time.time()
+        if self.error_ttl <= 0:
+            results = [r for r in results if not is_transient(r)]
+        with self._lock:
+            for result in results:
+                self._memory[result["url"]] = (result, now)
+            if self._conn and results:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO link_checks (url, result, checked_at) VALUES (?, ?, ?)",
+                    [(r["url"], json.dumps(r), now) for r in results]
+                )
+                self._conn.commit()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_link_cache():
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LinkCache()
+        return _shared_cache
+
+
+class AsyncLinkChecker:
+    """Checks many links concurrently on the event loop with a cap on connections per host.
+
+    Each link gets a HEAD request (GET when the server rejects HEAD or the
+    request fails), redirects are followed by hand so the whole chain is
+    recorded, and every hop holds its host's slot while it is in flight.
+    max_workers caps the links in flight, so many runs on one loop can check
+    links side by side.
+
+    Used as an async context manager, the checker keeps one httpx client (and
+    its connection pool) for every check() in the block; otherwise each
+    check() opens its own.
+    """
+
+    def __init__(self, max_workers=32, per_host=6, timeout=10, max_redirects=10, cache=None,
+                 user_agent="Mozilla/5.0 (compatible; OrgoLinkChecker/1.0)"):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.cache = cache
+        self.user_agent = user_agent
+        self._host_slots = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self._client = None
+
+    def _new_client(self):
+        limits = httpx.Limits(max_connections=self.max_workers, max_keepalive_connections=self.max_workers)
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits, headers={"User-Agent": self.user_agent})
+
+    async def __aenter__(self):
+        self._client = self._new_client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        client, self._client = self._client, None
+        await client.aclose()
+
+    async def _request(self, client, method, url):
+        async with self._host_slots[urlsplit(url).netloc]:
+            # Only the status and headers matter; the body is never read
+            async with client.stream(method, url) as response:
+                return response
+
+    async def check_one(self, client, url):
+        started = time.perf_counter()
+        result = {"url": url, "ok": False, "status": None, "final_url": url, "redirects": [], "method": "HEAD", "error": None}
+        current = url
+        try:
+            for _ in range(self.max_redirects + 1):
+                response = None
+                if result["method"] == "HEAD":
+                    try:
+                        response = await self._request(client, "HEAD", current)
+                    except httpx.HTTPError:
+                        response = None
+                    if response is not None and response.status_code in HEAD_UNSUPPORTED:
+                        response = None
+                if response is None:
+                    result["method"] = "GET"
+                    response = await self._request(client, "GET", current)
+
+                if response.status_code in REDIRECT_CODES and response.headers.get("Location"):
+                    result["redirects"].append({"status": response.status_code, "url": current})
+                    current = urljoin(current, response.headers["Location"])
+                    continue
+
+                result.update(status=response.status_code, ok=response.status_code < 400, final_url=current)
+                break
+            else:
+                result["error"] = f"More than {self.max_redirects} redirects"
+        except httpx.HTTPError as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def check(self, urls, should_stop=None):
+        """Results for every URL, in input order; cached results are reused"""
+        # SQLite reads and writes block, so they run off the event loop
+        cached = await asyncio.to_thread(self.cache.get_many, urls) if self.cache else {}
+        pending = [url for url in urls if url not in cached]
+        in_flight = asyncio.Semaphore(self.max_workers)
+
+        async def run(client, url):
+            async with in_flight:
+                if should_stop and should_stop():
+                    return {"url": url, "ok": False, "status": None, "final_url": url, "redirects": [],
+                            "method": None, "error": "cancelled", "elapsed_ms": 0.0}
+                return await self.check_one(client, url)
+
+        fresh = {}
+        if pending:
+            client = self._client or self._new_client()
+            try:
+                for result in await asyncio.gather(*(run(client, url) for url in pending)):
+                    fresh[result["url"]] = result
+            finally:
+                if client is not self._client:
+                    await client.aclose()
+            if self.cache:
+                await asyncio.to_thread(self.cache.put_many, [r for r in fresh.values() if r["error"] != "cancelled"])
+
+        return [dict(cached[url], cached=True) if url in cached else dict(fresh[url], cached=False) for url in urls]
+
+
+def summarize(results):
+    broken = [r for r in results if not r["ok"]]
+    return {
+        "total": len(results),
+        "ok": len(results) - len(broken),
+        "broken": len(broken),
+        "redirected": sum(1 for r in results if r["redirects"]),
+        "cached": sum(1 for r in results if r.get("cached")),
+        "broken_links": [{"url": r["url"], "status": r["status"], "error": r["error"]} for r in broken],
+    }
+
+
+def start_fixture_server(links=2000, page=None):
+    """Local HTTP/1.1 server with a page linking to ok, broken, redirecting and HEAD-less URLs.
+
+    page replaces the HTML served at "/"; server.page_requests counts its GETs.
+    """
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    kinds = ["ok", "ok", "ok", "ok", "ok", "missing", "redirect", "nohead"]
+    hrefs = [f"/{kinds[i % len(kinds)]}/{i}" for i in range(links)]
+    if page is None:
+        page = "<html><body>" + "".join(f'<a href="{h}">link</a>' for h in hrefs) + "</body></html>"
+    page = page.encode() if isinstance(page, str) else page
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def route(self):
+            kind = self.path.strip("/").split("/")[0]
+            if self.path == "/":
+                if self.command == "GET":
+                    self.server.page_requests += 1
+                self.reply(200, page, {"Content-Type": "text/html"})
+            elif kind == "ok":
+                self.reply(200, b"ok")
+            elif kind == "redirect":
+                self.reply(301, headers={"Location": self.path.replace("/redirect/", "/ok/")})
+            elif kind == "nohead" and self.command == "HEAD":
+                self.reply(405)
+            elif kind == "nohead":
+                self.reply(200, b"ok")
+            else:
+                self.reply(404, b"not found")
+
+        do_GET = do_HEAD = route
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.page_requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hrefs
+
+
+def benchmark(links=2000):
+    """Check every link on a fixture page twice with one client: cold, then from the shared cache"""
+    server, hrefs = start_fixture_server(links)
+    base = f"http://127.0.0.1:{server.server_port}/"
+    urls = normalize_links(base, hrefs + hrefs[:100] + ["#top", "mailto:a@b.c"])
+
+    async def run():
+        async with AsyncLinkChecker(cache=LinkCache(path=None)) as checker:
+            started = time.perf_counter()
+            summary = summarize(await checker.check(urls))
+            cold = time.perf_counter() - started
+
+            started = time.perf_counter()
+            await checker.check(urls)
+            return summary, cold, time.perf_counter() - started
+
+    try:
+        summary, cold, warm = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    return {
+        "links": summary["total"],
+        "broken": summary["broken"],
+        "redirected": summary["redirected"],
+        "cold_s": round(cold, 2),
+        "links_per_s": round(summary["total"] / cold),
+        "cached_s": round(warm, 3),
+    }
+
+
+if __name__ == "__main__":
+    print(f"🔗 Link check benchmark against a local fixture server: {benchmark()}")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import time
+import tracemalloc
+import numpy as np
+
+APPENDED = "appended"
+IDENTICAL = "identical"
+NO_OVERLAP = "no_overlap"
+
+
+def row_hashes(frame):
+    """Two 64-bit hashes per pixel row, from wrapping integer arithmetic so equal rows always hash equal"""
+    rows = np.ascontiguousarray(frame).reshape(frame.shape[0], -1)
+    padding = (-rows.shape[1]) % 8
+    if padding:
+        rows = np.pad(rows, ((0, 0), (0, padding)))
+    words = rows.view(np.uint64)
+    weights = np.random.default_rng(words.shape[1]).integers(1, 2 ** 63, size=(2, words.shape[1]), dtype=np.uint64) | np.uint64(1)
+    return np.stack([(words * weights[0]).sum(axis=1), (words * weights[1]).sum(axis=1)], axis=1)
+
+
+class StreamingStitcher:
+    """Stitches consecutive scrolled viewport captures into one tall image.
+
+    Only the rows each frame adds are kept; a frame itself is dropped as soon
+    as it has been matched against its predecessor.
+    """
+
+    def __init__(self, min_match=0.9, min_overlap=32, top_crop=0, bottom_crop=0):
+        self.min_match = min_match
+        self.min_overlap = min_overlap
+        self.top_crop = top_crop
+        self.bottom_crop = bottom_crop
+        self.frames = 0
+        self.height = 0
+        self.offsets = []
+        self._chunks = []
+        self._last_hashes = None
+        self._diagonals = {}
+
+    def _crop(self, frame):
+        frame = np.asarray(frame)
+        end = frame.shape[0] - self.bottom_crop
+        return frame[self.top_crop:end]
+
+    def _diagonal_index(self, prev_height, cur_height):
+        # diagonal[i, j] = i - j + (cur_height - 1): which scroll offset pairs prev row i with current row j
+        key = (prev_height, cur_height)
+        if key not in self._diagonals:
+            self._diagonals[key] = (np.arange(prev_height)[:, None] - np.arange(cur_height)[None, :] + cur_height - 1).ravel()
+        return self._diagonals[key]
+
+    def find_offset(self, previous, current):
+        """Rows scrolled between two frames, or None when they do not overlap.
+
+        Scores every offset at once: the row-equality matrix is summed along its
+        diagonals, with rows weighted by rarity so flat background counts little.
+        """
+        prev_height, cur_height = len(previous), len(current)
+        equal = np.all(previous[:, None, :] == current[None, :, :], axis=2)
+        _, inverse, counts = np.unique(current[:, 0], return_inverse=True, return_counts=True)
+        weights = 1.0 / counts[inverse.ravel()]
+
+        diagonal = self._diagonal_index(prev_height, cur_height)
+        size = prev_height + cur_height - 1
+        weighted = np.broadcast_to(weights, equal.shape)
+        matched = np.bincount(diagonal, weights=(equal * weighted).ravel(), minlength=size)
+        possible = np.bincount(diagonal, weights=weighted.ravel(), minlength=size)
+
+        offsets = np.arange(size) - (cur_height - 1)
+        overlap = np.minimum(prev_height - offsets, cur_height)
+        valid = (offsets > 0) & (overlap >= self.min_overlap)
+        scores = np.where(valid, matched / np.maximum(possible, 1e-9), 0.0)
+
+        best = scores.max()
+        if best < self.min_match:
+            return None
+        # Periodic content can tie; scrolling usually repeats the previous step
+        tied = offsets[scores >= best - 1e-9]
+        expected = self.offsets[-1] if self.offsets else tied.min()
+        return int(tied[np.argmin(np.abs(tied - expected))])
+
+    def add(self, frame):
+        frame = self._crop(frame)
+        hashes = row_hashes(frame)
+        self.frames += 1
+
+        if self._last_hashes is None:
+            status, new_rows = APPENDED, frame
+        elif hashes.shape == self._last_hashes.shape and np.array_equal(hashes, self._last_hashes):
+            return IDENTICAL
+        else:
+            offset = self.find_offset(self._last_hashes, hashes)
+            if offset is None:
+                status, new_rows = NO_OVERLAP, frame
+            else:
+                # Rows below the previous frame's bottom; a short last frame ends before a full step
+                status, new_rows = APPENDED, frame[max(0, len(self._last_hashes) - offset):]
+                self.offsets.append(offset)
+
+        self._chunks.append(np.array(new_rows, copy=True))
+        self.height += len(new_rows)
+        self._last_hashes = hashes
+        return status
+
+    def result(self):
+        if not self._chunks:
+            return None
+        return np.concatenate(self._chunks, axis=0)
+
+
+def make_synthetic_page(height=6000, width=1024, seed=0):
+    """Tall page of random coloured blocks with blank gaps, like real layouts"""
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    y = 0
+    while y < height:
+        block = int(rng.integers(20, 200))
+        x0 = int(rng.integers(0, width // 2))
+        x1 = int(rng.integers(x0 + 50, width))
+        page[y:y + block, x0:x1] = rng.integers(0, 255, size=3)
+        page[y:y + block:4, x0:x1] = rng.integers(0, 255, size=3)
+        y += block + int(rng.integers(5, 60))
+    return page
+
+
+def simulate_scroll(page, viewport_height=768, step=300):
+    """Yield viewport captures as a browser would produce them while scrolling"""
+    top = 0
+    while True:
+        yield page[top:top + viewport_height]
+        top = min(top + step, len(page) - viewport_height)
+
+
+def benchmark(page_height=6000, viewport_height=768, step=300, max_frames=100):
+    page = make_synthetic_page(page_height)
+    frames = simulate_scroll(page, viewport_height, step)
+
+    stitcher = StreamingStitcher()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(max_frames):
+        if stitcher.add(next(frames)) == IDENTICAL:
+            break
+    stitched = stitcher.result()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "frames": stitcher.frames,
+        "stitched_height": stitcher.height,
+        "exact": bool(stitched.shape == page.shape and np.array_equal(stitched, page)),
+        "ms_per_frame": round(elapsed / stitcher.frames * 1000, 2),
+        "peak_memory_mb": round(peak / 1e6, 1),
+        "output_mb": round(stitched.nbytes / 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(f"🧵 Full-page stitching benchmark: {benchmark()}")
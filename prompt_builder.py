@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import math
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+BOILERPLATE_WORDS = {
+    "cookie", "cookies", "privacy", "policy", "terms", "copyright", "rights",
+    "reserved", "subscribe", "newsletter", "login", "sign", "menu", "skip",
+}
+
+ANALYSIS_INSTRUCTIONS = """
+Please provide:
+1. Website Purpose (1-2 sentences)
+2. Key Features (bullet points)
+3. Target Audience
+4. Content Quality Assessment
+5. User Experience Insights
+6. Technical Observations
+
+Format the response in a clear, structured way suitable for terminal display.
+""".strip()
+
+NO_CONTENT_INSTRUCTIONS = """
+Content Status: No readable content was extracted (likely JavaScript-heavy or protected site)
+
+Please provide:
+1. Website Purpose (based on title and URL)
+2. Technical Assessment (why content might not be accessible)
+3. Recommendations for testing
+4. User Experience Considerations
+5. Security/Protection Analysis
+
+Format the response in a clear, structured way suitable for terminal display.
+Focus on what we can learn from the available information.
+""".strip()
+
+
+def estimate_tokens(text):
+    """Estimate the token count of text without a remote tokenizer"""
+    if not text:
+        return 0
+    # Long words are split into several sub-word tokens by BPE tokenizers
+    count = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        count += max(1, math.ceil(len(piece) / 6)) if piece.isalpha() else max(1, math.ceil(len(piece) / 3))
+    return count
+
+
+def normalize_text(text):
+    return " ".join(text.split()).lower()
+
+
+def dedupe_blocks(blocks):
+    """Drop blank, repeated and nested/overlapping text blocks, keeping the first-seen order"""
+    seen = set()
+    candidates = []
+    for block in blocks:
+        normalized = normalize_text(block or "")
+        if not normalized or normalized in seen:
+            continue
+        seen.add(normalized)
+        candidates.append((block.strip(), normalized))
+
+    # Containers repeat the text of their children: a block that contains two or
+    # more other blocks is a wrapper, and a block contained in a kept one is redundant.
+    ordered = sorted(range(len(candidates)), key=lambda i: len(candidates[i][1]))
+    kept = []
+    for index in ordered:
+        normalized = candidates[index][1]
+        contained = [k for k in kept if candidates[k][1] in normalized]
+        if len(contained) >= 2:
+            continue
+        if len(contained) == 1:
+            kept.remove(contained[0])
+        kept.append(index)
+
+    return [candidates[i][0] for i in sorted(kept)]
+
+
+def informativeness(text):
+    """Score a text block by lexical diversity and length, penalising boilerplate"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return 0.0
+    unique = set(words)
+    diversity = len(unique) / len(words)
+    boilerplate = len(unique & BOILERPLATE_WORDS) / len(unique)
+    length_score = math.log1p(len(unique))
+    return diversity * length_score * (1.0 - boilerplate)
+
+
+def rank_blocks(blocks):
+    return sorted(blocks, key=informativeness, reverse=True)
+
+
+def _truncate_to_tokens(text, max_tokens):
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:mid]) + " …") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low]) + " …" if low else ""
+
+
+def _truncate_field(text, max_tokens):
+    """_truncate_to_tokens for one-line fields, cutting characters when a single word is too long"""
+    text = " ".join(text.split())
+    truncated = _truncate_to_tokens(text, max_tokens)
+    if truncated or not text:
+        return truncated
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid] + " …") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + " …"
+
+
+class PromptBuilder:
+    """Builds the Gemini analysis prompt within a fixed token budget"""
+
+    # Share of the content budget each section may use before spilling over
+    SECTION_SHARES = (("headings", 0.25), ("paragraphs", 0.55), ("buttons", 0.20))
+    MAX_BLOCK_TOKENS = 120
+    # Page-controlled header fields are cut to these many tokens before the budget is split
+    HEADER_FIELD_TOKENS = (("title", 40), ("meta_description", 80), ("url", 40))
+    # Tokens for the page a scenario left behind, on top of the analysis budget
+    SCENARIO_TOKEN_BUDGET = 400
+
+    def __init__(self, token_budget=None):
+        self.token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+
+    def build(self, content):
+        """Return (prompt, stats) for the scraped content dict"""
+        defaults = {"title": "Unknown", "meta_description": "No description available", "url": "Unknown"}
+        fields = {
+            name: _truncate_field(str(content.get(name) or defaults[name]), limit) or defaults[name]
+            for name, limit in self.HEADER_FIELD_TOKENS
+        }
+        header = "\n".join([
+            f"Website Title: {fields['title']}",
+            f"Meta Description: {fields['meta_description']}",
+            f"URL: {fields['url']}",
+            f"Forms Found: {content.get('forms', 0)}",
+        ])
+
+        has_content = bool(content.get('paragraphs') or content.get('headings'))
+        if not has_content:
+            prompt = f"Analyze this website based on available information:\n\n{header}\n\n{NO_CONTENT_INSTRUCTIONS}"
+            return prompt, self._stats(prompt, {}, {})
+
+        intro = "Analyze this website content and provide insights in the following format:"
+        fixed_tokens = estimate_tokens(intro) + estimate_tokens(header) + estimate_tokens(ANALYSIS_INSTRUCTIONS) + 16
+        remaining = max(0, self.token_budget - fixed_tokens)
+
+        sections = {}
+        candidates = {}
+        for name, _ in self.SECTION_SHARES:
+            blocks = dedupe_blocks(content.get(name, []))
+            candidates[name] = len(blocks)
+            # Headings keep document order; body text is ranked by informativeness
+            ordered = blocks if name == "headings" else rank_blocks(blocks)
+            truncated = [_truncate_to_tokens(b, self.MAX_BLOCK_TOKENS) for b in ordered]
+            sections[name] = [(b, estimate_tokens(b) + 2) for b in truncated if b]
+
+        # First pass honours each section's share, second pass spends what is left over
+        taken = {name: set() for name, _ in self.SECTION_SHARES}
+        used = {name: 0 for name, _ in self.SECTION_SHARES}
+        spent = 0
+        for first_pass in (True, False):
+            for name, share in self.SECTION_SHARES:
+                limit = int(remaining * share) if first_pass else remaining
+                for index, (block, cost) in enumerate(sections[name]):
+                    if index in taken[name]:
+                        continue
+                    if used[name] + cost > limit or spent + cost > remaining:
+                        continue
+                    taken[name].add(index)
+                    used[name] += cost
+                    spent += cost
+
+        chosen = {name: [sections[name][i][0] for i in sorted(taken[name])] for name, _ in self.SECTION_SHARES}
+        selected = {name: len(items) for name, items in chosen.items()}
+
+        def bullets(items):
+            return "\n".join(f"- {item}" for item in items) if items else "- (none)"
+
+        prompt = (
+            f"{intro}\n\n{header}\n\n"
+            f"Main Headings:\n{bullets(chosen['headings'])}\n\n"
+            f"Key Paragraphs:\n{bullets(chosen['paragraphs'])}\n\n"
+            f"Interactive Elements:\n{bullets(chosen['buttons'])}\n\n"
+            f"{ANALYSIS_INSTRUCTIONS}"
+        )
+        return prompt, self._stats(prompt, candidates, selected)
+
+    def scenario_section(self, checks, content):
+        """Prompt section asking for a scenario's checks to be judged from the page after its steps"""
+        lines = [
+            "The test also ran a scenario on the page. After its steps the browser showed:",
+            f"Title: {_truncate_to_tokens(str(content.get('title') or 'Unknown'), 40)}",
+        ]
+        headings = dedupe_blocks(content.get('headings', []))[:5]
+        if headings:
+            lines.append(f"Headings: {_truncate_to_tokens(' | '.join(headings), 80)}")
+        ask = ["From that page, judge whether:"] + [f"- {check}" for check in checks]
+        remaining = self.SCENARIO_TOKEN_BUDGET - estimate_tokens("\n".join(lines + ask))
+        for block in rank_blocks(dedupe_blocks(content.get('paragraphs', []))):
+            block = _truncate_to_tokens(block, min(self.MAX_BLOCK_TOKENS, remaining - 2))
+            if not block:
+                break
+            lines.append(f"- {block}")
+            remaining -= estimate_tokens(block) + 2
+        return "\n".join(lines + ask)
+
+    def _stats(self, prompt, candidates, selected):
+        return {
+            "token_budget": self.token_budget,
+            "prompt_tokens": estimate_tokens(prompt),
+            "prompt_chars": len(prompt),
+            "candidate_blocks": candidates,
+            "selected_blocks": selected,
+        }
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+from contextlib import contextmanager
+
+DEFAULT_RENDERER = os.getenv("TESTER_RENDERER", "rich")
+
+# Rich markup tags such as [bold blue] and [/bold blue]; "[1/3]" is left alone
+MARKUP_TAG = re.compile(r"\[/?[a-zA-Z#][\w .#,=-]*\]")
+
+RESOURCE_ROWS = (("Firefox CPU", "firefox_cpu_pct", "%"), ("Firefox Memory", "firefox_rss_mb", " MB"), ("System Memory", "mem_used_pct", "%"))
+
+
+def strip_markup(text):
+    return MARKUP_TAG.sub("", text)
+
+
+class _Progress:
+    def update(self, description):
+        pass
+
+
+class NullRenderer:
+    """Renders nothing; status messages still reach on_message, e.g. for streaming to clients"""
+
+    name = "none"
+
+    def __init__(self, on_message=None, file=None):
+        self.on_message = on_message
+        self.file = file or sys.stdout
+
+    def print(self, *objects, style=None, **kwargs):
+        if self.on_message:
+            self.on_message(strip_markup(" ".join(str(obj) for obj in objects)))
+        self.write(objects, style, kwargs)
+
+    def write(self, objects, style, options):
+        pass
+
+    @contextmanager
+    def progress(self, description):
+        yield _Progress()
+
+    def summary(self, data):
+        pass
+
+
+class PlainRenderer(NullRenderer):
+    """Plain text lines: no markup, styles, spinners or box drawing"""
+
+    name = "plain"
+
+    def write(self, objects, style, options):
+        print(strip_markup(" ".join(str(obj) for obj in objects)), file=self.file)
+
+    @contextmanager
+    def progress(self, description):
+        print(description, file=self.file)
+        yield _Progress()
+
+    def summary(self, data):
+        out = self.file
+        info = data["website_info"]
+        print("\n=== INTELLIGENT WEBSITE ANALYSIS REPORT ===", file=out)
+        print(f"URL: {info['url']}\nTitle: {info['title']}\nAnalysis Time: {info['analysis_time']}", file=out)
+        print("\nContent Statistics:", file=out)
+        for metric, row in data["content_statistics"].items():
+            print(f"  {metric}: {row['count']} ({row['details']})", file=out)
+        perf = data.get("performance")
+        if perf:
+            print(f"\nSite Performance: DNS {perf['dns_ms']:.0f}ms, connect {perf['connect_ms']:.0f}ms, "
+                  f"TLS {perf['tls_ms']:.0f}ms, TTFB {perf['ttfb_ms']:.0f}ms, download {perf['download_ms']:.0f}ms, "
+                  f"{perf['transfer_bytes'] / 1024:.1f} KB ({perf['compression'] or 'uncompressed'})", file=out)
+        usage = data.get("resource_usage") or {}
+        if usage.get("samples"):
+            print("\nDesktop Resources:", file=out)
+            for label, key, unit in RESOURCE_ROWS:
+                print(f"  {label}: peak {usage[key]['peak']}{unit}, mean {usage[key]['mean']}{unit}", file=out)
+        print("\nTest Results:", file=out)
+        for result in data["test_results"]:
+            print(f"  [{result['timestamp']}] {result['test']}: {result['status']} {result['details']}", file=out)
+        if data.get("ai_analysis"):
+            print(f"\nAI Analysis:\n{data['ai_analysis']}", file=out)
+        if data.get("key_sections"):
+            print("\nKey Page Sections:", file=out)
+            for heading in data["key_sections"]:
+                print(f"  - {heading}", file=out)
+        assessment = data["final_assessment"]
+        print(f"\nOverall Assessment: {assessment['overall']}\nSuccess Rate: {assessment['success_rate']}\n"
+              f"Recommendation: {assessment['recommendation']}", file=out)
+
+
+class JsonRenderer(NullRenderer):
+    """One JSON object per line: status messages, then the summary data"""
+
+    name = "json"
+
+    def write(self, objects, style, options):
+        message = strip_markup(" ".join(str(obj) for obj in objects)).strip()
+        if message:
+            print(json.dumps({"type": "message", "message": message}), file=self.file)
+
+    def summary(self, data):
+        print(json.dumps({"type": "summary", **data}, default=str), file=self.file)
+
+
+class RichRenderer(NullRenderer):
+    """Styled terminal output: panels, tables and spinners"""
+
+    name = "rich"
+
+    def __init__(self, on_message=None, file=None):
+        super().__init__(on_message, file)
+        from rich.console import Console
+        self.console = Console(file=file)
+
+    def write(self, objects, style, options):
+        self.console.print(*objects, style=style, **options)
+
+    @contextmanager
+    def progress(self, description):
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
+        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=self.console) as progress:
+            task = progress.add_task(description, total=None)
+
+            class _RichProgress(_Progress):
+                def update(self, text):
+                    progress.update(task, description=text)
+
+            yield _RichProgress()
+            progress.update(task, completed=True)
+
+    def summary(self, data):
+        from rich.panel import Panel
+        from rich.table import Table
+
+        console = self.console
+        console.print("\n" + "="*80)
+        console.print("🎯 [bold cyan]INTELLIGENT WEBSITE ANALYSIS REPORT[/bold cyan]", justify="center")
+        console.print("="*80)
+
+        info = data["website_info"]
+        console.print(Panel(
+            f"[bold]URL:[/bold] {info['url']}\n"
+            f"[bold]Title:[/bold] {info['title']}\n"
+            f"[bold]Analysis Time:[/bold] {info['analysis_time']}",
+            title="🌐 Website Information",
+            border_style="blue"
+        ))
+
+        stats_table = Table(title="📊 Content Statistics", show_header=True, header_style="bold magenta")
+        stats_table.add_column("Metric", style="cyan")
+        stats_table.add_column("Count", style="green")
+        stats_table.add_column("Details", style="yellow")
+        for metric, row in data["content_statistics"].items():
+            stats_table.add_row(metric, str(row["count"]), row["details"])
+        console.print(stats_table)
+
+        perf = data.get("performance")
+        if perf:
+            perf_table = Table(title="⚡ Site Performance", show_header=True, header_style="bold magenta")
+            perf_table.add_column("Metric", style="cyan")
+            perf_table.add_column("Value", style="green")
+            perf_table.add_column("Details", style="yellow")
+            perf_table.add_row("DNS / Connect / TLS", f"{perf['dns_ms']:.0f} / {perf['connect_ms']:.0f} / {perf['tls_ms']:.0f} ms", "Connection setup")
+            perf_table.add_row("Time to First Byte", f"{perf['ttfb_ms']:.0f} ms", "Server response time")
+            perf_table.add_row("Download", f"{perf['download_ms']:.0f} ms", f"Total {perf['total_ms']:.0f} ms incl. {perf['redirects']} redirect(s)")
+            perf_table.add_row("Transfer Size", f"{perf['transfer_bytes'] / 1024:.1f} KB", f"{perf['decoded_bytes'] / 1024:.1f} KB decoded, {perf['compression'] or 'no compression'}")
+            perf_table.add_row("Caching", "Cacheable" if perf['cache']['cacheable'] else "Not cacheable", perf['cache'].get('cache-control', 'No Cache-Control header'))
+            console.print(perf_table)
+
+        usage = data.get("resource_usage") or {}
+        if usage.get("samples"):
+            resources_table = Table(title="🖥️ Desktop Resources", show_header=True, header_style="bold magenta")
+            resources_table.add_column("Metric", style="cyan")
+            resources_table.add_column("Peak", style="green")
+            resources_table.add_column("Mean", style="yellow")
+            for label, key, unit in RESOURCE_ROWS:
+                stats = usage[key]
+                resources_table.add_row(label, f"{stats['peak']}{unit}" if stats['peak'] is not None else "n/a", f"{stats['mean']}{unit}" if stats['mean'] is not None else "n/a")
+            console.print(resources_table)
+
+        test_table = Table(title="🧪 Functionality Test Results", show_header=True, header_style="bold green")
+        test_table.add_column("Test", style="cyan")
+        test_table.add_column("Status", style="green")
+        test_table.add_column("Details", style="yellow")
+        test_table.add_column("Time", style="blue")
+        for result in data["test_results"]:
+            status_icon = "✅" if result["status"] == "PASS" else "❌" if result["status"] == "FAIL" else "⚠️"
+            test_table.add_row(result["test"], f"{status_icon} {result['status']}", result["details"], result["timestamp"])
+        console.print(test_table)
+
+        if data.get("ai_analysis"):
+            console.print(Panel(data["ai_analysis"], title="🧠 AI-Powered Content Analysis", border_style="purple", width=80))
+
+        if data.get("key_sections"):
+            console.print(Panel(
+                "\n".join([f"• {heading}" for heading in data["key_sections"]]),
+                title="📋 Key Page Sections",
+                border_style="green"
+            ))
+
+        assessment = data["final_assessment"]
+        rate = assessment["passed"] / assessment["total"] * 100 if assessment["total"] else 0
+        console.print(Panel(
+            f"[bold]Overall Assessment:[/bold] {assessment['overall']}\n"
+            f"[bold]Success Rate:[/bold] {assessment['success_rate']}\n"
+            f"[bold]Recommendation:[/bold] {assessment['recommendation']}",
+            title="🎯 Final Assessment",
+            border_style="green" if rate >= 80 else "yellow" if rate >= 60 else "red"
+        ))
+
+
+RENDERERS = {cls.name: cls for cls in (RichRenderer, PlainRenderer, JsonRenderer, NullRenderer)}
+
+
+def make_renderer(name=None, on_message=None, file=None):
+    """Renderer by name: rich, plain, json or none"""
+    name = name or DEFAULT_RENDERER
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer '{name}', expected one of: {', '.join(RENDERERS)}")
+    return RENDERERS[name](on_message=on_message, file=file)
+
+
+def sample_run():
+    """Status lines and summary data shaped like a typical intelligent test run"""
+    messages = [f"✅ [bold]Step {i}[/bold]: PASS details for step {i}" for i in range(40)]
+    tests = [{"test": f"Test {i}", "status": "PASS" if i % 5 else "FAIL", "details": "Clicked target and verified the page responded",
+              "timestamp": "12:00:00"} for i in range(20)]
+    usage = {"samples": 30, **{key: {"peak": 80.0, "mean": 40.0} for _, key, _ in RESOURCE_ROWS}}
+    summary = {
+        "website_info": {"url": "https://example.com", "title": "Example Domain", "analysis_time": "2026-01-01 12:00:00"},
+        "content_statistics": {name: {"count": 12, "details": "Elements"} for name in ("Headings", "Paragraphs", "Links", "Buttons", "Forms", "Images")},
+        "performance": {"dns_ms": 12.0, "connect_ms": 20.0, "tls_ms": 35.0, "ttfb_ms": 120.0, "download_ms": 40.0, "total_ms": 227.0,
+                        "redirects": 1, "transfer_bytes": 48000, "decoded_bytes": 190000, "compression": "gzip",
+                        "cache": {"cacheable": True, "cache-control": "max-age=600"}},
+        "resource_usage": usage,
+        "test_results": tests,
+        "ai_analysis": ("The page presents a clear purpose with a single call to action. " * 80).strip(),
+        "key_sections": ["Welcome", "Features", "Pricing", "About", "Contact"],
+        "final_assessment": {"overall": "Good", "success_rate": "80.0% (16/20 tests passed)",
+                             "recommendation": "Some improvements needed", "passed": 16, "total": 20},
+    }
+    return messages, summary
+
+
+def benchmark(runs=30):
+    """CPU milliseconds per run spent rendering, for each renderer, with output sent to /dev/null"""
+    import time
+
+    messages, summary = sample_run()
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        for name in ("rich", "plain", "json", "none"):
+            # Every renderer also streams each status line, as the backend does
+            streamed = []
+            started = time.process_time()
+            for _ in range(runs):
+                renderer = make_renderer(name, on_message=streamed.append, file=devnull)
+                for message in messages:
+                    renderer.print(message, style="green")
+                renderer.summary(summary)
+            results[name] = round((time.process_time() - started) / runs * 1000, 2)
+    results["saved_vs_rich_ms"] = round(results["rich"] - results["none"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    print(f"🖨️  Render CPU per run (ms): {benchmark()}")
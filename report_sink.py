@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+import os
+import io
+import json
+import glob
+import gzip
+import time
+import atexit
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends still go through O_APPEND, just without the lock
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_REPORTS_PATH = os.getenv("REPORTS_PATH", "reports/test_reports.jsonl")
+DEFAULT_FSYNC = os.getenv("REPORTS_FSYNC", "flush")
+
+# never: leave it to the OS; flush: fsync once per buffered batch; always: fsync after every report
+FSYNC_POLICIES = ("never", "flush", "always")
+COMPRESSIONS = (None, "gzip", "zstd")
+SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class ReportSink:
+    """Append-only JSONL file of test reports, safe to share between processes.
+
+    Reports are buffered and written in one O_APPEND write per flush under an
+    exclusive flock. The active file is rotated once it reaches max_bytes or
+    when a new rotate_seconds period starts; rotated segments can be
+    compressed with gzip or zstd, after the locks are released.
+    """
+
+    def __init__(self, path=DEFAULT_REPORTS_PATH, buffer_size=32, fsync=DEFAULT_FSYNC,
+                 max_bytes=50 * 1024 * 1024, rotate_seconds=None, compression=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        if compression not in COMPRESSIONS:
+            raise ValueError("compression must be None, 'gzip' or 'zstd'")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the 'zstandard' package")
+
+        self.path = path
+        self.buffer_size = 1 if fsync == "always" else max(1, buffer_size)
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self.written = 0
+        self.rotations = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, report):
+        line = json.dumps(report, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            rotated = self._flush_locked() if len(self._buffer) >= self.buffer_size else None
+        self._compress(rotated)
+
+    def flush(self):
+        with self._lock:
+            rotated = self._flush_locked()
+        self._compress(rotated)
+
+    def _flush_locked(self):
+        """Write the buffer; returns the segment rotated out on the way, if any, for compressing unlocked"""
+        if not self._buffer:
+            return None
+        data = "".join(self._buffer).encode("utf-8")
+        rotated = None
+
+        fd = self._open_locked()
+        try:
+            if self._needs_rotation(fd, len(data)):
+                rotated = self._rotate(fd)
+                os.close(fd)
+                fd = self._open_locked()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            # Only once the reports are in the file: a failed write leaves them buffered for the next flush
+            self._buffer = []
+            self.written += data.count(b"\n")
+            if self.fsync != "never":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        return rotated
+
+    def _compress(self, rotated):
+        if not rotated or not self.compression:
+            return
+        try:
+            compress_segment(rotated, self.compression)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not compress {rotated}: {e}")
+
+    def _open_locked(self):
+        # Another process may rotate the file between open and flock, so retry
+        # until the locked descriptor is still the file at self.path
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                os.close(fd)
+                continue
+            opened = os.fstat(fd)
+            if (current.st_ino, current.st_dev) == (opened.st_ino, opened.st_dev):
+                return fd
+            os.close(fd)
+
+    def _needs_rotation(self, fd, incoming):
+        stat = os.fstat(fd)
+        if not stat.st_size:
+            return False
+        if self.max_bytes and stat.st_size + incoming > self.max_bytes:
+            return True
+        if self.rotate_seconds:
+            return int(stat.st_mtime // self.rotate_seconds) != int(time.time() // self.rotate_seconds)
+        return False
+
+    def _rotate(self, fd):
+        # Called with the lock held on fd, which is still the active file
+        base, ext = os.path.splitext(self.path)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(os.fstat(fd).st_mtime))
+        rotated = f"{base}.{stamp}.{os.getpid()}.{self.rotations}{ext}"
+        os.rename(self.path, rotated)
+        self.rotations += 1
+        return rotated
+
+    def close(self):
+        self.flush()
+
+
+def compress_segment(path, compression="gzip"):
+    """Compress a rotated segment next to itself and remove the original"""
+    target = path + SUFFIXES[compression]
+    with open(path, "rb") as source:
+        if compression == "zstd":
+            with open(target, "wb") as out:
+                zstandard.ZstdCompressor().copy_stream(source, out)
+        else:
+            with gzip.open(target, "wb") as out:
+                while True:
+                    chunk = source.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+    os.remove(path)
+    return target
+
+
+def _open_segment(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ValueError(f"Cannot read {path} without the 'zstandard' package")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True), encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def report_segments(path=DEFAULT_REPORTS_PATH):
+    """Rotated segments oldest first, then the active file"""
+    base, ext = os.path.splitext(path)
+    rotated = [p for p in glob.glob(f"{glob.escape(base)}.*{ext}*") if p != path]
+    rotated.sort(key=lambda p: (os.path.getmtime(p), p))
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def iter_reports(path=DEFAULT_REPORTS_PATH, where=None, since=None, include_rotated=True):
+    """Lazily yield reports one line at a time, optionally filtered.
+
+    where is a predicate on the report dict; since compares against the
+    report's ISO "timestamp". A torn last line from a crashed writer is skipped.
+    """
+    segments = report_segments(path) if include_rotated else [path]
+    for segment in segments:
+        if not os.path.exists(segment):
+            continue
+        with _open_segment(segment) as lines:
+            for line in lines:
+                if not line.endswith("\n"):
+                    continue
+                try:
+                    report = json.loads(line)
+                except ValueError:
+                    continue
+                if since and str(report.get("timestamp", "")) < since:
+                    continue
+                if where and not where(report):
+                    continue
+                yield report
+
+
+_default_sink = None
+_default_sink_lock = threading.Lock()
+
+
+def get_report_sink():
+    """Process-wide sink for utils.save_test_report, flushed at exit"""
+    global _default_sink
+    with _default_sink_lock:
+        if _default_sink is None:
+            _default_sink = ReportSink(
+                rotate_seconds=float(os.getenv("REPORTS_ROTATE_SECONDS", "0")) or None,
+                compression=os.getenv("REPORTS_COMPRESSION") or None
+            )
+            atexit.register(_default_sink.close)
+        return _default_sink
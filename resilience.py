@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import random
+import asyncio
+import queue
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+import httpx
+from adaptive_limiter import get_limiter, get_limiter_metrics
+
+# Threads shared by every AsyncComputer for the blocking Orgo SDK calls
+ORGO_IO_THREADS = int(os.getenv("ORGO_IO_THREADS", "64"))
+# Threads that run blocking calls under a deadline; calls that outlive theirs keep a thread until they return
+DEADLINE_THREADS = int(os.getenv("DEADLINE_THREADS", "32"))
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single probe through after reset_timeout"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                return True
+            # Only one probe is allowed while half open
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def abandon_probe(self):
+        """A call ended without an outcome (cancelled, interrupted): a half-open breaker must not wait on it forever.
+
+        The breaker goes back to open with its old opened_at, so the next caller probes again.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+
+class ResilienceMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(self, operation, event, latency=None):
+        with self._lock:
+            stats = self._operations.setdefault(operation, {
+                "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+                "deadline_exceeded": 0, "circuit_rejections": 0, "total_latency_s": 0.0,
+            })
+            stats[event] += 1
+            if latency is not None:
+                stats["total_latency_s"] += latency
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._operations.items()}
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+
+metrics = ResilienceMetrics()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, failure_threshold=5, reset_timeout=30.0):
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return _breakers[name]
+
+
+def get_resilience_metrics():
+    return {
+        "operations": metrics.snapshot(),
+        "breakers": {name: breaker.state for name, breaker in _breakers.items()},
+        "limits": get_limiter_metrics(),
+    }
+
+
+class _DaemonPool:
+    """A bounded set of daemon threads: like an executor, but a call that hangs forever never blocks interpreter exit"""
+
+    def __init__(self, size, name):
+        self.size = max(1, size)
+        self.name = name
+        self._tasks = queue.SimpleQueue()
+        self._threads = []
+        self._idle = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            if self._idle:
+                # Claim an idle worker so concurrent submits don't all count on the same one
+                self._idle -= 1
+            elif len(self._threads) < self.size:
+                thread = threading.Thread(target=self._work, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._tasks.put((future, func, args, kwargs))
+        return future
+
+    def _work(self):
+        # A new thread takes the task it was started for; it counts as idle only once that is done
+        while True:
+            future, func, args, kwargs = self._tasks.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._lock:
+                self._idle += 1
+
+
+_deadline_pool = _DaemonPool(DEADLINE_THREADS, "resilience-call")
+
+
+def call_with_deadline(func, deadline, *args, **kwargs):
+    """Run func on the bounded deadline pool and abandon it if it outlives the deadline"""
+    if not deadline:
+        return func(*args, **kwargs)
+
+    future = _deadline_pool.submit(func, *args, **kwargs)
+    try:
+        # Time spent queued for a free thread counts against the deadline too
+        return future.result(timeout=deadline)
+    except TimeoutError:
+        future.cancel()
+        raise DeadlineExceeded(f"{getattr(func, '__name__', 'call')} exceeded {deadline}s deadline") from None
+
+
+def resilient_call(operation, func, *args, deadline=None, retry=NO_RETRY, breaker=None,
+                   retry_on=(Exception,), limiter=None, cancel_token=None, **kwargs):
+    """Call func with a per-attempt deadline, retries and an optional circuit breaker.
+
+    With an adaptive limiter each attempt waits for one of its slots and
+    reports its latency and outcome back to it. With a cancel token the
+    backoff between attempts ends (raising RunCancelled) when the run is cancelled.
+    """
+    last_error = None
+    for attempt in range(retry.max_attempts):
+        if breaker and not breaker.allow():
+            metrics.record(operation, "circuit_rejections")
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open") from last_error
+
+        metrics.record(operation, "calls")
+        started = time.perf_counter()
+        try:
+            if limiter:
+                with limiter.slot(operation):
+                    result = call_with_deadline(func, deadline, *args, **kwargs)
+            else:
+                result = call_with_deadline(func, deadline, *args, **kwargs)
+        except Exception as e:
+            if not isinstance(e, retry_on):
+                # The remote side answered; a non-transient error says nothing about its health
+                metrics.record(operation, "failures", time.perf_counter() - started)
+                if breaker:
+                    breaker.record_success()
+                raise
+            last_error = e
+            metrics.record(operation, "failures", time.perf_counter() - started)
+            if isinstance(e, DeadlineExceeded):
+                metrics.record(operation, "deadline_exceeded")
+            if breaker:
+                breaker.record_failure()
+            if attempt + 1 >= retry.max_attempts:
+                raise
+            metrics.record(operation, "retries")
+            if cancel_token:
+                cancel_token.sleep(retry.delay(attempt))
+            else:
+                time.sleep(retry.delay(attempt))
+        except BaseException:
+            # Cancelled or interrupted mid-attempt: no outcome to record, but a half-open probe must be released
+            if breaker:
+                breaker.abandon_probe()
+            raise
+        else:
+            metrics.record(operation, "successes", time.perf_counter() - started)
+            if breaker:
+                breaker.record_success()
+            return result
+
+
+async def _wait_for_deadline(awaitable, deadline, func):
+    try:
+        return await asyncio.wait_for(awaitable, deadline)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"{getattr(func, '__name__', 'call')} exceeded {deadline}s deadline") from None
+
+
+async def resilient_call_async(operation, func, *args, deadline=None, retry=NO_RETRY, breaker=None,
+                               retry_on=(Exception,), limiter=None, cancel_token=None, **kwargs):
+    """resilient_call for coroutine functions: the deadline cancels the attempt and backoff never blocks the loop"""
+    last_error = None
+    for attempt in range(retry.max_attempts):
+        if breaker and not breaker.allow():
+            metrics.record(operation, "circuit_rejections")
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open") from last_error
+
+        metrics.record(operation, "calls")
+        started = time.perf_counter()
+        try:
+            if limiter:
+                async with limiter.slot_async(operation):
+                    result = await _wait_for_deadline(func(*args, **kwargs), deadline, func)
+            else:
+                result = await _wait_for_deadline(func(*args, **kwargs), deadline, func)
+        except Exception as e:
+            if not isinstance(e, retry_on):
+                metrics.record(operation, "failures", time.perf_counter() - started)
+                if breaker:
+                    breaker.record_success()
+                raise
+            last_error = e
+            metrics.record(operation, "failures", time.perf_counter() - started)
+            if isinstance(e, DeadlineExceeded):
+                metrics.record(operation, "deadline_exceeded")
+            if breaker:
+                breaker.record_failure()
+            if attempt + 1 >= retry.max_attempts:
+                raise
+            metrics.record(operation, "retries")
+            if cancel_token:
+                await cancel_token.sleep_async(retry.delay(attempt))
+            else:
+                await asyncio.sleep(retry.delay(attempt))
+        except BaseException:
+            if breaker:
+                breaker.abandon_probe()
+            raise
+        else:
+            metrics.record(operation, "successes", time.perf_counter() - started)
+            if breaker:
+                breaker.record_success()
+            return result
+
+
+# Per-operation policy for the Orgo Computer API: (deadline seconds, retry policy).
+# Only calls that are safe to repeat are retried; input events are not.
+ORGO_POLICIES = {
+    "screenshot": (30, RetryPolicy(max_attempts=3)),
+    "status": (15, RetryPolicy(max_attempts=3)),
+    "destroy": (30, RetryPolicy(max_attempts=3)),
+    "exec": (60, NO_RETRY),
+    "left_click": (15, NO_RETRY),
+    "right_click": (15, NO_RETRY),
+    "double_click": (15, NO_RETRY),
+    "type": (30, NO_RETRY),
+    "key": (15, NO_RETRY),
+    "scroll": (15, NO_RETRY),
+}
+
+
+class ResilientComputer:
+    """Wraps an Orgo Computer with deadlines, retries and a circuit breaker per API.
+
+    Calls share the process-wide adaptive "orgo" limiter unless given another.
+    A cancel token makes the backoff between retries end when the run is cancelled.
+    """
+
+    def __init__(self, computer, policies=None, limiter=None, cancel_token=None):
+        self._computer = computer
+        self._policies = dict(ORGO_POLICIES, **(policies or {}))
+        self._limiter = limiter or get_limiter("orgo")
+        self._cancel_token = cancel_token
+
+    def __getattr__(self, name):
+        attr = getattr(self._computer, name)
+        if name not in self._policies or not callable(attr):
+            return attr
+
+        deadline, retry = self._policies[name]
+        breaker = get_breaker(f"orgo:{name}")
+
+        def call(*args, **kwargs):
+            return resilient_call(f"orgo.{name}", attr, *args, deadline=deadline, retry=retry, breaker=breaker,
+                                  limiter=self._limiter, cancel_token=self._cancel_token, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def exec_idempotent(self, command):
+        """Run a read-only shell command, retrying it on transient failures"""
+        deadline, _ = self._policies["exec"]
+        return resilient_call("orgo.exec", self._computer.exec, command,
+                              deadline=deadline, retry=RetryPolicy(max_attempts=3), breaker=get_breaker("orgo:exec"),
+                              limiter=self._limiter, cancel_token=self._cancel_token)
+
+    def exec_background(self, command, deadline=15):
+        """Run a monitoring command: bounded by a deadline, never retried and kept out of the exec breaker"""
+        return resilient_call("orgo.exec_background", self._computer.exec, command, deadline=deadline)
+
+
+_orgo_executor = None
+_orgo_executor_lock = threading.Lock()
+
+
+def get_orgo_executor():
+    global _orgo_executor
+    with _orgo_executor_lock:
+        if _orgo_executor is None:
+            _orgo_executor = ThreadPoolExecutor(max_workers=ORGO_IO_THREADS, thread_name_prefix="orgo-io")
+        return _orgo_executor
+
+
+async def run_in_orgo_thread(func, *args, **kwargs):
+    """Await a blocking Orgo SDK call on the shared Orgo thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_orgo_executor(), functools.partial(func, *args, **kwargs))
+
+
+class AsyncComputer:
+    """Awaitable Orgo Computer with the same per-operation policies as ResilientComputer.
+
+    The SDK is blocking, so each call runs on a shared, bounded thread pool
+    while its deadline and backoff are handled on the event loop; many runs
+    on one loop share ORGO_IO_THREADS threads instead of holding one each.
+    `sync` is a ResilientComputer over the same desktop, for code that stays
+    threaded (cancel callbacks, the resource sampler); it has no cancel token,
+    so cleanup after a cancel still retries.
+    """
+
+    def __init__(self, computer, policies=None, limiter=None, cancel_token=None):
+        self._computer = computer
+        self._policies = dict(ORGO_POLICIES, **(policies or {}))
+        self._limiter = limiter or get_limiter("orgo")
+        self._cancel_token = cancel_token
+        self.sync = ResilientComputer(computer, policies, self._limiter)
+
+    def __getattr__(self, name):
+        attr = getattr(self._computer, name)
+        if not callable(attr):
+            return attr
+
+        if name not in self._policies:
+            async def call(*args, **kwargs):
+                return await run_in_orgo_thread(attr, *args, **kwargs)
+        else:
+            deadline, retry = self._policies[name]
+            breaker = get_breaker(f"orgo:{name}")
+
+            async def call(*args, **kwargs):
+                return await resilient_call_async(f"orgo.{name}", run_in_orgo_thread, attr, *args,
+                                                  deadline=deadline, retry=retry, breaker=breaker,
+                                                  limiter=self._limiter, cancel_token=self._cancel_token, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    async def exec_idempotent(self, command):
+        """Run a read-only shell command, retrying it on transient failures"""
+        deadline, _ = self._policies["exec"]
+        return await resilient_call_async("orgo.exec", run_in_orgo_thread, self._computer.exec, command,
+                                          deadline=deadline, retry=RetryPolicy(max_attempts=3), breaker=get_breaker("orgo:exec"),
+                                          limiter=self._limiter, cancel_token=self._cancel_token)
+
+
+class RetryableHTTPStatus(Exception):
+    """A status worth retrying (429, 5xx gateway errors); carries the response for when retries run out"""
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+async def resilient_get_async(url, fetch, deadline=30, retry=None):
+    """GET with a per-attempt deadline, jittered retries, and a circuit breaker and adaptive limit per target host.
+
+    fetch(url) is the coroutine doing the request, e.g. an httpx.AsyncClient's get.
+    """
+    retry = retry or RetryPolicy(max_attempts=3)
+    breaker = get_breaker(f"host:{urlparse(url).netloc}")
+    limiter = get_limiter(f"host:{urlparse(url).netloc}")
+
+    async def attempt():
+        response = await fetch(url)
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise RetryableHTTPStatus(f"{response.status_code} from {url}", response=response)
+        return response
+
+    try:
+        return await resilient_call_async(
+            "http.get", attempt,
+            deadline=deadline, retry=retry, breaker=breaker, limiter=limiter,
+            retry_on=(httpx.TransportError, RetryableHTTPStatus, DeadlineExceeded)
+        )
+    except RetryableHTTPStatus as e:
+        return e.response
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import asyncio
+import threading
+from contextlib import suppress
+from resilience import run_in_orgo_thread
+
+# Seconds between samples during a run; 0 disables sampling
+SAMPLE_INTERVAL = float(os.getenv("RESOURCE_SAMPLE_INTERVAL", "2"))
+
+# One shell round trip per sample: uptime and clock ticks, system memory, and
+# cumulative CPU ticks plus RSS of every Firefox process. The [f] keeps pgrep
+# from matching the shell running this command. Fields are read after the
+# ") " that closes the process name, which may itself contain spaces.
+SAMPLE_COMMAND = (
+    "echo T $(cut -d' ' -f1 /proc/uptime) $(getconf CLK_TCK) $(getconf PAGESIZE); "
+    "grep -E '^(MemTotal|MemAvailable):' /proc/meminfo; "
+    "P=$(pgrep -f '[f]irefox' | sed 's|.*|/proc/&/stat|'); "
+    "[ -n \"$P\" ] && awk '{sub(/.*\\) /, \"\"); print \"P\", $12 + $13, $22}' $P 2>/dev/null; true"
+)
+
+
+def parse_sample(output):
+    """Sampler command output -> raw counters"""
+    sample = {"firefox_ticks": 0, "firefox_rss_pages": 0, "firefox_processes": 0}
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "T" and len(parts) == 4:
+            sample["uptime_s"] = float(parts[1])
+            sample["clock_ticks"] = int(parts[2])
+            sample["page_size"] = int(parts[3])
+        elif parts[0] in ("MemTotal:", "MemAvailable:"):
+            sample["mem_total_kb" if parts[0] == "MemTotal:" else "mem_available_kb"] = int(parts[1])
+        elif parts[0] == "P" and len(parts) == 3:
+            sample["firefox_ticks"] += int(float(parts[1]))
+            sample["firefox_rss_pages"] += int(parts[2])
+            sample["firefox_processes"] += 1
+    if "uptime_s" not in sample or "mem_total_kb" not in sample:
+        raise ValueError(f"Unrecognised sampler output: {output[:200]!r}")
+    return sample
+
+
+def to_point(sample, previous, started_uptime):
+    """Raw counters -> one time series point; CPU is a percentage of one core since the previous sample"""
+    cpu = None
+    if previous is not None:
+        elapsed = sample["uptime_s"] - previous["uptime_s"]
+        ticks = sample["firefox_ticks"] - previous["firefox_ticks"]
+        # Processes that exit between samples take their ticks with them
+        if elapsed > 0 and ticks >= 0:
+            cpu = round(100.0 * ticks / (elapsed * sample["clock_ticks"]), 1)
+    total, available = sample["mem_total_kb"], sample.get("mem_available_kb", 0)
+    return {
+        "t_s": round(sample["uptime_s"] - started_uptime, 2),
+        "firefox_cpu_pct": cpu,
+        "firefox_rss_mb": round(sample["firefox_rss_pages"] * sample["page_size"] / 1048576, 1),
+        "firefox_processes": sample["firefox_processes"],
+        "mem_used_pct": round(100.0 * (total - available) / total, 1) if total else None,
+        "mem_available_mb": round(available / 1024, 1),
+    }
+
+
+def summarize_series(series):
+    """Peak and mean of each metric, plus Firefox RSS growth over the run"""
+    summary = {"samples": len(series)}
+    for metric in ("firefox_cpu_pct", "firefox_rss_mb", "mem_used_pct"):
+        values = [point[metric] for point in series if point[metric] is not None]
+        summary[metric] = {
+            "peak": max(values) if values else None,
+            "mean": round(sum(values) / len(values), 1) if values else None,
+        }
+    if len(series) >= 2:
+        summary["firefox_rss_growth_mb"] = round(series[-1]["firefox_rss_mb"] - series[0]["firefox_rss_mb"], 1)
+        summary["duration_s"] = series[-1]["t_s"]
+    return summary
+
+
+class ResourceSampler:
+    """Samples Firefox CPU/RSS and system memory on the desktop from a background thread.
+
+    Each sample is a single `exec` call, so it never touches the screen and
+    runs alongside GUI tests. Failed samples are counted and skipped; on a
+    ResilientComputer they go through exec_background so they cannot trip
+    the breaker the tests' own commands rely on. start_async/stop_async run
+    the same loop as a task on the caller's event loop instead of a thread.
+    """
+
+    def __init__(self, computer, interval=SAMPLE_INTERVAL, max_samples=900):
+        self.computer = computer
+        self.interval = interval
+        self.max_samples = max_samples
+        self.series = []
+        self.errors = 0
+        self._previous = None
+        self._started_uptime = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._task = None
+
+    def sample(self):
+        execute = getattr(self.computer, "exec_background", None) or self.computer.exec
+        result = execute(SAMPLE_COMMAND)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error") or "sampler command failed")
+        raw = parse_sample(result.get("output", ""))
+        if self._started_uptime is None:
+            self._started_uptime = raw["uptime_s"]
+        point = to_point(raw, self._previous, self._started_uptime)
+        self._previous = raw
+        self.series.append(point)
+        return point
+
+    def _run(self):
+        while not self._stop.is_set() and len(self.series) < self.max_samples:
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception:
+                self.errors += 1
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def _run_async(self):
+        while not self._stop.is_set() and len(self.series) < self.max_samples:
+            started = time.monotonic()
+            try:
+                await run_in_orgo_thread(self.sample)
+            except Exception:
+                self.errors += 1
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Stop sampling and return the report; an in-flight sample is not waited on past timeout"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        return self.report()
+
+    def start_async(self):
+        self._task = asyncio.get_running_loop().create_task(self._run_async())
+        return self
+
+    async def stop_async(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        return self.report()
+
+    def report(self):
+        series = list(self.series)
+        return {"interval_s": self.interval, "errors": self.errors, "summary": summarize_series(series), "series": series}
+
+
+def format_summary(summary):
+    """One line of peak/mean values for logs and test result details"""
+    if not summary.get("samples"):
+        return "No samples collected"
+    cpu, rss, mem = summary["firefox_cpu_pct"], summary["firefox_rss_mb"], summary["mem_used_pct"]
+
+    def fmt(stats, unit):
+        if stats["peak"] is None:
+            return "n/a"
+        return f"peak {stats['peak']}{unit}, mean {stats['mean']}{unit}"
+
+    return (f"Firefox CPU {fmt(cpu, '%')}; Firefox RSS {fmt(rss, ' MB')}; "
+            f"system memory {fmt(mem, '%')} ({summary['samples']} samples)")
+
+
+if __name__ == "__main__":
+    import subprocess
+
+    class LocalComputer:
+        def exec(self, command):
+            done = subprocess.run(["sh", "-c", command], capture_output=True, text=True)
+            return {"success": done.returncode == 0, "output": done.stdout, "error": done.stderr or None}
+
+    sampler = ResourceSampler(LocalComputer(), interval=0.5).start()
+    time.sleep(3)
+    report = sampler.stop()
+    print(f"🖥️  Local sampler check: {format_summary(report['summary'])}")
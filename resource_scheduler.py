@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import time
+import asyncio
+
+# Resources a test can declare. GUI tests drive the shared screen, mouse and
+# keyboard focus, so only one of them may run at a time.
+GUI = "gui"
+SHELL = "shell"
+NETWORK = "network"
+
+EXCLUSIVE_RESOURCES = frozenset({GUI})
+
+
+def requires(*resources):
+    """Declare which desktop resources a test method needs"""
+    def decorator(func):
+        func.resources = frozenset(resources)
+        return func
+    return decorator
+
+
+def get_resources(test_func):
+    # Undeclared tests are assumed to need the screen, which keeps them serialized
+    return getattr(test_func, "resources", frozenset({GUI}))
+
+
+class ResourceScheduler:
+    """Runs async tests concurrently on the event loop unless they share an exclusive resource"""
+
+    def __init__(self, settle_delay=0, exclusive_resources=EXCLUSIVE_RESOURCES, sleep=asyncio.sleep):
+        self.settle_delay = settle_delay
+        # An async sleep, injectable so a cancellable run can interrupt the settle delay
+        self.sleep = sleep
+        self.exclusive_resources = frozenset(exclusive_resources)
+        self.last_report = {}
+
+    def plan_lanes(self, tests):
+        """Group tests into lanes; tests in a lane run in order, lanes run concurrently"""
+        lanes = []
+        lane_by_resource = {}
+        for test_func in tests:
+            exclusive = sorted(get_resources(test_func) & self.exclusive_resources)
+            lane = next((lane_by_resource[r] for r in exclusive if r in lane_by_resource), None)
+            if lane is None:
+                lane = []
+                lanes.append(lane)
+            lane.append(test_func)
+            for resource in exclusive:
+                lane_by_resource[resource] = lane
+        return lanes
+
+    async def run(self, tests):
+        """Run the test coroutine functions and return their results in the order they were given"""
+        lanes = self.plan_lanes(tests)
+        results = {}
+        durations = {}
+
+        async def run_lane(lane):
+            for index, test_func in enumerate(lane):
+                started = time.perf_counter()
+                try:
+                    results[test_func] = await test_func()
+                except Exception:
+                    results[test_func] = False
+                durations[test_func] = time.perf_counter() - started
+                if self.settle_delay and index < len(lane) - 1:
+                    await self.sleep(self.settle_delay)
+
+        started = time.perf_counter()
+        try:
+            # A lane only raises when the run is cancelled; the group then cancels the other lanes
+            # before returning, so nothing keeps driving the desktop after the caller gives up
+            async with asyncio.TaskGroup() as group:
+                for lane in lanes:
+                    group.create_task(run_lane(lane))
+        except BaseExceptionGroup as failed:
+            raise failed.exceptions[0] from None
+        wall_clock = time.perf_counter() - started
+
+        # Sequential execution would run every test back to back with a settle delay between them
+        serial_estimate = sum(durations.values()) + self.settle_delay * max(0, len(tests) - 1)
+        self.last_report = {
+            "lanes": [[getattr(t, "__name__", str(t)) for t in lane] for lane in lanes],
+            "durations": {getattr(t, "__name__", str(t)): round(d, 3) for t, d in durations.items()},
+            "wall_clock_s": round(wall_clock, 3),
+            "serial_estimate_s": round(serial_estimate, 3),
+            "saved_s": round(max(0.0, serial_estimate - wall_clock), 3),
+        }
+        return [results[test_func] for test_func in tests]
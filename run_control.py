@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import asyncio
+import threading
+
+DEFAULT_RUN_DEADLINE = float(os.getenv("RUN_DEADLINE_SECONDS", "0")) or None
+
+
+class RunCancelled(BaseException):
+    """Raised inside a run once it is cancelled or out of time.
+
+    Derives from BaseException so the testers' broad ``except Exception``
+    handlers around individual steps do not swallow it.
+    """
+
+
+class CancelToken:
+    """Cooperative cancellation and overall deadline for one test run"""
+
+    def __init__(self, deadline_seconds=DEFAULT_RUN_DEADLINE):
+        self.reason = None
+        self.cancelled_at = None
+        self.deadline_seconds = deadline_seconds
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._timer = None
+        if deadline_seconds:
+            self._timer = threading.Timer(deadline_seconds, self.cancel, args=(f"deadline of {deadline_seconds}s exceeded",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """Cancel the run and run the cleanup callbacks on the calling thread"""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self.cancelled_at = time.perf_counter()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer:
+            self._timer.cancel()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️  Warning: Cancel callback failed: {e}")
+        return True
+
+    def on_cancel(self, callback):
+        """Register cleanup to run as soon as the run is cancelled"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def check(self):
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+    def sleep(self, seconds):
+        """time.sleep that wakes up early and raises once the run is cancelled"""
+        if self._event.wait(seconds):
+            raise RunCancelled(self.reason)
+
+    async def sleep_async(self, seconds, poll=0.1):
+        """asyncio.sleep that wakes up within `poll` seconds of a cancel and raises"""
+        deadline = time.monotonic() + seconds
+        while True:
+            self.check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(poll, remaining))
+
+    def finish(self):
+        # Stop the deadline timer once the run is over
+        if self._timer:
+            self._timer.cancel()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import uuid
+import atexit
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = os.getenv("RUN_HISTORY_DB", "run_history.db")
+# Runs are written in batches; reads see pending runs too, so batching never hides a run
+DEFAULT_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "20"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    test_name TEXT,
+    tester TEXT,
+    status TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    duration_s REAL,
+    total_tests INTEGER NOT NULL DEFAULT 0,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    report TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_url_timestamp ON runs (url, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_status_timestamp ON runs (status, timestamp);
+
+CREATE TABLE IF NOT EXISTS stage_timings (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_stage ON stage_timings (stage, timestamp, duration_s);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_url ON stage_timings (url, stage, timestamp);
+
+CREATE TABLE IF NOT EXISTS site_metrics (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_site_metrics_url ON site_metrics (url, metric, timestamp);
+
+CREATE TABLE IF NOT EXISTS page_fingerprints (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_page_fingerprints_run ON page_fingerprints (run_id);
+
+CREATE TABLE IF NOT EXISTS url_daily_rollup (
+    url TEXT NOT NULL,
+    day TEXT NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    passed_runs INTEGER NOT NULL DEFAULT 0,
+    total_duration_s REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (url, day)
+);
+"""
+
+STATUSES = ("passed", "failed", "error", "cancelled")
+
+
+class RunHistoryStore:
+    """SQLite-backed history of test runs, shared by the testers and the backend"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def record_run(self, url, status, test_name=None, tester=None, run_id=None,
+                   timestamp=None, duration_s=None, test_results=None, stage_timings=None,
+                   site_metrics=None, fingerprint=None, report=None):
+        """Queue a run for insertion; the batch is written once batch_size runs are pending"""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown run status: {status}")
+
+        test_results = test_results or []
+        run = {
+            "run_id": run_id or str(uuid.uuid4()),
+            "url": url,
+            "test_name": test_name,
+            "tester": tester,
+            "status": status,
+            "timestamp": timestamp or time.time(),
+            "duration_s": duration_s,
+            "total_tests": len(test_results),
+            "passed": len([r for r in test_results if r.get("status") == "PASS"]),
+            "failed": len([r for r in test_results if r.get("status") == "FAIL"]),
+            "report": json.dumps(report, default=str) if report is not None else None,
+            "stage_timings": stage_timings or {},
+            "site_metrics": site_metrics or {},
+            "fingerprint": fingerprint,
+        }
+
+        with self._lock:
+            self._pending.append(run)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        return run["run_id"]
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _read(self, query, params=()):
+        """Run a query after writing any pending runs, so answers include them"""
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(query, params).fetchall()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        runs, self._pending = self._pending, []
+
+        with self._conn:
+            # A replayed run_id is ignored here, and must not count again in the rollups below
+            inserted = [run for run in runs if self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, url, test_name, tester, status, timestamp, duration_s, "
+                "total_tests, passed, failed, report) VALUES (:run_id, :url, :test_name, :tester, :status, "
+                ":timestamp, :duration_s, :total_tests, :passed, :failed, :report)",
+                run
+            ).rowcount == 1]
+
+            stage_rows = []
+            metric_rows = []
+            fingerprint_rows = []
+            rollups = {}
+            for run in inserted:
+                day = time.strftime("%Y-%m-%d", time.gmtime(run["timestamp"]))
+                rollup = rollups.setdefault((run["url"], day), [0, 0, 0.0])
+                rollup[0] += 1
+                rollup[1] += 1 if run["status"] == "passed" else 0
+                rollup[2] += run["duration_s"] or 0.0
+                for stage, duration in run["stage_timings"].items():
+                    stage_rows.append((run["run_id"], run["url"], stage, duration, run["timestamp"]))
+                for metric, value in run["site_metrics"].items():
+                    metric_rows.append((run["run_id"], run["url"], metric, value, run["timestamp"]))
+                if run["fingerprint"]:
+                    fingerprint_rows.append((run["run_id"], run["url"], run["fingerprint"], run["timestamp"]))
+
+            self._conn.executemany(
+                "INSERT INTO stage_timings (run_id, url, stage, duration_s, timestamp) VALUES (?, ?, ?, ?, ?)",
+                stage_rows
+            )
+            self._conn.executemany(
+                "INSERT INTO site_metrics (run_id, url, metric, value, timestamp) VALUES (?, ?, ?, ?, ?)",
+                metric_rows
+            )
+            self._conn.executemany(
+                "INSERT INTO page_fingerprints (run_id, url, fingerprint, timestamp) VALUES (?, ?, ?, ?)",
+                fingerprint_rows
+            )
+            # Rollups are maintained incrementally so trend queries never scan the runs table
+            self._conn.executemany(
+                "INSERT INTO url_daily_rollup (url, day, runs, passed_runs, total_duration_s) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (url, day) DO UPDATE SET runs = runs + excluded.runs, "
+                "passed_runs = passed_runs + excluded.passed_runs, "
+                "total_duration_s = total_duration_s + excluded.total_duration_s",
+                [(url, day, *values) for (url, day), values in rollups.items()]
+            )
+
+    def history(self, page=1, page_size=50, url=None, status=None):
+        """Return one page of runs, newest first"""
+        page = max(1, page)
+        page_size = min(max(1, page_size), 500)
+        clauses, params = [], []
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self._flush_locked()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM runs {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT run_id, url, test_name, tester, status, timestamp, duration_s, total_tests, passed, failed "
+                f"FROM runs {where} ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+
+        return {"page": page, "page_size": page_size, "total": total, "runs": [dict(row) for row in rows]}
+
+    def pass_rate_trend(self, url, days=30):
+        """Daily pass rate for a URL, read from the incrementally maintained rollup"""
+        since = time.strftime("%Y-%m-%d", time.gmtime(time.time() - days * 86400))
+        rows = self._read(
+            "SELECT day, runs, passed_runs, total_duration_s FROM url_daily_rollup "
+            "WHERE url = ? AND day >= ? ORDER BY day",
+            (url, since)
+        )
+
+        return [{
+            "day": row["day"],
+            "runs": row["runs"],
+            "passed_runs": row["passed_runs"],
+            "pass_rate": round(row["passed_runs"] / row["runs"], 4) if row["runs"] else None,
+            "mean_duration_s": round(row["total_duration_s"] / row["runs"], 3) if row["runs"] else None,
+        } for row in rows]
+
+    def recent_runs(self, urls=None, per_url=20, days=None):
+        """Latest runs per URL, newest first, with their page fingerprints and reports"""
+        clauses, params = [], []
+        if urls:
+            clauses.append(f"r.url IN ({','.join('?' * len(urls))})")
+            params.extend(urls)
+        if days:
+            clauses.append("r.timestamp >= ?")
+            params.append(time.time() - days * 86400)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._read(
+            f"SELECT * FROM (SELECT r.run_id, r.url, r.status, r.timestamp, r.duration_s, r.report, f.fingerprint, "
+            f"ROW_NUMBER() OVER (PARTITION BY r.url ORDER BY r.timestamp DESC) AS rn "
+            f"FROM runs r LEFT JOIN page_fingerprints f ON f.run_id = r.run_id {where}) "
+            f"WHERE rn <= ? ORDER BY url, timestamp DESC",
+            params + [per_url]
+        )
+
+        runs = {}
+        for row in rows:
+            run = {key: row[key] for key in row.keys() if key != "rn"}
+            run["report"] = json.loads(run["report"]) if run["report"] else None
+            runs.setdefault(run["url"], []).append(run)
+        return runs
+
+    def _percentiles(self, table, group, value, percentiles, filters, days):
+        """Nearest-rank percentiles of `value` per `group`, computed in SQL"""
+        clauses, params = [], []
+        for column, wanted in filters.items():
+            if wanted:
+                clauses.append(f"{column} = ?")
+                params.append(wanted)
+        if days:
+            clauses.append("timestamp >= ?")
+            params.append(time.time() - days * 86400)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        columns = ", ".join(
+            f"MIN(CASE WHEN rn >= ({int(p)} * cnt + 99) / 100 THEN {value} END) AS p{int(p)}"
+            for p in percentiles
+        )
+        query = (
+            f"SELECT {group}, MAX(cnt) AS samples, AVG({value}) AS mean, {columns} FROM ("
+            f"SELECT {group}, {value}, "
+            f"ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY {value}) AS rn, "
+            f"COUNT(*) OVER (PARTITION BY {group}) AS cnt FROM {table} {where}"
+            f") GROUP BY {group} ORDER BY {group}"
+        )
+        rows = self._read(query, params)
+        return {row[group]: {key: row[key] for key in row.keys() if key != group} for row in rows}
+
+    def stage_percentiles(self, percentiles=(50, 90, 99), stage=None, url=None, days=None):
+        """Nearest-rank latency percentiles per stage, computed in SQL"""
+        return self._percentiles("stage_timings", "stage", "duration_s", percentiles, {"stage": stage, "url": url}, days)
+
+    def site_metric_percentiles(self, url, percentiles=(50, 90, 99), metric=None, days=None):
+        """Percentiles of a URL's site performance metrics (TTFB, sizes, ...) across runs"""
+        return self._percentiles("site_metrics", "metric", "value", percentiles, {"url": url, "metric": metric}, days)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_history_store(path=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Shared store per database path; returns None when history is disabled (RUN_HISTORY_DB='')"""
+    path = DEFAULT_DB_PATH if path is None else path
+    if not path:
+        return None
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = RunHistoryStore(path, batch_size=batch_size)
+            # A CLI run ends with its runs still pending
+            atexit.register(_stores[path].flush)
+        return _stores[path]
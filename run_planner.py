@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import heapq
+import random
+import statistics
+from run_history import get_history_store
+
+# Assumed duration of a URL with no recorded runs
+DEFAULT_DURATION_S = float(os.getenv("PLAN_DEFAULT_DURATION", "90"))
+# Share of stable URLs still run each night; the rest are skipped until sampled or stale
+PLAN_SAMPLE_RATE = float(os.getenv("PLAN_SAMPLE_RATE", "0.25"))
+# A URL is always run once its last run is this old
+PLAN_MAX_SKIP_DAYS = float(os.getenv("PLAN_MAX_SKIP_DAYS", "7"))
+
+# Optional tester checks a plan may leave out, by their result name
+SKIPPABLE_CHECKS = {"Link Check": "links", "Visual Regression": "visual"}
+# Runs a check must have passed in a row before it can be skipped
+STABLE_STREAK = 14
+
+TIERS = ("new", "failing", "changed", "flaky", "stale", "sampled")
+
+
+def makespan(durations, lanes=1):
+    """Finish time of jobs started in the given order on `lanes` parallel slots"""
+    finish = [0.0] * max(1, lanes)
+    for duration in durations:
+        heapq.heappush(finish, heapq.heappop(finish) + duration)
+    return max(finish)
+
+
+def url_profile(url, runs, now=None, max_skip_days=PLAN_MAX_SKIP_DAYS):
+    """Failure odds, flakiness, duration and change signals for one URL from its runs, newest first"""
+    now = now or time.time()
+    if not runs:
+        return {"url": url, "runs": 0, "reason": "new", "p_fail": 1.0, "flakiness": 0.0,
+                "expected_duration_s": DEFAULT_DURATION_S, "stable_checks": []}
+
+    statuses = [run["status"] == "passed" for run in runs]
+    # Laplace smoothing: two passes in two runs is not yet certainty
+    p_fail = (statuses.count(False) + 1) / (len(statuses) + 2)
+    flips = sum(1 for newer, older in zip(statuses, statuses[1:]) if newer != older)
+    flakiness = flips / (len(statuses) - 1) if len(statuses) > 1 else 0.0
+    durations = [run["duration_s"] for run in runs if run["duration_s"]]
+    fingerprints = [run["fingerprint"] for run in runs if run["fingerprint"]]
+    age_days = (now - runs[0]["timestamp"]) / 86400
+
+    if not statuses[0]:
+        reason = "failing"
+    elif len(fingerprints) >= 2 and fingerprints[0] != fingerprints[1]:
+        reason = "changed"
+    elif flakiness >= 0.2:
+        reason = "flaky"
+    elif age_days >= max_skip_days:
+        reason = "stale"
+    else:
+        reason = "stable"
+
+    return {
+        "url": url,
+        "runs": len(runs),
+        "reason": reason,
+        "p_fail": round(p_fail, 3),
+        "flakiness": round(flakiness, 3),
+        "expected_duration_s": round(statistics.median(durations), 1) if durations else DEFAULT_DURATION_S,
+        "last_run_age_days": round(age_days, 2),
+        "stable_checks": stable_checks(runs),
+    }
+
+
+def stable_checks(runs, streak=STABLE_STREAK):
+    """Skippable checks that passed in each of the last `streak` runs"""
+    history = {}
+    for run in runs[:streak]:
+        results = (run.get("report") or {}).get("results", [])
+        for name in SKIPPABLE_CHECKS:
+            outcomes = [r["status"] for r in results if r["test"] == name]
+            history.setdefault(name, []).append(bool(outcomes) and all(status == "PASS" for status in outcomes))
+    return [SKIPPABLE_CHECKS[name] for name, passed in history.items() if len(passed) >= streak and all(passed)]
+
+
+def build_plan(urls, store=None, budget_s=None, lanes=1, sample_rate=PLAN_SAMPLE_RATE,
+               max_skip_days=PLAN_MAX_SKIP_DAYS, seed=None, now=None):
+    """Choose and order tonight's runs from past results.
+
+    New, failing, changed, flaky and stale URLs always qualify; stable ones
+    are sampled with odds of sample_rate plus their failure probability.
+    Within the time budget jobs are admitted in that priority order, then
+    each tier is ordered longest first so `lanes` desktops finish together.
+    Sampling is seeded by date, so re-planning the same night gives the same plan.
+    """
+    urls = list(dict.fromkeys(urls))
+    store = get_history_store() if store is None else store
+    history = store.recent_runs(urls, per_url=30) if store else {}
+    profiles = [url_profile(url, history.get(url, []), now, max_skip_days) for url in urls]
+    rng = random.Random(seed if seed is not None else time.strftime("%Y-%m-%d"))
+
+    candidates, skipped = [], []
+    for profile in profiles:
+        if profile["reason"] == "stable":
+            if rng.random() >= min(1.0, sample_rate + profile["p_fail"]):
+                skipped.append(dict(profile, skipped_because="stable, not sampled"))
+                continue
+            profile = dict(profile, reason="sampled")
+        candidates.append(profile)
+    candidates.sort(key=lambda p: (TIERS.index(p["reason"]), -p["p_fail"]))
+
+    def run_order(profiles):
+        return sorted(profiles, key=lambda p: (TIERS.index(p["reason"]), -p["expected_duration_s"]))
+
+    selected = []
+    for profile in candidates:
+        trial = run_order(selected + [profile])
+        if budget_s and makespan([p["expected_duration_s"] for p in trial], lanes) > budget_s:
+            skipped.append(dict(profile, skipped_because="over time budget"))
+            continue
+        selected = trial
+
+    jobs = []
+    for profile in selected:
+        # Checks with a long clean streak are sampled too, unless the page just changed
+        skip = [] if profile["reason"] in ("new", "changed", "failing") else [
+            check for check in profile["stable_checks"] if rng.random() >= sample_rate
+        ]
+        jobs.append(dict(profile, skip_checks=skip))
+
+    full = makespan(sorted((p["expected_duration_s"] for p in profiles), reverse=True), lanes)
+    planned = makespan([job["expected_duration_s"] for job in jobs], lanes)
+    total_risk = sum(p["p_fail"] for p in profiles)
+    return {
+        "lanes": lanes,
+        "budget_s": budget_s,
+        "jobs": jobs,
+        "skipped": skipped,
+        "full_makespan_s": round(full, 1),
+        "plan_makespan_s": round(planned, 1),
+        "saved_s": round(full - planned, 1),
+        "saved_pct": round(100 * (full - planned) / full, 1) if full else 0.0,
+        "risk_covered_pct": round(100 * sum(job["p_fail"] for job in jobs) / total_risk, 1) if total_risk else 100.0,
+        "checks_skipped": sum(len(job["skip_checks"]) for job in jobs),
+    }
+
+
+def format_plan(plan):
+    """Lines describing the plan and its expected savings, printed before the run"""
+    jobs = plan["jobs"]
+    counts = {tier: sum(1 for job in jobs if job["reason"] == tier) for tier in TIERS}
+    lines = [
+        f"🗓️  Run plan: {len(jobs)} of {len(jobs) + len(plan['skipped'])} URLs on {plan['lanes']} lane(s)"
+        + (f", budget {plan['budget_s']:.0f}s" if plan["budget_s"] else ""),
+        "   " + ", ".join(f"{count} {tier}" for tier, count in counts.items() if count),
+        f"   Expected: {plan['plan_makespan_s']:.0f}s instead of {plan['full_makespan_s']:.0f}s "
+        f"(saves {plan['saved_s']:.0f}s, {plan['saved_pct']}%), covering {plan['risk_covered_pct']}% of failure risk; "
+        f"{plan['checks_skipped']} stable check(s) skipped",
+    ]
+    for job in jobs:
+        skip = f" (skip: {', '.join(job['skip_checks'])})" if job["skip_checks"] else ""
+        lines.append(f"   ▶ {job['url']} [{job['reason']}] ~{job['expected_duration_s']:.0f}s, p(fail) {job['p_fail']:.2f}{skip}")
+    for entry in plan["skipped"]:
+        lines.append(f"   ⏭️  {entry['url']}: {entry['skipped_because']}")
+    return lines
+
+
+async def run_plan(plan, make_tester=None):
+    """Run the plan's jobs in order on one event loop, at most `lanes` at a time"""
+    import asyncio
+    from intelligent_website_tester import AsyncIntelligentWebsiteTester
+    from text_dedup import new_boilerplate_filter
+
+    # The plan's pages share a boilerplate filter, so each site's nav and footer reach the analysis once
+    boilerplate = new_boilerplate_filter()
+    make_tester = make_tester or (lambda job: AsyncIntelligentWebsiteTester(
+        renderer="none", skip_checks=job["skip_checks"], boilerplate=boilerplate
+    ))
+    queue = asyncio.Queue()
+    for job in plan["jobs"]:
+        queue.put_nowait(job)
+    results = {}
+
+    async def lane():
+        while not queue.empty():
+            job = queue.get_nowait()
+            tester = make_tester(job)
+            started = time.perf_counter()
+            try:
+                ok = await tester.run(job["url"], f"Planned run ({job['reason']})")
+                results[job["url"]] = {"success": ok}
+            except Exception as e:
+                # One broken job must not stop its lane or cancel the other lanes' runs
+                ok = False
+                results[job["url"]] = {"success": False, "error": str(e)}
+            results[job["url"]]["duration_s"] = round(time.perf_counter() - started, 1)
+            print(f"{'✅' if ok else '❌'} {job['url']} in {results[job['url']]['duration_s']}s")
+
+    await asyncio.gather(*(lane() for _ in range(max(1, plan["lanes"]))))
+    return results
+
+
+def seed_history(store, urls, nights=30, seed=0):
+    """Synthetic nightly history: mostly stable sites, a few flaky, failing or changing ones"""
+    rng = random.Random(seed)
+    now = time.time()
+    for index, url in enumerate(urls):
+        kind = ("failing", "flaky", "changing")[index % 3] if index % 10 == 0 else "stable"
+        duration = rng.uniform(40, 240)
+        for night in range(nights, 0, -1):
+            passed = {"failing": night > 2, "flaky": rng.random() < 0.6}.get(kind, rng.random() < 0.995)
+            checks = [{"test": name, "status": "PASS"} for name in SKIPPABLE_CHECKS]
+            store.record_run(
+                url, "passed" if passed else "failed", tester="seed",
+                timestamp=now - night * 86400, duration_s=duration * rng.uniform(0.9, 1.1),
+                fingerprint=f"{url}-{night if kind == 'changing' and night == 1 else 0}",
+                test_results=checks, report={"results": checks}
+            )
+    store.flush()
+
+
+if __name__ == "__main__":
+    import sys
+    import asyncio
+
+    args = sys.argv[1:]
+    options = {"--budget": None, "--lanes": "1"}
+    for flag in options:
+        if flag in args:
+            index = args.index(flag)
+            options[flag] = args[index + 1]
+            del args[index:index + 2]
+    execute = "--run" in args
+    demo = "--demo" in args
+    args = [arg for arg in args if arg not in ("--run", "--demo")]
+
+    if demo:
+        from run_history import RunHistoryStore
+        store = RunHistoryStore(":memory:", batch_size=500)
+        args = [f"https://site{i}.example.com" for i in range(50)]
+        seed_history(store, args)
+    else:
+        store = None
+
+    if not args:
+        print("Usage: python3 run_planner.py [--budget SECONDS] [--lanes N] [--run] <url> [<url> ...]")
+        print("       python3 run_planner.py --demo [--budget SECONDS] [--lanes N]   # 50 URLs of synthetic history")
+        sys.exit(1)
+
+    budget = float(options["--budget"]) if options["--budget"] else None
+    plan = build_plan(args, store=store, budget_s=budget, lanes=int(options["--lanes"]))
+    print("\n".join(format_plan(plan)))
+    if execute and not demo:
+        asyncio.run(run_plan(plan))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import asyncio
+from simple_website_tester import AsyncSimpleWebsiteTester
+from run_control import RunCancelled
+
+DEFAULT_TABS_PER_DESKTOP = int(os.getenv("TABS_PER_DESKTOP", "5"))
+# Firefox selects tabs 1-8 directly with Alt+1..8 (Alt+9 is always the last tab)
+MAX_TABS_PER_DESKTOP = 8
+# Title of the active Firefox tab, read without moving keyboard focus
+WINDOW_TITLE_COMMAND = "xdotool getwindowname $(xdotool search --onlyvisible --class firefox | tail -1)"
+# Optional price used to turn desktop-seconds into money in the cost report
+DESKTOP_COST_PER_HOUR = float(os.getenv("ORGO_DESKTOP_COST_PER_HOUR", "0"))
+
+
+class AsyncShardedWebsiteTester(AsyncSimpleWebsiteTester):
+    """Smoke-tests several URLs as tabs of a single Orgo desktop"""
+
+    def __init__(self, tabs_per_desktop=DEFAULT_TABS_PER_DESKTOP, cancel_token=None, computer_factory=None):
+        super().__init__(cancel_token, computer_factory=computer_factory)
+        self.tabs_per_desktop = min(MAX_TABS_PER_DESKTOP, max(1, tabs_per_desktop))
+        # Window title of each tab of the current shard, recorded before any test touched them
+        self.tab_titles = []
+        self.url_timings = {}
+        self.shard_timings = []
+
+    async def open_tabs(self, urls):
+        print(f"🖥️  Opening {len(urls)} tabs in one Firefox window...")
+        result = await self.computer.exec(f"firefox --new-window {urls[0]}")
+        if not result['success']:
+            print(f"⚠️  Firefox launch: {result['error']}")
+        await self.cancel_token.sleep_async(3)
+
+        for url in urls[1:]:
+            result = await self.computer.exec(f"firefox --new-tab {url}")
+            if not result['success']:
+                print(f"⚠️  Opening tab for {url}: {result['error']}")
+            await self.cancel_token.sleep_async(1)
+
+        # Let the last tabs finish loading before the first one is inspected
+        await self.cancel_token.sleep_async(5)
+
+        # Tests may open tabs or popups that shift the ones after them; the titles tell when that happened
+        self.tab_titles = []
+        for index in range(len(urls)):
+            await self.computer.key(f"alt+{index + 1}")
+            await self.cancel_token.sleep_async(0.5)
+            self.tab_titles.append(await self.window_title())
+
+    async def window_title(self):
+        """Title of the active tab, or None when the desktop cannot tell"""
+        result = await self.computer.exec(WINDOW_TITLE_COMMAND)
+        return (result.get('output') or '').strip() or None if result['success'] else None
+
+    async def select_tab(self, index):
+        # Absolute, so a tab opened by an earlier test cannot shift every later selection by one
+        await self.computer.key(f"alt+{index + 1}")
+        await self.cancel_token.sleep_async(1)
+
+        expected = self.tab_titles[index] if index < len(self.tab_titles) else None
+        if expected:
+            title = await self.window_title()
+            if title != expected:
+                raise RuntimeError(f"tab {index + 1} shows '{title}', expected '{expected}'")
+
+    async def test_tab(self, url):
+        self.current_url = url
+        print(f"\n🌐 Testing tab: {url}")
+        print("-" * 40)
+
+        started = time.perf_counter()
+        await self.test_screenshot_capture()
+        for test_func in (self.test_button_interaction, self.test_keyboard_input, self.test_scroll_functionality):
+            await test_func()
+        self.url_timings[url] = time.perf_counter() - started
+
+    async def run_shard(self, urls):
+        shard = {"urls": list(urls)}
+        started = time.perf_counter()
+        try:
+            await self.start_virtual_desktop()
+            shard["desktop_startup_s"] = time.perf_counter() - started
+
+            launch_started = time.perf_counter()
+            await self.open_tabs(urls)
+            shard["browser_launch_s"] = time.perf_counter() - launch_started
+
+            for index, url in enumerate(urls):
+                self.current_url = url
+                try:
+                    await self.select_tab(index)
+                except Exception as e:
+                    # Tabs are out of order from here on; testing them would blame the wrong URLs
+                    for skipped in urls[index:]:
+                        self.current_url = skipped
+                        self.log_test_result("Tab Selection", "FAIL", f"Error: {str(e)}")
+                    break
+                await self.test_tab(url)
+
+        except Exception as e:
+            for url in urls:
+                if url not in self.url_timings:
+                    self.current_url = url
+                    self.log_test_result("Sharded Run", "FAIL", f"Error: {str(e)}")
+
+        finally:
+            self.current_url = None
+            teardown_started = time.perf_counter()
+            await asyncio.to_thread(self.destroy_virtual_desktop)
+            self.computer = None
+            shard["teardown_s"] = time.perf_counter() - teardown_started
+            shard["total_s"] = time.perf_counter() - started
+            self.shard_timings.append(shard)
+
+    async def run_sharded(self, urls, test_name="Sharded Website Test"):
+        print(f"🚀 Starting sharded website test: {test_name}")
+        print(f"🌐 {len(urls)} URLs, up to {self.tabs_per_desktop} tabs per desktop")
+        print("=" * 60)
+
+        try:
+            for start in range(0, len(urls), self.tabs_per_desktop):
+                shard_started = time.time()
+                shard_urls = urls[start:start + self.tabs_per_desktop]
+                await self.run_shard(shard_urls)
+                self.record_shard_history(shard_urls, test_name, shard_started)
+        except RunCancelled as e:
+            print(f"🛑 Sharded test cancelled: {e}")
+            return False
+        finally:
+            self.cancel_token.finish()
+
+        report = self.get_sharded_report()
+        self.print_sharded_summary(report)
+        return all(entry["failed"] == 0 for entry in report["urls"].values())
+
+    def record_shard_history(self, urls, test_name, started_at):
+        if not self.history_store:
+            return
+        for url in urls:
+            results = [r for r in self.test_results if r.get("url") == url]
+            failed = not results or any(r["status"] == "FAIL" for r in results)
+            try:
+                self.history_store.record_run(
+                    url, "failed" if failed else "passed",
+                    test_name=test_name,
+                    tester=type(self).__name__,
+                    timestamp=started_at,
+                    duration_s=self.url_timings.get(url),
+                    test_results=results,
+                    stage_timings={"tab_checks": round(self.url_timings.get(url, 0), 3)}
+                )
+            except Exception as e:
+                print(f"⚠️  Warning: Could not record run history for {url}: {e}")
+
+    def estimate_cost(self):
+        """Compare measured desktop-seconds per URL against one desktop per URL"""
+        desktop_seconds = sum(shard["total_s"] for shard in self.shard_timings)
+        url_count = sum(len(shard["urls"]) for shard in self.shard_timings)
+
+        # A dedicated desktop pays startup, browser launch and teardown for every URL
+        dedicated_seconds = 0.0
+        for shard in self.shard_timings:
+            overhead = shard.get("desktop_startup_s", 0) + shard.get("browser_launch_s", 0) + shard.get("teardown_s", 0)
+            for url in shard["urls"]:
+                dedicated_seconds += overhead + self.url_timings.get(url, 0)
+
+        def price(seconds):
+            return round(seconds / 3600 * DESKTOP_COST_PER_HOUR, 4)
+
+        return {
+            "urls": url_count,
+            "desktops": len(self.shard_timings),
+            "sharded_desktop_seconds": round(desktop_seconds, 1),
+            "sharded_seconds_per_url": round(desktop_seconds / url_count, 1) if url_count else 0,
+            "dedicated_desktop_seconds": round(dedicated_seconds, 1),
+            "dedicated_seconds_per_url": round(dedicated_seconds / url_count, 1) if url_count else 0,
+            "sharded_cost": price(desktop_seconds),
+            "dedicated_cost": price(dedicated_seconds),
+        }
+
+    def get_sharded_report(self):
+        urls = {}
+        for shard in self.shard_timings:
+            for url in shard["urls"]:
+                results = [r for r in self.test_results if r.get("url") == url]
+                urls[url] = {
+                    "total_tests": len(results),
+                    "passed": len([r for r in results if r["status"] == "PASS"]),
+                    "failed": len([r for r in results if r["status"] == "FAIL"]),
+                    "duration_s": round(self.url_timings.get(url, 0), 1),
+                    "results": results,
+                }
+        return {"urls": urls, "shards": self.shard_timings, "cost": self.estimate_cost()}
+
+    def print_sharded_summary(self, report):
+        print("\n" + "=" * 60)
+        print("📊 SHARDED TEST SUMMARY")
+        print("=" * 60)
+
+        for url, entry in report["urls"].items():
+            status_icon = "✅" if entry["failed"] == 0 and entry["total_tests"] else "❌"
+            print(f"{status_icon} {url}: {entry['passed']}/{entry['total_tests']} passed in {entry['duration_s']}s")
+
+        cost = report["cost"]
+        print(f"\n💰 {cost['urls']} URLs on {cost['desktops']} desktop(s)")
+        print(f"   Sharded:   {cost['sharded_seconds_per_url']}s per URL ({cost['sharded_desktop_seconds']} desktop-seconds)")
+        print(f"   Dedicated: {cost['dedicated_seconds_per_url']}s per URL ({cost['dedicated_desktop_seconds']} desktop-seconds, estimated)")
+        if DESKTOP_COST_PER_HOUR:
+            print(f"   Cost: ${cost['sharded_cost']} sharded vs ${cost['dedicated_cost']} dedicated")
+
+
+class ShardedWebsiteTester(AsyncShardedWebsiteTester):
+    """Blocking entry point: each run gets its own event loop on the calling thread"""
+
+    def run_sharded_test(self, urls, test_name="Sharded Website Test"):
+        return asyncio.run(self.run_sharded(urls, test_name))
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    tabs_per_desktop = DEFAULT_TABS_PER_DESKTOP
+    if len(args) >= 2 and args[0] == "--tabs":
+        tabs_per_desktop = int(args[1])
+        args = args[2:]
+
+    if not args:
+        print("Usage: python3 sharded_website_tester.py [--tabs N] <url> [<url> ...]")
+        print("Example: python3 sharded_website_tester.py --tabs 4 https://example.com https://httpbin.org")
+        sys.exit(1)
+
+    tester = ShardedWebsiteTester(tabs_per_desktop)
+    success = tester.run_sharded_test(args)
+
+    if success:
+        print("\n🎉 Sharded website test completed successfully!")
+    else:
+        print("\n❌ Sharded website test completed with issues.")
@@ -3,31 +3,79 @@
 import os
 import time
 import json
+import uuid
+import asyncio
+import threading
 from orgo import Computer
 from dotenv import load_dotenv
+from PIL import Image
+from resource_scheduler import ResourceScheduler, requires, GUI, SHELL
+from run_history import get_history_store
+from resilience import AsyncComputer, run_in_orgo_thread, get_resilience_metrics
+from run_control import CancelToken, RunCancelled
+from click_targets import click_positions_from_screenshot, BROWSER_CHROME_HEIGHT
+from page_stitcher import StreamingStitcher, IDENTICAL, NO_OVERLAP
+from visual_regression import BaselineStore, check_screenshot
+from resource_sampler import ResourceSampler, SAMPLE_INTERVAL, format_summary
 
 load_dotenv()
 
-class SimpleWebsiteTester:
-    def __init__(self):
+class AsyncSimpleWebsiteTester:
+    """The simple tester on asyncio, like AsyncIntelligentWebsiteTester: Orgo calls go
+    through AsyncComputer and waits through the cancel token, so many runs share one loop.
+    computer_factory replaces the Orgo desktop, e.g. with a fake.
+    """
+    
+    def __init__(self, cancel_token=None, full_page=False, update_baseline=False, computer_factory=None):
         self.computer = None
+        self.computer_factory = computer_factory
+        self.full_page = full_page
+        self.full_page_capture = {}
+        self.update_baseline = update_baseline
+        self.baseline_store = BaselineStore()
+        # URL -> visual comparison summary
+        self.visual_checks = {}
         self.test_results = []
+        self.schedule_report = {}
+        self.resource_sampler = None
+        self.resource_usage = {}
+        # URL that results are attributed to when one desktop tests several pages
+        self.current_url = None
+        self.run_id = str(uuid.uuid4())
+        self.stage_timings = {}
+        self.history_store = get_history_store()
+        self.cancel_token = cancel_token or CancelToken()
+        self.resources_freed_at = None
+        self._desktop_lock = threading.Lock()
         
-    def start_virtual_desktop(self):
+    async def start_virtual_desktop(self):
         orgo_key = os.getenv("ORGO_API_KEY")
-        if not orgo_key:
+        if not orgo_key and not self.computer_factory:
             raise ValueError("ORGO_API_KEY not found in environment variables")
         
-        self.computer = Computer(api_key=orgo_key)
+        self.cancel_token.check()
+        computer = await run_in_orgo_thread(self.computer_factory or (lambda: Computer(api_key=orgo_key)))
+        self.computer = AsyncComputer(computer, cancel_token=self.cancel_token)
+        self.cancel_token.on_cancel(self.destroy_virtual_desktop)
         print("✅ Virtual desktop started successfully")
         
     def destroy_virtual_desktop(self):
-        if self.computer:
-            try:
-                self.computer.destroy()
-                print("✅ Virtual desktop destroyed successfully")
-            except Exception as e:
-                print(f"⚠️  Warning: Error destroying virtual desktop: {e}")
+        with self._desktop_lock:
+            computer, self.computer = self.computer, None
+            if computer:
+                try:
+                    # Synchronous and without the cancel token: runs from cancel callbacks and must still retry
+                    computer.sync.destroy()
+                    print("✅ Virtual desktop destroyed successfully")
+                except Exception as e:
+                    print(f"⚠️  Warning: Error destroying virtual desktop: {e}")
+            if self.resources_freed_at is None:
+                self.resources_freed_at = time.perf_counter()
+    
+    def cancel_latency(self):
+        if self.cancel_token.cancelled_at is None or self.resources_freed_at is None:
+            return None
+        return round(max(0.0, self.resources_freed_at - self.cancel_token.cancelled_at), 3)
     
     def log_test_result(self, test_name, status, details=""):
         result = {
@@ -36,32 +84,35 @@ class SimpleWebsiteTester:
             "details": details,
             "timestamp": time.strftime("%H:%M:%S")
         }
+        if self.current_url:
+            result["url"] = self.current_url
         self.test_results.append(result)
         
         status_icon = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
         print(f"{status_icon} {test_name}: {status} {details}")
     
-    def test_browser_launch(self, url):
+    async def test_browser_launch(self, url):
         print(f"🌐 Testing browser launch and navigation to: {url}")
         
         try:
             print("🖥️  Opening Firefox...")
-            result = self.computer.exec("firefox --new-window")
+            result = await self.computer.exec("firefox --new-window")
             if result['success']:
                 print("✅ Firefox launched successfully")
+                self.start_resource_sampler()
             else:
                 print(f"⚠️  Firefox launch: {result['error']}")
             
-            time.sleep(3)
+            await self.cancel_token.sleep_async(3)
             
             print(f"🌐 Navigating to {url}...")
-            result = self.computer.exec(f"firefox {url}")
+            result = await self.computer.exec(f"firefox {url}")
             if result['success']:
                 print("✅ Navigation command executed")
             else:
                 print(f"⚠️  Navigation: {result['error']}")
             
-            time.sleep(5)
+            await self.cancel_token.sleep_async(5)
             
             self.log_test_result("Browser Launch", "PASS", "Firefox opened and navigation attempted")
             return True
@@ -70,39 +121,68 @@ class SimpleWebsiteTester:
             self.log_test_result("Browser Launch", "FAIL", f"Error: {str(e)}")
             return False
     
-    def test_screenshot_capture(self):
+    def start_resource_sampler(self):
+        """Sample Firefox and system resources on the desktop until stop_resource_sampler"""
+        if self.resource_sampler is None and SAMPLE_INTERVAL > 0 and self.computer:
+            self.resource_sampler = ResourceSampler(self.computer.sync).start_async()
+    
+    async def stop_resource_sampler(self):
+        sampler, self.resource_sampler = self.resource_sampler, None
+        if sampler:
+            self.resource_usage = await sampler.stop_async()
+    
+    async def test_screenshot_capture(self, url=None):
         print("📸 Testing screenshot capture...")
         
         try:
-            screenshot = self.computer.screenshot()
+            screenshot = await self.computer.screenshot()
             print(f"✅ Screenshot captured: {screenshot.size}")
             
             self.log_test_result("Screenshot Capture", "PASS", f"Size: {screenshot.size}")
-            return True
-            
+        
         except Exception as e:
             self.log_test_result("Screenshot Capture", "FAIL", f"Error: {str(e)}")
             return False
+        
+        url = url or self.current_url
+        if url:
+            await self.test_visual_regression(url, screenshot)
+        return True
     
-    def test_button_interaction(self):
-        print("🔘 Testing button interaction...")
+    async def test_visual_regression(self, url, screenshot):
+        print("🖼️  Comparing screenshot with baseline...")
         
         try:
-            print("🖱️  Testing mouse clicks at common positions...")
+            status, details, summary = await asyncio.to_thread(
+                check_screenshot, self.baseline_store, url, screenshot, self.update_baseline
+            )
+            self.visual_checks[url] = summary
+            self.log_test_result("Visual Regression", status, details)
+            return status == "PASS"
             
-            click_positions = [
-                (512, 384),   # Center
-                (100, 100),   # Top-left
-                (924, 100),   # Top-right
-                (512, 100),   # Top-center
-            ]
+        except Exception as e:
+            self.log_test_result("Visual Regression", "FAIL", f"Error: {str(e)}")
+            return False
+    
+    @requires(GUI)
+    async def test_button_interaction(self):
+        print("🔘 Testing button interaction...")
+        
+        try:
+            # Aim at regions of the current screen that look like controls
+            click_positions, source = await asyncio.to_thread(click_positions_from_screenshot, await self.computer.screenshot())
+            if source == "discovered":
+                print(f"🎯 Found {len(click_positions)} likely interactive regions on screen")
+            else:
+                print("🖱️  No targets detected, testing mouse clicks at common positions...")
             
             successful_clicks = 0
             
             for x, y in click_positions:
+                self.cancel_token.check()
                 try:
                     print(f"🖱️  Clicking at ({x}, {y})...")
-                    result = self.computer.left_click(x, y)
+                    result = await self.computer.left_click(x, y)
                     
                     if result:
                         print(f"✅ Click successful at ({x}, {y})")
@@ -110,7 +190,7 @@ class SimpleWebsiteTester:
                     else:
                         print(f"⚠️  Click may have failed at ({x}, {y})")
                     
-                    time.sleep(1)
+                    await self.cancel_token.sleep_async(1)
                     
                 except Exception as e:
                     print(f"❌ Click failed at ({x}, {y}): {str(e)}")
@@ -126,25 +206,26 @@ class SimpleWebsiteTester:
             self.log_test_result("Button Interaction", "FAIL", f"Error: {str(e)}")
             return False
     
-    def test_keyboard_input(self):
+    @requires(GUI)
+    async def test_keyboard_input(self):
         print("⌨️  Testing keyboard input...")
         
         try:
             print("⌨️  Testing text input...")
             
             test_text = "test@example.com"
-            self.computer.type(test_text)
-            time.sleep(1)
+            await self.computer.type(test_text)
+            await self.cancel_token.sleep_async(1)
             
             print("⌨️  Testing special keys...")
-            self.computer.key("Tab")
-            time.sleep(1)
+            await self.computer.key("Tab")
+            await self.cancel_token.sleep_async(1)
             
-            self.computer.type("password123")
-            time.sleep(1)
+            await self.computer.type("password123")
+            await self.cancel_token.sleep_async(1)
             
-            self.computer.key("Enter")
-            time.sleep(2)
+            await self.computer.key("Enter")
+            await self.cancel_token.sleep_async(2)
             
             self.log_test_result("Keyboard Input", "PASS", "Text input and special keys tested")
             return True
@@ -153,17 +234,18 @@ class SimpleWebsiteTester:
             self.log_test_result("Keyboard Input", "FAIL", f"Error: {str(e)}")
             return False
     
-    def test_scroll_functionality(self):
+    @requires(GUI)
+    async def test_scroll_functionality(self):
         print("📜 Testing scroll functionality...")
         
         try:
             print("📜 Testing scroll down...")
-            self.computer.scroll("down", 2)
-            time.sleep(1)
+            await self.computer.scroll("down", 2)
+            await self.cancel_token.sleep_async(1)
             
             print("📜 Testing scroll up...")
-            self.computer.scroll("up", 1)
-            time.sleep(1)
+            await self.computer.scroll("up", 1)
+            await self.cancel_token.sleep_async(1)
             
             self.log_test_result("Scroll Functionality", "PASS", "Scroll up/down tested")
             return True
@@ -172,7 +254,54 @@ class SimpleWebsiteTester:
             self.log_test_result("Scroll Functionality", "FAIL", f"Error: {str(e)}")
             return False
     
-    def test_system_commands(self):
+    @requires(GUI)
+    async def test_full_page_capture(self, scroll_amount=3, max_frames=40):
+        print("🧵 Capturing full page...")
+        
+        try:
+            stitcher = StreamingStitcher(top_crop=BROWSER_CHROME_HEIGHT)
+            started = time.perf_counter()
+            
+            # Start from the top so the capture covers the whole page
+            await self.computer.key("ctrl+Home")
+            await self.cancel_token.sleep_async(1)
+            
+            # Matching frames is CPU work; it runs off the loop so other runs keep going
+            status = await asyncio.to_thread(stitcher.add, await self.computer.screenshot())
+            while stitcher.frames < max_frames:
+                await self.computer.scroll("down", scroll_amount)
+                await self.cancel_token.sleep_async(0.5)
+                status = await asyncio.to_thread(stitcher.add, await self.computer.screenshot())
+                if status == IDENTICAL:
+                    break
+                if status == NO_OVERLAP:
+                    print("⚠️  Consecutive frames did not overlap, appended the frame as is")
+            
+            image = stitcher.result()
+            path = f"full_page_{self.run_id[:8]}.png"
+            await asyncio.to_thread(Image.fromarray(image).save, path)
+            
+            self.full_page_capture = {
+                "path": path,
+                "frames": stitcher.frames,
+                "height": stitcher.height,
+                "reached_end": status == IDENTICAL,
+                "duration_s": round(time.perf_counter() - started, 3)
+            }
+            print(f"✅ Stitched {stitcher.frames} frames into {image.shape[1]}x{image.shape[0]} image: {path}")
+            
+            details = f"{stitcher.frames} frames, {stitcher.height}px tall"
+            if status != IDENTICAL:
+                details += f" (stopped after {max_frames} frames)"
+            self.log_test_result("Full Page Capture", "PASS", details)
+            return True
+            
+        except Exception as e:
+            self.log_test_result("Full Page Capture", "FAIL", f"Error: {str(e)}")
+            return False
+    
+    @requires(SHELL)
+    async def test_system_commands(self):
         print("💻 Testing system commands...")
         
         try:
@@ -190,8 +319,9 @@ class SimpleWebsiteTester:
             successful_commands = 0
             
             for cmd in commands:
+                self.cancel_token.check()
                 try:
-                    result = self.computer.exec(cmd)
+                    result = await self.computer.exec_idempotent(cmd)
                     if result['success']:
                         print(f"✅ Command successful: {cmd}")
                         successful_commands += 1
@@ -211,23 +341,26 @@ class SimpleWebsiteTester:
             self.log_test_result("System Commands", "FAIL", f"Error: {str(e)}")
             return False
     
-    def run_website_test(self, url, test_name="Simple Website Test"):
+    async def run(self, url, test_name="Simple Website Test"):
         print(f"🚀 Starting simple website test: {test_name}")
         print(f"🌐 URL: {url}")
         print("=" * 60)
         
+        run_started = time.time()
+        status = "failed"
+        
         try:
-            self.start_virtual_desktop()
+            await self.timed_stage("desktop_start", self.start_virtual_desktop)
             
-            if not self.test_browser_launch(url):
+            if not await self.timed_stage("browser_launch", self.test_browser_launch, url):
                 return False
             
-            time.sleep(2)
+            await self.cancel_token.sleep_async(2)
             
-            if not self.test_screenshot_capture():
+            if not await self.timed_stage("screenshot", self.test_screenshot_capture, url):
                 return False
             
-            time.sleep(2)
+            await self.cancel_token.sleep_async(2)
             
             print("\n🔍 Running interactive tests...")
             print("-" * 40)
@@ -238,15 +371,20 @@ class SimpleWebsiteTester:
                 self.test_scroll_functionality,
                 self.test_system_commands
             ]
-            
-            passed_tests = 0
+            if self.full_page:
+                tests.append(self.test_full_page_capture)
+            
+            # GUI tests share the screen and run one after another; shell-only
+            # tests run alongside them
+            scheduler = ResourceScheduler(settle_delay=2, sleep=self.cancel_token.sleep_async)
+            outcomes = await scheduler.run(tests)
+            self.schedule_report = scheduler.last_report
+            self.stage_timings["interactive"] = self.schedule_report["wall_clock_s"]
+            await self.stop_resource_sampler()
+            
+            passed_tests = sum(1 for outcome in outcomes if outcome)
             total_tests = len(tests)
             
-            for test_func in tests:
-                if test_func():
-                    passed_tests += 1
-                time.sleep(2)
-            
             print("\n" + "=" * 60)
             print("📊 TEST SUMMARY")
             print("=" * 60)
@@ -255,45 +393,103 @@ class SimpleWebsiteTester:
                 status_icon = "✅" if result["status"] == "PASS" else "❌" if result["status"] == "FAIL" else "⚠️"
                 print(f"{status_icon} [{result['timestamp']}] {result['test']}: {result['status']} {result['details']}")
             
-            print(f"\n🎯 Overall Result: {passed_tests}/{total_tests} tests passed")
+            print(f"\n⏱️  Interactive tests took {self.schedule_report['wall_clock_s']:.1f}s "
+                  f"(sequential estimate {self.schedule_report['serial_estimate_s']:.1f}s, "
+                  f"saved {self.schedule_report['saved_s']:.1f}s)")
+            if self.resource_usage:
+                print(f"🖥️  Desktop resources: {format_summary(self.resource_usage['summary'])}")
+            print(f"🎯 Overall Result: {passed_tests}/{total_tests} tests passed")
             
             if passed_tests == total_tests:
                 print("🎉 All tests passed! Website functionality is working.")
+                status = "passed"
                 return True
             elif passed_tests > total_tests // 2:
                 print("⚠️  Most tests passed. Some features may need attention.")
+                status = "passed"
                 return True
             else:
                 print("❌ Multiple tests failed. Website has significant issues.")
                 return False
                 
+        except RunCancelled as e:
+            status = "cancelled"
+            print(f"🛑 Test cancelled: {e}")
+            return False
+        
         except Exception as e:
+            status = "error"
             print(f"❌ Fatal error during testing: {e}")
             return False
         
         finally:
-            self.destroy_virtual_desktop()
+            await self.stop_resource_sampler()
+            await asyncio.to_thread(self.destroy_virtual_desktop)
+            self.cancel_token.finish()
+            self.record_history(url, test_name, status, run_started)
+    
+    async def timed_stage(self, stage, func, *args):
+        self.cancel_token.check()
+        started = time.perf_counter()
+        try:
+            return await func(*args)
+        finally:
+            self.stage_timings[stage] = round(time.perf_counter() - started, 3)
+    
+    def record_history(self, url, test_name, status, started_at):
+        if not self.history_store:
+            return
+        try:
+            self.history_store.record_run(
+                url, status,
+                test_name=test_name,
+                tester=type(self).__name__,
+                run_id=self.run_id,
+                timestamp=started_at,
+                duration_s=time.time() - started_at,
+                test_results=self.test_results,
+                stage_timings=self.stage_timings,
+                report=self.get_test_report()
+            )
+        except Exception as e:
+            print(f"⚠️  Warning: Could not record run history: {e}")
     
     def get_test_report(self):
         return {
             "total_tests": len(self.test_results),
             "passed": len([r for r in self.test_results if r["status"] == "PASS"]),
             "failed": len([r for r in self.test_results if r["status"] == "FAIL"]),
-            "results": self.test_results
+            "results": self.test_results,
+            "schedule": self.schedule_report,
+            "full_page_capture": self.full_page_capture,
+            "visual_checks": self.visual_checks,
+            "resource_usage": self.resource_usage,
+            "resilience": get_resilience_metrics()
         }
 
+class SimpleWebsiteTester(AsyncSimpleWebsiteTester):
+    """Blocking entry point: each run gets its own event loop on the calling thread"""
+    
+    def run_website_test(self, url, test_name="Simple Website Test"):
+        return asyncio.run(self.run(url, test_name))
+
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: python3 simple_website_tester.py <url> [test_name]")
+    args = sys.argv[1:]
+    full_page = "--full-page" in args
+    update_baseline = "--update-baseline" in args
+    args = [arg for arg in args if arg not in ("--full-page", "--update-baseline")]
+    
+    if not args:
+        print("Usage: python3 simple_website_tester.py [--full-page] [--update-baseline] <url> [test_name]")
         print("Example: python3 simple_website_tester.py https://example.com 'My Test'")
         sys.exit(1)
     
-    url = sys.argv[1]
-    test_name = sys.argv[2] if len(sys.argv) > 2 else "Simple Website Test"
+    url = args[0]
+    test_name = args[1] if len(args) > 1 else "Simple Website Test"
     
-    tester = SimpleWebsiteTester()
+    tester = SimpleWebsiteTester(full_page=full_page, update_baseline=update_baseline)
     success = tester.run_website_test(url, test_name)
     
     if success:
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import re
+import socket
+import time
+import asyncio
+from urllib.parse import urlsplit
+import httpx
+
+# Numeric metrics kept per run for percentile tracking
+TRACKED_METRICS = (
+    "dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "download_ms", "redirect_ms", "total_ms",
+    "transfer_bytes", "decoded_bytes", "redirects",
+)
+CACHE_HEADERS = ("cache-control", "etag", "last-modified", "expires", "age", "vary", "x-cache", "cf-cache-status")
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class PhaseTrace:
+    """httpcore trace hook that leaves per-hop DNS, connect, TLS, TTFB and download `timings` on httpx responses.
+
+    httpcore resolves the host inside connect_tcp, so DNS is timed by a
+    lookup just before the request and taken off the first connect.
+    """
+
+    def __init__(self, dns_ms=0.0):
+        self.hops = []
+        self.dns_ms = dns_ms
+        self._marks = {}
+
+    async def __call__(self, name, info):
+        now = time.perf_counter()
+        # "connection.connect_tcp.started", "http11.receive_response_headers.complete", ...
+        event = name.split(".", 1)[1]
+        if event == "connect_tcp.started" or (event == "send_request_headers.started" and "start" not in self._marks):
+            self._marks["start"] = now
+        self._marks[event] = now
+        if event == "response_closed.started":
+            self.hops.append(self._hop_timings(self._marks))
+            self._marks = {}
+
+    def _hop_timings(self, marks):
+        def span(first, last):
+            return _ms(marks[last] - marks[first]) if first in marks and last in marks else 0.0
+
+        connected = "connect_tcp.complete" in marks
+        dns_ms = self.dns_ms if connected else 0.0
+        if connected:
+            self.dns_ms = 0.0
+        return {
+            "dns_ms": dns_ms,
+            "connect_ms": round(max(0.0, span("connect_tcp.started", "connect_tcp.complete") - dns_ms), 2),
+            "tls_ms": span("start_tls.started", "start_tls.complete"),
+            "ttfb_ms": span("send_request_headers.started", "receive_response_headers.complete"),
+            "connection_reused": not connected,
+            "download_ms": span("receive_response_headers.complete", "response_closed.started"),
+            "elapsed_ms": span("start", "response_closed.started"),
+        }
+
+
+async def timed_get(client, url, **kwargs):
+    """GET through an httpx.AsyncClient, leaving `timings` on the response and each redirect hop"""
+    parts = urlsplit(url)
+    started = time.perf_counter()
+    try:
+        await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except socket.gaierror:
+        # httpx raises its own ConnectError for the same lookup
+        pass
+    trace = PhaseTrace(dns_ms=_ms(time.perf_counter() - started))
+    response = await client.get(url, extensions={"trace": trace}, **kwargs)
+    for hop, timings in zip(list(response.history) + [response], trace.hops):
+        hop.timings = timings
+    return response
+
+
+def cache_policy(headers):
+    """Caching headers plus whether a shared cache may store the response, and for how long"""
+    cache = {name: headers[name] for name in CACHE_HEADERS if name in headers}
+    directives = headers.get("cache-control", "").lower()
+    max_age = re.search(r"(?:s-maxage|max-age)=(\d+)", directives)
+    cache["max_age_s"] = int(max_age.group(1)) if max_age else None
+    cache["cacheable"] = not re.search(r"no-store|private", directives) and bool(
+        (cache["max_age_s"] or 0) > 0 or "expires" in cache or "etag" in cache or "last-modified" in cache
+    )
+    return cache
+
+
+def performance_report(response):
+    """Performance section for a response fetched through timed_get.
+
+    Connection setup is summed over all hops, since a redirect usually opens
+    the connection the final request then reuses; TTFB and download time
+    are the final response's.
+    """
+    hops = list(response.history) + [response]
+    final = getattr(response, "timings", {})
+    setup = {phase: round(sum(getattr(hop, "timings", {}).get(phase, 0.0) for hop in hops), 2)
+             for phase in ("dns_ms", "connect_ms", "tls_ms")}
+    redirect_ms = sum(getattr(hop, "timings", {}).get("elapsed_ms", 0.0) for hop in response.history)
+    transfer_bytes, http_version = response.num_bytes_downloaded, response.http_version
+    decoded_bytes = len(response.content)
+    encoding = response.headers.get("content-encoding")
+    return {
+        "status": response.status_code,
+        "final_url": str(response.url),
+        "http_version": http_version,
+        "redirects": len(response.history),
+        "redirect_chain": [{"status": hop.status_code, "url": str(hop.url)} for hop in response.history],
+        **setup,
+        "ttfb_ms": final.get("ttfb_ms"),
+        "download_ms": final.get("download_ms"),
+        "redirect_ms": round(redirect_ms, 2),
+        "total_ms": round(sum(getattr(hop, "timings", {}).get("elapsed_ms", 0.0) for hop in hops), 2),
+        "connection_reused": final.get("connection_reused"),
+        "transfer_bytes": transfer_bytes,
+        "decoded_bytes": decoded_bytes,
+        "compression": encoding or None,
+        "compression_ratio": round(decoded_bytes / transfer_bytes, 2) if encoding and transfer_bytes else None,
+        "cache": cache_policy(response.headers),
+    }
+
+
+def tracked_metrics(performance):
+    """The numeric subset of a performance section that run history keeps per URL"""
+    return {name: performance[name] for name in TRACKED_METRICS if isinstance(performance.get(name), (int, float))}
+
+
+if __name__ == "__main__":
+    import sys
+    import json
+
+    url = sys.argv[1] if len(sys.argv) > 1 else "https://example.com"
+
+    async def fetch():
+        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
+            return await timed_get(client, url, headers={"Accept-Encoding": "gzip, deflate"})
+
+    response = asyncio.run(fetch())
+    print(f"⚡ Performance for {url}:")
+    print(json.dumps(performance_report(response), indent=2))
@@ -0,0 +1,19 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "webapp", "backend")]
+
+# History and link caches stay in memory so tests never touch the working tree
+os.environ.setdefault("RUN_HISTORY_DB", "")
+os.environ.setdefault("LINK_CACHE_DB", "")
+os.environ.setdefault("RESOURCE_SAMPLE_INTERVAL", "0")
+
+# Tests drive the testers through computer_factory and FaultInjectingComputer; the
+# Orgo SDK is only needed to create real desktops, so an SDK that fails to import
+# on this interpreter is replaced by an empty module rather than failing collection
+try:
+    import orgo  # noqa: F401
+except Exception:
+    sys.modules["orgo"] = types.SimpleNamespace(Computer=None)
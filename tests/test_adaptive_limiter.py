@@ -0,0 +1,85 @@
+import pytest
+
+import adaptive_limiter
+from adaptive_limiter import AIMDLimiter, LIMITER_DEFAULTS
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(adaptive_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def call(limiter, clock, latency, operation=None, overloaded=False):
+    """One sequential call: acquire, let `latency` pass on the clock, release"""
+    assert limiter.acquire(timeout=0)
+    clock[0] += latency
+    limiter.release(latency, overloaded, operation)
+
+
+# One healthy sequential desktop run: key presses, typing, clicks, screenshots and slow commands
+HEALTHY_RUN = [("orgo.exec", 1.8), ("orgo.exec", 2.5), ("orgo.screenshot", 1.2), ("orgo.left_click", 0.08),
+               ("orgo.key", 0.03), ("orgo.type", 0.2), ("orgo.key", 0.03), ("orgo.scroll", 0.05),
+               ("orgo.screenshot", 1.4), ("orgo.exec", 0.4), ("orgo.exec", 3.0)] * 5
+
+
+def test_healthy_mixed_orgo_run_keeps_its_limit(clock):
+    limiter = AIMDLimiter("orgo", **LIMITER_DEFAULTS["orgo"])
+    for operation, latency in HEALTHY_RUN:
+        call(limiter, clock, latency, operation)
+    assert limiter.current == 8
+    assert limiter.stats["decreases"] == 0 and limiter.stats["slow"] == 0
+
+
+def test_latency_is_judged_per_operation(clock):
+    limiter = AIMDLimiter("host", initial=8, latency_tolerance=1.5)
+    # Operations with steady but very different latencies, e.g. HEAD and GET on one host
+    for operation, latency in [("orgo.screenshot", 1.2), ("orgo.key", 0.03), ("orgo.scroll", 0.05)] * 10:
+        call(limiter, clock, latency, operation)
+    assert limiter.current == 8 and limiter.stats["slow"] == 0
+    assert limiter.snapshot()["min_latency_s"]["orgo.key"] == 0.03
+
+    # A key press as slow as a screenshot is congestion
+    call(limiter, clock, 1.2, "orgo.key")
+    assert limiter.current == 4 and limiter.stats["slow"] == 1
+
+
+def test_busy_healthy_calls_raise_the_limit(clock):
+    limiter = AIMDLimiter("orgo", initial=4, max_limit=6, latency_tolerance=None)
+    for _ in range(40):
+        held = [limiter.acquire(timeout=0) for _ in range(limiter.current)]
+        assert all(held)
+        for _ in held:
+            clock[0] += 0.1
+            limiter.release(0.1, operation="orgo.screenshot")
+    assert limiter.current == 6
+    assert limiter.stats["increases"] > 0
+
+    # Calls that leave most of the limit idle do not grow it further
+    increases = limiter.stats["increases"]
+    limiter.limit = 5.0
+    call(limiter, clock, 0.1, "orgo.screenshot")
+    assert limiter.stats["increases"] == increases
+
+
+def test_overload_halves_once_per_round_trip(clock):
+    limiter = AIMDLimiter("orgo", initial=8, latency_tolerance=None)
+    call(limiter, clock, 2.0, "orgo.exec", overloaded=True)
+    assert limiter.current == 4
+
+    # A burst of 429s from the same round trip is one congestion signal
+    clock[0] -= 1.5
+    call(limiter, clock, 2.0, "orgo.screenshot", overloaded=True)
+    assert limiter.current == 4
+    assert limiter.stats["overloads"] == 2 and limiter.stats["decreases"] == 1
+
+
+def test_limit_never_drops_below_the_floor(clock):
+    limiter = AIMDLimiter("orgo", initial=8, min_limit=2, latency_tolerance=None)
+    for _ in range(10):
+        clock[0] += 10
+        call(limiter, clock, 0.5, "orgo.key", overloaded=True)
+    assert limiter.current == 2
+    assert limiter.acquire(timeout=0) and limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from click_targets import (
+    BROWSER_CHROME_HEIGHT, DEFAULT_CLICK_POSITIONS, click_positions_from_screenshot, discover_targets,
+    make_synthetic_screenshot,
+)
+
+
+def blank_page():
+    frame = np.full((768, 1024, 3), 250, dtype=np.uint8)
+    frame[:BROWSER_CHROME_HEIGHT] = 225
+    return frame
+
+
+NARROW, WIDE = (104, 200, 168, 232), (504, 400, 600, 432)
+
+
+def two_button_page():
+    """A 64px and a 96px wide button of the same height and colour"""
+    frame = blank_page()
+    frame[200:232, 104:168] = 40
+    frame[400:432, 504:600] = 40
+    return frame
+
+
+def inside(target, box):
+    return box[0] <= target["x"] < box[2] and box[1] <= target["y"] < box[3]
+
+
+def test_finds_the_buttons_on_fixed_frames():
+    for seed in (0, 1, 2):
+        frame, boxes = make_synthetic_screenshot(seed)
+        targets = discover_targets(frame, max_targets=len(boxes))
+        assert targets
+        assert all(any(inside(t, b) for b in boxes) for t in targets[:2]), seed
+
+
+def test_expected_targets_on_a_plain_page():
+    targets = discover_targets(two_button_page())
+    assert len(targets) == 2
+    assert inside(targets[0], NARROW) and inside(targets[1], WIDE)
+
+
+def test_browser_chrome_is_never_a_target():
+    frame = blank_page()
+    frame[30:60, 100:300] = 40
+    assert discover_targets(frame) == []
+
+
+def test_button_texts_rank_the_matching_width_first():
+    # "Subscribe" renders about 96px wide, the size of the second button
+    targets = discover_targets(two_button_page(), button_texts=["Subscribe", "Subscribe"])
+    assert inside(targets[0], WIDE) and inside(targets[1], NARROW)
+
+
+def test_button_texts_bound_the_number_of_targets():
+    assert len(discover_targets(two_button_page(), button_texts=["Go"])) == 1
+    # Blank labels do not count as buttons
+    assert len(discover_targets(two_button_page(), button_texts=["Go", "  "])) == 1
+    assert len(discover_targets(two_button_page(), button_texts=[])) == 2
+
+
+def test_falls_back_to_the_default_grid():
+    assert click_positions_from_screenshot(blank_page()) == (list(DEFAULT_CLICK_POSITIONS), "default")
+    assert click_positions_from_screenshot(None) == (list(DEFAULT_CLICK_POSITIONS), "default")
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from dashboard import Dashboard
+
+
+def summary(session_id, status="running"):
+    return {"session_id": session_id, "status": status}
+
+
+def two_instances():
+    """Two API processes behind one load balancer, each with its own versions"""
+    first, second = Dashboard(), Dashboard()
+    for dashboard in (first, second):
+        dashboard.update("a", summary("a"))
+        dashboard.update("b", summary("b"))
+    return first, second
+
+
+def test_etags_differ_between_instances_at_the_same_version():
+    first, second = two_instances()
+    assert first.version == second.version
+    assert first.etag != second.etag
+
+
+def test_since_from_the_same_instance_is_a_delta():
+    first, _ = two_instances()
+    first.update("b", summary("b", "completed"))
+
+    body = json.loads(first.delta_payload(2, first.instance))
+    assert body["since"] == 2
+    assert [s["session_id"] for s in body["sessions"]] == ["b"]
+
+
+def test_since_from_another_instance_is_a_full_snapshot():
+    first, second = two_instances()
+    second.update("b", summary("b", "completed"))
+
+    for instance in (first.instance, None):
+        body = json.loads(second.delta_payload(2, instance))
+        assert "since" not in body
+        assert body["instance"] == second.instance
+        assert sorted(s["session_id"] for s in body["sessions"]) == ["a", "b"]
+
+
+def test_endpoint_answers_a_foreign_version_in_full(monkeypatch):
+    import main
+
+    first, second = two_instances()
+    monkeypatch.setattr(main, "dashboard", second)
+
+    response = asyncio.run(main.get_dashboard(since=1, instance=first.instance, if_none_match=first.etag))
+    assert response.status_code == 200
+    assert response.headers["ETag"] == second.etag
+    assert len(json.loads(response.body)["sessions"]) == 2
+
+    response = asyncio.run(main.get_dashboard(since=None, instance=None, if_none_match=second.etag))
+    assert response.status_code == 304
+
+
+def test_removed_sessions_are_tombstones_in_deltas_and_streams():
+    dashboard = Dashboard()
+    dashboard.update("a", summary("a"))
+    dashboard.update("b", summary("b"))
+    subscriber = dashboard.subscribe()
+    dashboard.remove("a")
+    dashboard.remove("missing")
+
+    assert dashboard.version == 3
+    body = json.loads(dashboard.delta_payload(2, dashboard.instance))
+    assert body["sessions"] == [{"session_id": "a", "removed": True, "version": 3}]
+    # A snapshot simply leaves the removed session out
+    assert [s["session_id"] for s in json.loads(dashboard.payload()[0])["sessions"]] == ["b"]
+
+    async def next_batch():
+        return await dashboard.changes(subscriber).__anext__()
+
+    assert asyncio.run(next_batch()) == [{"session_id": "a", "removed": True, "version": 3}]
+
+    # Coming back replaces the tombstone
+    dashboard.update("a", summary("a", "completed"))
+    assert [s.get("removed") for s in dashboard.sessions_since(2)] == [None]
+
+
+def test_a_client_behind_pruned_tombstones_gets_a_snapshot(monkeypatch):
+    import dashboard as dashboard_module
+
+    monkeypatch.setattr(dashboard_module, "MAX_TOMBSTONES", 2)
+    dashboard = Dashboard()
+    for session_id in "abc":
+        dashboard.update(session_id, summary(session_id))
+    for session_id in "abc":
+        dashboard.remove(session_id)
+
+    assert "since" not in json.loads(dashboard.delta_payload(3, dashboard.instance))
+    body = json.loads(dashboard.delta_payload(4, dashboard.instance))
+    assert [s["session_id"] for s in body["sessions"]] == ["b", "c"]
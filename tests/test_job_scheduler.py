@@ -0,0 +1,50 @@
+import asyncio
+import gc
+
+from job_scheduler import JobScheduler
+
+
+def test_running_jobs_are_referenced_until_done():
+    finished = []
+
+    async def job(name):
+        await asyncio.sleep(0.01)
+        gc.collect()
+        finished.append(name)
+
+    async def run():
+        scheduler = JobScheduler(max_concurrency=2)
+        for name in "abc":
+            scheduler.submit(name, "client", "normal", lambda name=name: job(name))
+        assert len(scheduler._tasks) == 2
+        while len(finished) < 3:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+        assert not scheduler._tasks
+
+    asyncio.run(run())
+    assert finished == ["a", "b", "c"]
+
+
+def test_shutdown_cancels_running_jobs_and_drops_queued_ones():
+    cancelled = []
+
+    async def job(name):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+
+    async def run():
+        scheduler = JobScheduler(max_concurrency=1)
+        for name in "ab":
+            scheduler.submit(name, "client", "normal", lambda name=name: job(name))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(scheduler.shutdown(), timeout=1)
+        # The queued job never starts once the running one is cancelled
+        assert scheduler.metrics()["running"] == 0 and scheduler.metrics()["queue_depth"] == 0
+        assert not scheduler._tasks
+
+    asyncio.run(run())
+    assert cancelled == ["a"]
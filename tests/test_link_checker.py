@@ -0,0 +1,118 @@
+import asyncio
+import threading
+
+import link_checker
+from link_checker import AsyncLinkChecker, LinkCache, is_transient, start_fixture_server
+
+
+def result(url, status=None, error=None):
+    return {"url": url, "ok": status is not None and status < 400, "status": status, "final_url": url,
+            "redirects": [], "method": "HEAD", "error": error}
+
+
+def test_transient_failures_are_not_definitive():
+    assert is_transient(result("a", error="ConnectTimeout: timed out"))
+    assert is_transient(result("a", 503)) and is_transient(result("a", 429))
+    assert not is_transient(result("a", 404)) and not is_transient(result("a", 200))
+
+
+def test_transient_results_expire_after_the_error_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(link_checker.time, "time", lambda: now[0])
+    urls = ["http://x/ok", "http://x/gone", "http://x/down", "http://x/reset"]
+    writer = LinkCache(path=str(tmp_path / "links.db"), ttl=3600, error_ttl=60)
+    writer.put_many([result(urls[0], 200), result(urls[1], 404), result(urls[2], 502), result(urls[3], error="ConnectionResetError")])
+
+    now[0] += 30
+    assert set(writer.get_many(urls)) == set(urls)
+
+    now[0] += 60
+    # Same answer from memory and from SQLite in another process
+    for cache in (writer, LinkCache(path=str(tmp_path / "links.db"), ttl=3600, error_ttl=60)):
+        assert set(cache.get_many(urls)) == {urls[0], urls[1]}
+
+
+def test_zero_error_ttl_never_stores_transient_results():
+    cache = LinkCache(path=None, error_ttl=0)
+    cache.put_many([result("http://x/ok", 200), result("http://x/down", 500)])
+    assert list(cache.get_many(["http://x/ok", "http://x/down"])) == ["http://x/ok"]
+
+
+def test_async_checker_does_cache_io_off_the_event_loop():
+    server, hrefs = start_fixture_server(links=8)
+    urls = [f"http://127.0.0.1:{server.server_port}{h}" for h in hrefs]
+    cache = LinkCache(path=None)
+    threads = []
+
+    for name in ("get_many", "put_many"):
+        method = getattr(cache, name)
+
+        def recording(arg, method=method):
+            threads.append(threading.current_thread())
+            return method(arg)
+
+        setattr(cache, name, recording)
+
+    async def main():
+        checker = AsyncLinkChecker(cache=cache)
+        first = await checker.check(urls)
+        second = await checker.check(urls)
+        return first, second, threading.current_thread()
+
+    try:
+        first, second, loop_thread = asyncio.run(main())
+    finally:
+        server.shutdown()
+
+    assert len(threads) == 3 and loop_thread not in threads
+    assert [r["ok"] for r in first] == [True] * 5 + [False, True, True]
+    assert all(r["cached"] for r in second)
+
+
+def test_shared_cache_is_created_once(monkeypatch):
+    monkeypatch.setattr(link_checker, "_shared_cache", None)
+    created = []
+
+    class SlowCache:
+        def __init__(self):
+            created.append(self)
+            threading.Event().wait(0.05)
+
+    monkeypatch.setattr(link_checker, "LinkCache", SlowCache)
+    caches = []
+    workers = [threading.Thread(target=lambda: caches.append(link_checker.get_link_cache())) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(created) == 1 and all(cache is created[0] for cache in caches)
+
+
+def test_checks_in_one_block_share_a_client(monkeypatch):
+    server, hrefs = start_fixture_server(links=8)
+    urls = [f"http://127.0.0.1:{server.server_port}{h}" for h in hrefs]
+    clients = []
+
+    class CountingClient(link_checker.httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            clients.append(self)
+
+    monkeypatch.setattr(link_checker.httpx, "AsyncClient", CountingClient)
+
+    async def main():
+        async with AsyncLinkChecker() as checker:
+            first = await checker.check(urls[:4])
+            second = await checker.check(urls[4:])
+        # Without the block each check opens and closes its own client
+        await AsyncLinkChecker().check(urls[:1])
+        return first + second
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        server.shutdown()
+
+    assert [r["ok"] for r in results] == [True] * 5 + [False, True, True]
+    assert len(clients) == 2 and all(client.is_closed for client in clients)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from page_stitcher import APPENDED, IDENTICAL, NO_OVERLAP, StreamingStitcher, make_synthetic_page, simulate_scroll
+
+
+def stitch(frames, **options):
+    stitcher = StreamingStitcher(**options)
+    statuses = [stitcher.add(frame) for frame in frames]
+    return stitcher, statuses
+
+
+def scrolled(page, viewport=768, step=300):
+    """Every capture until the browser hits the bottom of the page"""
+    frames = []
+    for frame in simulate_scroll(page, viewport, step):
+        if frames and np.array_equal(frame, frames[-1]):
+            break
+        frames.append(frame)
+    return frames
+
+
+def unique_rows(height, width=64, seed=1):
+    return np.random.default_rng(seed).integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+
+
+def test_exact_overlap_rebuilds_the_page():
+    page = make_synthetic_page(height=3000, width=256)
+    stitcher, statuses = stitch(scrolled(page))
+
+    assert set(statuses) == {APPENDED}
+    assert np.array_equal(stitcher.result(), page)
+    # The last step is cut short by the bottom of the page
+    assert stitcher.offsets == [300] * 7 + [132]
+    assert stitcher.height == 3000
+
+
+def test_same_frame_again_is_identical_and_adds_nothing():
+    page = make_synthetic_page(height=1200, width=256)
+    stitcher, statuses = stitch([page[:768], page[:768]])
+    assert statuses == [APPENDED, IDENTICAL]
+    assert stitcher.height == 768 and stitcher.frames == 2
+
+
+def test_unrelated_frames_are_appended_whole():
+    first, second = unique_rows(400, seed=1), unique_rows(400, seed=2)
+    stitcher, statuses = stitch([first, second])
+
+    assert statuses == [APPENDED, NO_OVERLAP]
+    assert stitcher.offsets == []
+    assert np.array_equal(stitcher.result(), np.concatenate([first, second]))
+
+
+def test_overlap_below_the_minimum_is_no_overlap():
+    page = unique_rows(800)
+    _, statuses = stitch([page[:400], page[380:780]], min_overlap=32)
+    assert statuses == [APPENDED, NO_OVERLAP]
+
+
+def test_repeated_rows_follow_the_previous_scroll_step():
+    # A unique header, a grid of identical 140-row cards, and a unique footer
+    card = unique_rows(140, seed=3)
+    page = np.concatenate([unique_rows(1200, seed=4), np.tile(card, (12, 1, 1)), unique_rows(400, seed=5)])
+
+    stitcher, _ = stitch(scrolled(page))
+
+    # Inside the grid 160, 300 and 440 rows all match; the step taken before breaks the tie
+    assert set(stitcher.offsets[:-1]) == {300}
+    assert np.array_equal(stitcher.result(), page)
+
+
+def test_short_last_frame_adds_only_its_new_rows():
+    page = unique_rows(1100)
+    stitcher, statuses = stitch([page[:768], page[300:1068], page[800:1100]])
+
+    assert statuses == [APPENDED] * 3
+    assert stitcher.offsets == [300, 500]
+    assert np.array_equal(stitcher.result(), page)
+
+
+def test_browser_chrome_is_cropped_from_every_frame():
+    page = make_synthetic_page(height=2000, width=256)
+    chrome = np.zeros((90, 256, 3), dtype=np.uint8)
+    frames = [np.concatenate([chrome, frame]) for frame in scrolled(page, viewport=678)]
+
+    stitcher, _ = stitch(frames, top_crop=90)
+    assert np.array_equal(stitcher.result(), page)
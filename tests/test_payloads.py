@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from payloads import PayloadCache, canonical_fields, parse_fields
+
+
+def build(n):
+    return lambda: {"n": n}
+
+
+def test_unknown_fields_share_one_cache_key():
+    known, nested = ("status", "results"), {"test_results": []}
+    assert canonical_fields(parse_fields("test_results, status,nope"), known, nested) == ("status", "test_results")
+    assert canonical_fields(parse_fields("status,bogus1"), known) == canonical_fields(parse_fields("bogus2,status"), known)
+    assert canonical_fields(None, known) is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PayloadCache(max_entries=2)
+    cache.get_or_build(("a", "status", None), build(1))
+    cache.get_or_build(("b", "status", None), build(2))
+    cache.get_or_build(("a", "status", None), build(1))
+    cache.get_or_build(("c", "status", None), build(3))
+
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    assert cache.get_or_build(("a", "status", None), build(0)) == b'{"n":1}'
+    assert cache.get_or_build(("b", "status", None), build(0)) == b'{"n":0}'
+
+
+def test_discard_drops_every_entry_of_a_session():
+    cache = PayloadCache()
+    cache.get_or_build(("a", "status", None), build(1))
+    cache.get_or_build(("a", "parsed-report", ("report",)), build(2))
+    cache.get_or_build(("b", "status", None), build(3))
+
+    cache.discard("a")
+    assert cache.stats()["entries"] == 1
+    cache.discard("a")
+
+
+def test_expired_sessions_leave_the_cache_and_dashboard(monkeypatch):
+    import main
+
+    session = {"status": "passed", "url": "https://a.example", "test_name": "t", "completed": True,
+               "completed_at": 1000.0, "output": [], "results": {"test_results": []}}
+    monkeypatch.setitem(main.active_sessions, "old", session)
+    monkeypatch.setattr(main, "payload_cache", PayloadCache())
+    main.sync_dashboard("old")
+
+    asyncio.run(main.get_test_status("old", fields="status,typo"))
+    asyncio.run(main.get_test_status("old", fields="status,other-typo"))
+    assert main.payload_cache.stats()["entries"] == 1
+
+    assert main.expire_sessions(now=1000.0 + main.SESSION_TTL - 1) == []
+    assert main.expire_sessions(now=1000.0 + main.SESSION_TTL) == ["old"]
+    assert "old" not in main.active_sessions
+    assert main.payload_cache.stats()["entries"] == 0
+    assert all(s["session_id"] != "old" for s in json.loads(main.dashboard.payload()[0])["sessions"])
+    # Clients holding a delta are told to drop it
+    assert [s for s in main.dashboard.sessions_since(0) if s["session_id"] == "old"][0]["removed"] is True
+
+
+async def asgi_get(app, path, headers, enough):
+    """Drive one GET through the ASGI app until enough(messages) or the response ends"""
+    messages, done = [], asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if enough(messages) or (message["type"] == "http.response.body" and not message.get("more_body")):
+            done.set()
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+             "client": ("127.0.0.1", 1), "server": ("testserver", 80)}
+    task = asyncio.create_task(app(scope, receive, send))
+    await asyncio.wait_for(done.wait(), timeout=5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return messages
+
+
+def body_of(messages):
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+
+def test_event_stream_is_not_held_back_by_compression(monkeypatch):
+    import main
+    from dashboard import Dashboard
+
+    dashboard = Dashboard()
+    for n in range(50):
+        dashboard.update(f"s{n}", {"session_id": f"s{n}", "status": "running", "url": "https://example.com/"})
+    monkeypatch.setattr(main, "dashboard", dashboard)
+
+    def has_snapshot(messages):
+        return b"event: snapshot" in body_of(messages)
+
+    messages = asyncio.run(asgi_get(main.app, "/dashboard/stream", {"accept-encoding": "gzip, br"}, has_snapshot))
+    start = messages[0]
+    assert dict(start["headers"]).get(b"content-encoding") is None
+    data = body_of(messages).decode().split("data: ", 1)[1].split("\n\n", 1)[0]
+    assert len(json.loads(data)["sessions"]) == 50
+
+    # JSON routes are still compressed
+    messages = asyncio.run(asgi_get(main.app, "/dashboard", {"accept-encoding": "gzip"}, lambda m: False))
+    assert dict(messages[0]["headers"])[b"content-encoding"] in (b"gzip", b"br")
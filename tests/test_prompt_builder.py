@@ -0,0 +1,92 @@
+from bs4 import BeautifulSoup
+
+from prompt_builder import PromptBuilder, dedupe_blocks, estimate_tokens
+
+
+def page_content(sections, paragraphs_per_section):
+    """Content dict scraped from a fixture page with nested wrappers, as the testers extract it"""
+    body = "".join(
+        f"<div class='section'><h2>Section {s}</h2><div class='wrap'>"
+        + "".join(f"<p>Section {s} paragraph {p}: " + "the product ships with a detailed manual and support. " * 3 + "</p>"
+                  for p in range(paragraphs_per_section))
+        + f"<button>Buy item {s}</button></div></div>"
+        for s in range(sections)
+    )
+    soup = BeautifulSoup(f"<html><head><title>Fixture</title></head><body>{body}</body></html>", "html.parser")
+    return {
+        "url": "https://fixture.example.com",
+        "title": soup.title.string,
+        "meta_description": "Fixture page",
+        "forms": 0,
+        "headings": [h.get_text().strip() for h in soup.find_all(["h1", "h2", "h3"])],
+        "paragraphs": [e.get_text().strip() for e in soup.find_all(["p", "div", "span"]) if len(e.get_text().strip()) > 20],
+        "buttons": [b.get_text().strip() for b in soup.find_all("button")],
+    }
+
+
+def test_small_page_fits_budget_and_keeps_everything():
+    content = page_content(sections=2, paragraphs_per_section=2)
+    prompt, stats = PromptBuilder(token_budget=1500).build(content)
+
+    assert estimate_tokens(prompt) <= 1500
+    assert stats["prompt_tokens"] == estimate_tokens(prompt)
+    assert stats["selected_blocks"]["headings"] == 2
+    assert "Section 1 paragraph 1" in prompt
+
+
+def test_very_large_page_is_bounded_by_budget():
+    content = page_content(sections=200, paragraphs_per_section=20)
+    for budget in (500, 1500, 4000):
+        prompt, stats = PromptBuilder(token_budget=budget).build(content)
+        assert estimate_tokens(prompt) <= budget
+        assert stats["selected_blocks"]["paragraphs"] < stats["candidate_blocks"]["paragraphs"]
+
+
+def test_no_content_prompt_is_small():
+    prompt, _ = PromptBuilder(token_budget=1500).build({"title": "Empty", "url": "https://x.example.com"})
+    assert "No readable content" in prompt
+    assert estimate_tokens(prompt) <= 1500
+
+
+def test_dedupe_drops_repeats_and_nested_containers():
+    child_a = "First paragraph about shipping times."
+    child_b = "Second paragraph about returns policy."
+    wrapper = f"{child_a} {child_b}"
+    blocks = [wrapper, child_a, child_b, child_a, "  ", "Standalone note that nobody repeats."]
+
+    assert dedupe_blocks(blocks) == [child_a, child_b, "Standalone note that nobody repeats."]
+
+
+def test_dedupe_keeps_single_container_over_its_child():
+    inner = "Limited offer on all items"
+    outer = "Limited offer on all items this week only, while stocks last."
+    assert dedupe_blocks([outer, inner]) == [outer]
+
+
+def test_headings_keep_document_order():
+    headings = ["Zebra care", "Apple orchards", "Mountain trails", "Beach guide"]
+    content = {"title": "T", "url": "https://x.example.com", "headings": headings,
+               "paragraphs": ["Some body text that is long enough to count."], "buttons": []}
+    prompt, _ = PromptBuilder(token_budget=1500).build(content)
+
+    positions = [prompt.index(f"- {heading}") for heading in headings]
+    assert positions == sorted(positions)
+
+
+def test_header_fields_are_truncated_and_counted():
+    long_title = "Best deals " * 300
+    content = page_content(sections=50, paragraphs_per_section=5)
+    content.update(title=long_title, meta_description="cheap shoes " * 500,
+                   url="https://x.example.com/?" + "q=1&" * 400)
+
+    for budget in (500, 1500):
+        prompt, stats = PromptBuilder(token_budget=budget).build(content)
+        assert stats["prompt_tokens"] <= budget
+        title_line = next(line for line in prompt.splitlines() if line.startswith("Website Title: "))
+        assert title_line.endswith("…") and estimate_tokens(title_line) <= 45
+        url_line = next(line for line in prompt.splitlines() if line.startswith("URL: "))
+        assert url_line.startswith("URL: https://x.example.com/?q=1&") and url_line.endswith("…")
+
+    # Without content the header is the whole prompt, and still bounded
+    prompt, _ = PromptBuilder().build({"title": long_title, "url": "https://x.example.com"})
+    assert "No readable content" in prompt and estimate_tokens(prompt) < 300
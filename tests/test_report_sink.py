@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import report_sink
+import utils
+from report_sink import ReportSink, iter_reports, report_segments
+
+
+def test_saved_report_is_on_disk_when_announced(tmp_path, monkeypatch, capsys):
+    sink = ReportSink(path=str(tmp_path / "reports.jsonl"), buffer_size=32)
+    monkeypatch.setattr(utils, "get_report_sink", lambda: sink)
+
+    utils.save_test_report({"test_name": "t", "success": True})
+
+    assert "appended" in capsys.readouterr().out
+    assert [r["test_name"] for r in iter_reports(sink.path)] == ["t"]
+
+
+def test_failed_write_keeps_the_buffer(tmp_path, monkeypatch):
+    sink = ReportSink(path=str(tmp_path / "reports.jsonl"), buffer_size=2, fsync="never")
+    sink.append({"n": 1})
+    real_write = os.write
+
+    def full_disk(fd, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(report_sink.os, "write", full_disk)
+    with pytest.raises(OSError):
+        sink.append({"n": 2})
+    monkeypatch.setattr(report_sink.os, "write", real_write)
+
+    sink.flush()
+    assert [r["n"] for r in iter_reports(sink.path)] == [1, 2]
+    assert sink.written == 2
+
+
+def test_rotated_segment_is_compressed_outside_the_lock(tmp_path, monkeypatch):
+    sink = ReportSink(path=str(tmp_path / "reports.jsonl"), buffer_size=1, max_bytes=200, compression="gzip", fsync="never")
+    compress = report_sink.compress_segment
+    held = []
+
+    def checking_compress(path, compression):
+        held.append(sink._lock.locked())
+        return compress(path, compression)
+
+    monkeypatch.setattr(report_sink, "compress_segment", checking_compress)
+    for n in range(10):
+        sink.append({"n": n, "padding": "x" * 40})
+
+    assert held and not any(held)
+    assert sink.rotations == len(held)
+    assert all(p.endswith(".gz") for p in report_segments(sink.path)[:-1])
+    assert [r["n"] for r in iter_reports(sink.path)] == list(range(10))
@@ -0,0 +1,236 @@
+import time
+import asyncio
+
+import pytest
+
+import resilience
+from adaptive_limiter import AIMDLimiter
+from fakes import FaultInjectingComputer
+from resilience import (
+    AsyncComputer, CircuitBreaker, CircuitOpenError, DeadlineExceeded, NO_RETRY, ResilientComputer, RetryPolicy,
+    call_with_deadline, metrics, resilient_call, resilient_call_async,
+)
+from run_control import CancelToken, RunCancelled
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    resilience._breakers.clear()
+    metrics.reset()
+    yield
+    resilience._breakers.clear()
+    metrics.reset()
+
+
+def limiter():
+    return AIMDLimiter("test", initial=16, max_limit=16)
+
+
+def test_idempotent_calls_are_retried_until_they_succeed():
+    fake = FaultInjectingComputer(fail_ops={"screenshot": 2})
+    computer = ResilientComputer(fake, policies={"screenshot": (5, FAST_RETRY)}, limiter=limiter())
+
+    assert computer.screenshot().size == (1024, 768)
+    stats = metrics.snapshot()["orgo.screenshot"]
+    assert (stats["calls"], stats["failures"], stats["retries"], stats["successes"]) == (3, 2, 2, 1)
+    assert [op for op, _ in fake.calls] == ["screenshot"] * 3
+
+
+def test_input_events_are_not_retried():
+    fake = FaultInjectingComputer(fail_ops={"left_click": 1})
+    computer = ResilientComputer(fake, limiter=limiter())
+
+    with pytest.raises(ConnectionError):
+        computer.left_click(10, 10)
+    assert len(fake.calls) == 1
+    assert metrics.snapshot()["orgo.left_click"]["retries"] == 0
+
+
+def test_hung_call_fails_at_its_deadline():
+    fake = FaultInjectingComputer(hang_ops={"status"})
+    computer = ResilientComputer(fake, policies={"status": (0.2, NO_RETRY)}, limiter=limiter())
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        computer.status()
+    assert time.monotonic() - started < 2
+    assert metrics.snapshot()["orgo.status"]["deadline_exceeded"] == 1
+
+
+def test_deadline_calls_share_a_bounded_pool():
+    before = len(resilience._deadline_pool._threads)
+    for _ in range(50):
+        assert call_with_deadline(lambda: 42, 5) == 42
+    assert len(resilience._deadline_pool._threads) <= max(before, 1) + 1
+    assert len(resilience._deadline_pool._threads) <= resilience.DEADLINE_THREADS
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow() and breaker.state == "half_open"
+    # Only the one probe gets through
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+
+def test_open_breaker_rejects_calls_and_counts_them():
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=60)
+
+    def failing():
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            resilient_call("op", failing, breaker=breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        resilient_call("op", failing, breaker=breaker)
+    stats = metrics.snapshot()["op"]
+    assert (stats["failures"], stats["circuit_rejections"]) == (2, 1)
+
+
+def test_non_transient_error_does_not_count_against_the_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1)
+
+    def bad_input():
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        resilient_call("op", bad_input, breaker=breaker, retry_on=(ConnectionError,))
+    assert breaker.state == "closed"
+
+
+def open_then_wait(breaker):
+    breaker.record_failure()
+    time.sleep(breaker.reset_timeout + 0.02)
+
+
+def test_cancelled_probe_releases_a_half_open_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05)
+    open_then_wait(breaker)
+
+    def cancelled():
+        raise RunCancelled("cancelled")
+
+    with pytest.raises(RunCancelled):
+        resilient_call("op", cancelled, breaker=breaker)
+    assert breaker.state == "open"
+    # The next caller probes at once instead of being rejected forever
+    assert resilient_call("op", lambda: "ok", breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_under_a_deadline_releases_the_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05)
+    open_then_wait(breaker)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        resilient_call("op", interrupted, deadline=5, breaker=breaker)
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_cancelled_async_probe_releases_the_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05)
+    open_then_wait(breaker)
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def main():
+        task = asyncio.create_task(resilient_call_async("op", slow, breaker=breaker))
+        await asyncio.sleep(0.05)
+        assert breaker.state == "half_open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_async_run_cancelled_probe_releases_the_breaker():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.05)
+    open_then_wait(breaker)
+
+    async def cancelled():
+        raise RunCancelled("cancelled")
+
+    with pytest.raises(RunCancelled):
+        asyncio.run(resilient_call_async("op", cancelled, breaker=breaker))
+    assert breaker.state == "open"
+
+
+def test_backoff_ends_when_the_run_is_cancelled():
+    token = CancelToken(deadline_seconds=None)
+    slow_retry = RetryPolicy(max_attempts=3, base_delay=30, max_delay=30)
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        token.cancel("stop")
+        raise ConnectionError("down")
+
+    started = time.monotonic()
+    with pytest.raises(RunCancelled):
+        resilient_call("op", failing, retry=slow_retry, cancel_token=token)
+    assert time.monotonic() - started < 1
+    assert len(attempts) == 1
+
+
+def test_async_computer_retries_with_the_same_policies():
+    fake = FaultInjectingComputer(fail_ops={"screenshot": 1})
+    computer = AsyncComputer(fake, policies={"screenshot": (5, FAST_RETRY)}, limiter=limiter())
+
+    shot = asyncio.run(computer.screenshot())
+    assert shot.size == (1024, 768)
+    assert metrics.snapshot()["orgo.screenshot"]["retries"] == 1
+
+
+def test_metrics_are_reported_with_breaker_states():
+    computer = ResilientComputer(FaultInjectingComputer(), limiter=limiter())
+    computer.key("a")
+
+    report = resilience.get_resilience_metrics()
+    assert report["operations"]["orgo.key"]["successes"] == 1
+    assert report["breakers"]["orgo:key"] == "closed"
+
+
+def test_async_get_retries_throttled_statuses_and_returns_the_last_response():
+    from types import SimpleNamespace
+
+    statuses = [503, 429, 200]
+
+    async def fetch(url):
+        return SimpleNamespace(status_code=statuses.pop(0))
+
+    response = asyncio.run(resilience.resilient_get_async("https://a.example/", fetch, retry=FAST_RETRY))
+    assert response.status_code == 200 and not statuses
+
+    async def always_busy(url):
+        return SimpleNamespace(status_code=503)
+
+    response = asyncio.run(resilience.resilient_get_async("https://b.example/", always_busy, retry=FAST_RETRY))
+    assert response.status_code == 503
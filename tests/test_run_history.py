@@ -0,0 +1,45 @@
+from run_history import RunHistoryStore
+
+
+def test_replayed_run_id_is_not_counted_twice():
+    store = RunHistoryStore(":memory:", batch_size=10)
+    for _ in range(3):
+        store.record_run("https://a.example.com", "passed", run_id="run-1", duration_s=2.0,
+                         stage_timings={"scrape": 1.0}, fingerprint="abc")
+        store.flush()
+    store.record_run("https://a.example.com", "failed", run_id="run-2", duration_s=4.0)
+    store.flush()
+
+    trend = store.pass_rate_trend("https://a.example.com")
+    assert [(day["runs"], day["passed_runs"], day["mean_duration_s"]) for day in trend] == [(2, 1, 3.0)]
+    assert store.history()["total"] == 2
+    assert store.stage_percentiles()["scrape"]["samples"] == 1
+    runs = store.recent_runs(["https://a.example.com"])["https://a.example.com"]
+    assert len(runs) == 2
+
+
+def test_duplicates_within_one_batch_are_counted_once():
+    store = RunHistoryStore(":memory:", batch_size=10)
+    store.record_run("https://a.example.com", "passed", run_id="same", duration_s=1.0)
+    store.record_run("https://a.example.com", "passed", run_id="same", duration_s=1.0)
+    store.flush()
+
+    assert store.pass_rate_trend("https://a.example.com")[0]["runs"] == 1
+
+
+def test_pending_runs_are_visible_to_reads():
+    store = RunHistoryStore(":memory:")
+    assert store.batch_size > 1
+    store.record_run("https://a.example.com", "passed", duration_s=2.0, stage_timings={"scrape": 1.0},
+                     site_metrics={"ttfb_ms": 120.0})
+    assert store._pending
+
+    # No explicit flush: every query reads through the batch still waiting to be written
+    assert store.history()["total"] == 1
+    store.record_run("https://a.example.com", "failed", duration_s=4.0)
+    assert store.pass_rate_trend("https://a.example.com")[0]["runs"] == 2
+    store.record_run("https://b.example.com", "passed")
+    assert set(store.recent_runs()) == {"https://a.example.com", "https://b.example.com"}
+    store.record_run("https://a.example.com", "passed", stage_timings={"scrape": 3.0})
+    assert store.stage_percentiles()["scrape"]["samples"] == 2
+    assert store.site_metric_percentiles("https://a.example.com")["ttfb_ms"]["samples"] == 1
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+from run_history import RunHistoryStore
+from run_planner import STABLE_STREAK, build_plan, run_plan, stable_checks
+
+NOW = time.time()
+CLEAN = {"results": [{"test": "Link Check", "status": "PASS"}, {"test": "Visual Regression", "status": "PASS"}]}
+
+
+def record(store, url, statuses, duration_s=60.0, age_days=1, report=CLEAN, fingerprints=None):
+    """Nightly runs ending `age_days` ago; statuses are oldest first"""
+    for night, status in enumerate(statuses):
+        store.record_run(
+            url, status, timestamp=NOW - (age_days + len(statuses) - 1 - night) * 86400, duration_s=duration_s,
+            fingerprint=fingerprints[night] if fingerprints else "same", report=report,
+        )
+    store.flush()
+
+
+def test_budget_admits_jobs_in_tier_priority():
+    store = RunHistoryStore(":memory:", batch_size=100)
+    record(store, "https://failing.example.com", ["passed"] * 5 + ["failed"], duration_s=100)
+    record(store, "https://flaky.example.com", ["failed", "passed"] * 5, duration_s=50)
+
+    plan = build_plan(["https://flaky.example.com", "https://failing.example.com", "https://new.example.com"],
+                      store=store, budget_s=200, seed=1, now=NOW)
+
+    # New (90s default) and failing (100s) fit; the flaky one would overrun the budget
+    assert [job["url"] for job in plan["jobs"]] == ["https://new.example.com", "https://failing.example.com"]
+    assert plan["skipped"] == [dict(plan["skipped"][0], url="https://flaky.example.com", skipped_because="over time budget")]
+    assert plan["plan_makespan_s"] == 190.0
+
+
+def test_budget_uses_every_lane():
+    plan = build_plan([f"https://site{i}.example.com" for i in range(4)], store=False, budget_s=200, lanes=2, seed=1)
+    assert len(plan["jobs"]) == 4 and not plan["skipped"]
+    assert plan["plan_makespan_s"] == 180.0
+
+
+def test_jobs_run_by_tier_then_longest_first():
+    store = RunHistoryStore(":memory:", batch_size=100)
+    record(store, "https://short.example.com", ["failed"], duration_s=30)
+    record(store, "https://long.example.com", ["failed"], duration_s=300)
+    record(store, "https://changed.example.com", ["passed", "passed"], duration_s=500, fingerprints=["a", "b"])
+
+    plan = build_plan(["https://changed.example.com", "https://short.example.com", "https://long.example.com",
+                       "https://new.example.com"], store=store, seed=1, now=NOW)
+
+    assert [(job["reason"], job["url"]) for job in plan["jobs"]] == [
+        ("new", "https://new.example.com"),
+        ("failing", "https://long.example.com"),
+        ("failing", "https://short.example.com"),
+        ("changed", "https://changed.example.com"),
+    ]
+
+
+def test_stable_sampling_is_seeded_by_date():
+    store = RunHistoryStore(":memory:", batch_size=1000)
+    urls = [f"https://stable{i}.example.com" for i in range(40)]
+    for url in urls:
+        record(store, url, ["passed"] * 20)
+
+    def sampled(seed=None):
+        return [job["url"] for job in build_plan(urls, store=store, seed=seed, now=NOW)["jobs"]]
+
+    tonight = sampled()
+    assert tonight == sampled() == sampled(time.strftime("%Y-%m-%d"))
+    assert tonight != sampled("another night")
+    # About sample_rate plus p_fail of the stable URLs are run; the rest are skipped, not dropped
+    assert 0 < len(tonight) < len(urls)
+    plan = build_plan(urls, store=store, now=NOW)
+    assert {job["reason"] for job in plan["jobs"]} == {"sampled"}
+    assert len(plan["jobs"]) + len(plan["skipped"]) == len(urls)
+
+
+def test_checks_need_a_full_clean_streak():
+    run = {"report": CLEAN}
+    broken_visual = {"report": {"results": [{"test": "Link Check", "status": "PASS"},
+                                            {"test": "Visual Regression", "status": "FAIL"}]}}
+
+    assert stable_checks([run] * STABLE_STREAK) == ["links", "visual"]
+    assert stable_checks([run] * (STABLE_STREAK - 1)) == []
+    assert stable_checks([run] * 5 + [broken_visual] + [run] * STABLE_STREAK) == ["links"]
+    # Runs older than the streak do not count against a check
+    assert stable_checks([run] * STABLE_STREAK + [broken_visual]) == ["links", "visual"]
+    # A check that did not run is not known to be stable
+    assert stable_checks([{"report": None}] * STABLE_STREAK) == []
+
+
+def test_stable_checks_are_skipped_unless_the_page_changed():
+    store = RunHistoryStore(":memory:", batch_size=100)
+    record(store, "https://stale.example.com", ["passed"] * STABLE_STREAK, age_days=10)
+    record(store, "https://changed.example.com", ["passed"] * STABLE_STREAK,
+           fingerprints=["a"] * (STABLE_STREAK - 1) + ["b"])
+
+    plan = build_plan(["https://stale.example.com", "https://changed.example.com"], store=store,
+                      sample_rate=0.0, seed=1, now=NOW)
+
+    skips = {job["reason"]: job["skip_checks"] for job in plan["jobs"]}
+    assert skips == {"changed": [], "stale": ["links", "visual"]}
+    assert plan["checks_skipped"] == 2
+
+
+def test_a_crashing_job_is_recorded_and_the_lane_carries_on():
+    class Tester:
+        def __init__(self, job):
+            self.job = job
+
+        async def run(self, url, test_name):
+            if "broken" in url:
+                raise RuntimeError("desktop never came up")
+            return True
+
+    plan = build_plan(["https://broken.example.com", "https://ok.example.com"], store=False, seed=1)
+    results = asyncio.run(run_plan(plan, make_tester=Tester))
+
+    assert results["https://broken.example.com"]["success"] is False
+    assert results["https://broken.example.com"]["error"] == "desktop never came up"
+    assert results["https://ok.example.com"]["success"] is True
+    assert all("duration_s" in result for result in results.values())
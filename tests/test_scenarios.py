@@ -0,0 +1,167 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import intelligent_website_tester
+from fakes import FaultInjectingComputer, FakeGeminiModel
+from intelligent_website_tester import AsyncIntelligentWebsiteTester, IntelligentWebsiteTester, scenario_action
+from resilience import AsyncComputer
+from utils import SCENARIOS
+
+URL = "https://shop.example.com/"
+
+
+def test_render_rejects_variables_the_template_does_not_declare():
+    with pytest.raises(ValueError, match="no variables: colour"):
+        SCENARIOS.render("navigation_test", url=URL, colour="red")
+    with pytest.raises(ValueError, match="no variables: pasword"):
+        SCENARIOS.get("login_test").render_steps(url=URL, pasword="typo")
+    steps = SCENARIOS.get("login_test").render_steps(url=URL, password="s3cret")
+    assert steps[3:5] == ["4. Fill username field with 'testuser'", "5. Fill password field with 's3cret'"]
+
+
+def test_steps_map_to_actions_or_checks():
+    steps = SCENARIOS.get("login_test").render_steps(url=URL)
+    assert [scenario_action(step) for step in steps] == [
+        ("open", None), ("navigate", URL), ("check", "Look for login form fields (username/email and password)"),
+        ("fill", "testuser"), ("fill", "testpass"), ("submit", None), ("wait", None), ("screenshot", None),
+        ("check", "Check if login was successful (look for dashboard, welcome message, or error)"), ("report", None),
+    ]
+    assert scenario_action("6. Click on a main navigation link if available") == ("click", None)
+    assert scenario_action("Scroll down to the footer") == ("scroll", "down")
+    assert scenario_action("Hover over the account menu") == ("unsupported", "Hover over the account menu")
+    assert scenario_action("Verify the navigation worked") == ("check", "Verify the navigation worked")
+
+
+def scenario_tester(steps, fake, monkeypatch, model=None):
+    monkeypatch.setattr(intelligent_website_tester, "SCENARIO_WAIT", 0)
+    tester = AsyncIntelligentWebsiteTester(renderer="none", model=model or object(), scenario_steps=steps)
+    tester.computer = AsyncComputer(fake)
+    return tester
+
+
+AFTER_LOGIN = ("<html><head><title>Dashboard - Shop</title></head><body><h1>Welcome back, testuser</h1>"
+               "<p>Your orders, saved addresses and payment methods are listed below.</p></body></html>")
+
+
+def test_scenario_checks_are_judged_from_the_page_after_the_steps(monkeypatch):
+    fake = FaultInjectingComputer(exec_outputs={"xclip": AFTER_LOGIN})
+    model = FakeGeminiModel()
+    tester = scenario_tester(SCENARIOS.get("login_test").render_steps(url=URL), fake, monkeypatch, model)
+    tester.scraped_content = {"url": URL, "title": "Log in - Shop", "paragraphs": ["Please log in to continue."]}
+
+    asyncio.run(tester.run_scenario(URL))
+
+    # The browser stage already opened the tested URL, so nothing navigates again; the page is read after the steps
+    assert [(op, args) for op, args in fake.calls if op != "exec"] == [
+        ("type", ("testuser",)), ("key", ("Tab",)), ("type", ("testpass",)), ("key", ("Tab",)),
+        ("key", ("Enter",)), ("screenshot", ()),
+    ]
+    assert fake.calls[-1][0] == "exec" and "xclip" in fake.calls[-1][1][0]
+    assert tester.scenario_checks == [
+        "Look for login form fields (username/email and password)",
+        "Check if login was successful (look for dashboard, welcome message, or error)",
+    ]
+    assert tester.scenario_content["title"] == "Dashboard - Shop"
+    assert tester.test_results[-1]["test"] == "Scenario"
+    assert tester.test_results[-1]["status"] == "PASS"
+    assert "judged by the AI analysis" in tester.test_results[-1]["details"]
+
+    asyncio.run(tester.analyze_content_with_gemini())
+    prompt = model.prompts[-1]
+    assert "Welcome back, testuser" in prompt and "Dashboard - Shop" in prompt
+    assert prompt.index("After its steps") < prompt.index("- Check if login was successful")
+
+
+def test_checks_are_not_judged_when_the_page_cannot_be_read(monkeypatch):
+    model = FakeGeminiModel()
+    tester = scenario_tester(SCENARIOS.get("login_test").render_steps(url=URL), FaultInjectingComputer(), monkeypatch, model)
+    tester.scraped_content = {"url": URL, "title": "Log in - Shop", "paragraphs": ["Please log in to continue."]}
+
+    asyncio.run(tester.run_scenario(URL))
+
+    results = {r["test"]: r for r in tester.test_results}
+    assert results["Scenario Checks"]["status"] == "WARNING"
+    assert "checks not judged" in results["Scenario"]["details"]
+    asyncio.run(tester.analyze_content_with_gemini())
+    assert "judge whether" not in model.prompts[-1]
+
+
+def test_clicks_are_done_and_unmapped_actions_fail(monkeypatch):
+    monkeypatch.setattr(intelligent_website_tester, "click_positions_from_screenshot",
+                        lambda screenshot, max_targets, button_texts: ([(120, 40)], "discovered"))
+    fake = FaultInjectingComputer(exec_outputs={"xclip": AFTER_LOGIN})
+    steps = SCENARIOS.get("navigation_test").render_steps(url=URL) + ["10. Select the second product in the list"]
+    tester = scenario_tester(steps, fake, monkeypatch)
+    tester.scraped_content = {"buttons": ["Products"]}
+
+    asyncio.run(tester.run_scenario(URL))
+
+    assert ("left_click", (120, 40)) in fake.calls
+    assert "Click on a main navigation link if available" not in tester.scenario_checks
+    assert "Select the second product in the list" not in tester.scenario_checks
+    results = {r["test"]: r for r in tester.test_results}
+    assert results["Scenario Step 10"]["status"] == "FAIL"
+    assert "not performed" in results["Scenario Step 10"]["details"]
+    assert results["Scenario"]["status"] == "FAIL"
+
+
+def test_optional_click_without_a_target_is_skipped(monkeypatch):
+    fake = FaultInjectingComputer(exec_outputs={"xclip": AFTER_LOGIN})
+    tester = scenario_tester(SCENARIOS.get("navigation_test").render_steps(url=URL), fake, monkeypatch)
+    tester.scraped_content = {}
+
+    asyncio.run(tester.run_scenario(URL))
+
+    assert tester.test_results[-1]["status"] == "PASS"
+    assert not any(op == "left_click" for op, _ in fake.calls)
+
+
+def test_failed_scenario_step_fails_the_scenario(monkeypatch):
+    fake = FaultInjectingComputer(fail_ops={"type": 1})
+    tester = scenario_tester(SCENARIOS.get("form_test").render_steps(url=URL), fake, monkeypatch)
+
+    asyncio.run(tester.run_scenario(URL))
+
+    results = {r["test"]: r for r in tester.test_results}
+    assert results["Scenario Step 4"]["status"] == "FAIL"
+    assert results["Scenario"]["status"] == "FAIL"
+
+
+def test_worker_passes_the_scenario_steps_to_the_tester(monkeypatch):
+    from worker import run_intelligent_job
+
+    seen = []
+    monkeypatch.setattr(IntelligentWebsiteTester, "run_intelligent_test",
+                        lambda self, url, test_name: seen.append(self.scenario_steps) or True)
+    steps = SCENARIOS.get("navigation_test").render_steps(url=URL)
+    job = {"session_id": "s1", "url": URL, "test_name": "Nav", "scenario_steps": steps}
+
+    result = run_intelligent_job(job, lambda event: None, intelligent_website_tester.CancelToken(deadline_seconds=None))
+
+    assert result["success"] and seen == [steps]
+
+
+def test_api_puts_the_rendered_steps_in_the_job(monkeypatch):
+    import main
+    from fastapi import HTTPException
+
+    submitted = []
+    monkeypatch.setattr(main.scheduler, "submit", lambda session_id, client_id, priority, start: (
+        submitted.append(start) or SimpleNamespace(started_at=1.0)
+    ))
+    monkeypatch.setattr(main, "run_test_background", lambda job_spec: job_spec)
+
+    def post(**fields):
+        request = main.TestRequest(url=URL, scenario="login_test", **fields)
+        return asyncio.run(main.run_test(request, SimpleNamespace(client=None), x_client_id="tests"))
+
+    response = post(scenario_vars={"username": "ann"})
+    job_spec = submitted[0]()
+    main.active_sessions.pop(response.session_id, None)
+    assert job_spec["scenario_steps"][3] == "4. Fill username field with 'ann'"
+
+    with pytest.raises(HTTPException) as rejected:
+        post(scenario_vars={"colour": "red"})
+    assert rejected.value.status_code == 422
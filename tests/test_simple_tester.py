@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import pytest
+
+import adaptive_limiter
+import resilience
+import simple_website_tester
+from fakes import FaultInjectingComputer
+from resource_scheduler import ResourceScheduler, requires, GUI, SHELL
+from sharded_website_tester import AsyncShardedWebsiteTester
+from simple_website_tester import AsyncSimpleWebsiteTester, SimpleWebsiteTester
+
+URL = "https://shop.example.com/"
+
+
+async def no_wait(seconds, poll=0.1):
+    await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    # Earlier fault-injection tests may have opened breakers or shrunk the shared Orgo limiter
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(adaptive_limiter, "_limiters", {})
+    # FakeScreenshot has no pixels to compare against a baseline
+    monkeypatch.setattr(simple_website_tester, "check_screenshot", lambda *args: ("PASS", "ok", {}))
+
+
+def fast_tester(cls, fake, **kwargs):
+    tester = cls(computer_factory=lambda: fake, **kwargs)
+    tester.history_store = None
+    tester.cancel_token.sleep_async = no_wait
+    return tester
+
+
+def test_gui_tests_share_a_lane_while_shell_tests_overlap():
+    order = []
+
+    @requires(GUI)
+    async def click():
+        order.append("click start")
+        await asyncio.sleep(0.05)
+        order.append("click end")
+        return True
+
+    @requires(GUI)
+    async def scroll():
+        order.append("scroll")
+        return True
+
+    @requires(SHELL)
+    async def shell():
+        order.append("shell")
+        return "ok"
+
+    scheduler = ResourceScheduler()
+    results = asyncio.run(scheduler.run([click, scroll, shell]))
+
+    assert results == [True, True, "ok"]
+    assert scheduler.last_report["lanes"] == [["click", "scroll"], ["shell"]]
+    # The shell lane runs while the click waits; the scroll waits for the click
+    assert order == ["click start", "shell", "click end", "scroll"]
+
+
+def test_failing_test_is_reported_false():
+    async def broken():
+        raise RuntimeError("boom")
+
+    assert asyncio.run(ResourceScheduler().run([broken])) == [False]
+
+
+def test_simple_run_drives_the_desktop_and_destroys_it():
+    fake = FaultInjectingComputer()
+    tester = fast_tester(SimpleWebsiteTester, fake)
+
+    assert tester.run_website_test(URL) is True
+    ops = [operation for operation, _ in fake.calls]
+    assert ops[:2] == ["exec", "exec"]
+    assert {"screenshot", "left_click", "type", "key", "scroll"} <= set(ops)
+    assert ops[-1] == "destroy" and fake.destroyed
+    assert tester.computer is None
+    assert all(result["status"] == "PASS" for result in tester.test_results)
+    assert set(tester.schedule_report["lanes"][0]) >= {"test_button_interaction", "test_scroll_functionality"}
+
+
+def test_runs_share_one_event_loop():
+    fakes = [FaultInjectingComputer(latency=0.05) for _ in range(3)]
+    testers = [fast_tester(AsyncSimpleWebsiteTester, fake) for fake in fakes]
+
+    async def run_all():
+        return await asyncio.gather(*(tester.run(URL, f"Run {i}") for i, tester in enumerate(testers)))
+
+    started = time.perf_counter()
+    assert asyncio.run(run_all()) == [True, True, True]
+    elapsed = time.perf_counter() - started
+
+    # Each run makes well over ten 50 ms Orgo calls; overlapping runs finish in about the time of one
+    serial = sum(len(fake.calls) for fake in fakes) * 0.05
+    assert elapsed < serial / 2
+    assert all(fake.destroyed for fake in fakes)
+
+
+def test_sharded_run_tests_each_tab_on_one_desktop_per_shard():
+    made = []
+
+    def factory():
+        made.append(FaultInjectingComputer())
+        return made[-1]
+
+    urls = [f"https://site{i}.example.com/" for i in range(3)]
+    tester = AsyncShardedWebsiteTester(tabs_per_desktop=2, computer_factory=factory)
+    tester.history_store = None
+    tester.cancel_token.sleep_async = no_wait
+
+    assert asyncio.run(tester.run_sharded(urls)) is True
+    assert len(made) == 2 and all(fake.destroyed for fake in made)
+    assert [shard["urls"] for shard in tester.shard_timings] == [urls[:2], urls[2:]]
+    report = tester.get_sharded_report()
+    assert all(entry["total_tests"] and not entry["failed"] for entry in report["urls"].values())
+    assert made[0].calls[:2] == [("exec", (f"firefox --new-window {urls[0]}",)), ("exec", (f"firefox --new-tab {urls[1]}",))]
+
+
+def test_cancelling_one_lane_stops_the_others():
+    from run_control import RunCancelled
+
+    done = []
+
+    @requires(GUI)
+    async def click():
+        await asyncio.sleep(0.01)
+        raise RunCancelled("cancelled by the user")
+
+    @requires(SHELL)
+    async def slow_shell():
+        await asyncio.sleep(0.2)
+        done.append("slow_shell")
+
+    @requires(SHELL)
+    async def next_shell():
+        done.append("next_shell")
+
+    async def run():
+        with pytest.raises(RunCancelled):
+            # Exclusive shell access puts both shell tests in one lane, behind each other
+            await ResourceScheduler(exclusive_resources={GUI, SHELL}).run([click, slow_shell, next_shell])
+        # Nothing is left running once the scheduler has given up
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run())
+    assert done == []
+
+
+class TabbedComputer(FaultInjectingComputer):
+    """Fake desktop with a Firefox tab strip: Alt+N selects a tab, the window title is the active tab's"""
+
+    def __init__(self, popup_after_click=False):
+        super().__init__()
+        self.tabs, self.active = [], 0
+        self.popup_after_click = popup_after_click
+
+    def exec(self, command):
+        result = super().exec(command)
+        if "--new-window" in command or "--new-tab" in command:
+            self.tabs.append(f"Title of {command.split()[-1]}")
+            self.active = len(self.tabs) - 1
+        elif "getwindowname" in command:
+            result["output"] = self.tabs[self.active] + "\n"
+        return result
+
+    def key(self, key):
+        super().key(key)
+        if key.startswith("alt+"):
+            self.active = min(int(key[4:]), len(self.tabs)) - 1
+        return True
+
+    def left_click(self, x, y):
+        super().left_click(x, y)
+        if self.popup_after_click:
+            # Like a link with target=_blank: a new tab right after the active one
+            self.popup_after_click = False
+            self.tabs.insert(self.active + 1, "Popup")
+        return True
+
+
+def sharded(fake, tabs=4):
+    tester = AsyncShardedWebsiteTester(tabs_per_desktop=tabs, computer_factory=lambda: fake)
+    tester.history_store = None
+    tester.cancel_token.sleep_async = no_wait
+    return tester
+
+
+def test_tabs_are_selected_by_position():
+    fake = TabbedComputer()
+    urls = [f"https://site{i}.example.com/" for i in range(3)]
+    assert asyncio.run(sharded(fake).run_sharded(urls)) is True
+
+    keys = [args[0] for operation, args in fake.calls if operation == "key" and args[0].startswith(("alt+", "ctrl+Tab"))]
+    # Titles are recorded once, then each tab is selected directly for its tests
+    assert keys == ["alt+1", "alt+2", "alt+3", "alt+1", "alt+2", "alt+3"]
+    assert sharded(fake, tabs=20).tabs_per_desktop == 8
+
+
+def test_a_tab_opened_by_a_test_fails_the_rest_of_the_shard():
+    fake = TabbedComputer(popup_after_click=True)
+    urls = [f"https://site{i}.example.com/" for i in range(3)]
+    tester = sharded(fake)
+
+    assert asyncio.run(tester.run_sharded(urls)) is False
+
+    report = tester.get_sharded_report()["urls"]
+    assert report[urls[0]]["failed"] == 0
+    for url in urls[1:]:
+        assert [(r["test"], r["status"]) for r in report[url]["results"]] == [("Tab Selection", "FAIL")]
+    assert "shows 'Popup'" in report[urls[1]]["results"][0]["details"]
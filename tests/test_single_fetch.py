@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+import adaptive_limiter
+import intelligent_website_tester
+import resilience
+from fakes import FaultInjectingComputer, FakeGeminiModel
+from intelligent_website_tester import AsyncIntelligentWebsiteTester
+from link_checker import LinkCache, start_fixture_server
+from resilience import AsyncComputer
+from text_dedup import fixture_page
+
+SHELL = "<html><head><title>Shop</title></head><body><div id='app'></div><script src='/app.js'></script></body></html>"
+
+
+async def no_wait(seconds, poll=0.1):
+    await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(adaptive_limiter, "_limiters", {})
+
+
+@pytest.fixture
+def server():
+    # The site serves the rendered page itself, so both sources see the same HTML
+    server, _ = start_fixture_server(links=0, page=fixture_page(0))
+    yield server
+    server.shutdown()
+
+
+def make_tester(content_source, fake=None):
+    tester = AsyncIntelligentWebsiteTester(
+        renderer="none", content_source=content_source, skip_checks=("visual",), model=FakeGeminiModel(),
+        computer_factory=lambda: fake or FaultInjectingComputer(),
+    )
+    tester.history_store = None
+    tester.link_cache = LinkCache(path=None)
+    tester.boilerplate = None
+    tester.cancel_token.sleep_async = no_wait
+    return tester
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_port}/"
+
+
+def test_desktop_html_parses_like_the_fetched_page(server):
+    url = url_of(server)
+    fetched = make_tester("http")
+    assert asyncio.run(fetched.scrape_website_content(url))
+
+    desktop = make_tester("desktop")
+    desktop.computer = AsyncComputer(FaultInjectingComputer(exec_outputs={"xclip": fixture_page(0)}))
+    assert asyncio.run(desktop.scrape_desktop_content(url))
+
+    assert server.page_requests == 1
+    assert desktop.scraped_content == fetched.scraped_content
+    assert desktop.scraped_content["paragraphs"] and desktop.scraped_content["title"]
+    assert desktop.test_results[-1]["test"] == "Content Scraping"
+    assert "from the rendered page" in desktop.test_results[-1]["details"]
+
+
+def test_empty_desktop_output_falls_back_to_http(server):
+    tester = make_tester("desktop")
+    tester.computer = AsyncComputer(FaultInjectingComputer())
+
+    assert asyncio.run(tester.scrape_desktop_content(url_of(server)))
+    assert server.page_requests == 1
+    assert tester.scraped_content["paragraphs"]
+    assert [(r["test"], r["status"]) for r in tester.test_results][0] == ("Desktop Scraping", "WARNING")
+
+
+def test_content_source_defaults_and_validation(monkeypatch):
+    assert AsyncIntelligentWebsiteTester(renderer="none", model=object()).content_source == "http"
+    monkeypatch.setattr(intelligent_website_tester, "CONTENT_SOURCE", "desktop")
+    assert AsyncIntelligentWebsiteTester(renderer="none", model=object()).content_source == "desktop"
+    with pytest.raises(ValueError, match="Unknown content source 'browser'"):
+        AsyncIntelligentWebsiteTester(renderer="none", model=object(), content_source="browser")
+
+
+@pytest.mark.parametrize("content_source, page_fetches", [("http", 1), ("desktop", 0)])
+def test_full_run_fetches_the_page_once_per_source(content_source, page_fetches):
+    server, _ = start_fixture_server(links=0, page=SHELL)
+    fake = FaultInjectingComputer(exec_outputs={"xclip": fixture_page(0)})
+    tester = make_tester(content_source, fake)
+    try:
+        assert asyncio.run(tester.run(url_of(server), "Single fetch")) is True
+    finally:
+        server.shutdown()
+
+    assert server.page_requests == page_fetches
+    dom_reads = [args for operation, args in fake.calls if operation == "exec" and "xclip" in args[0]]
+    assert len(dom_reads) == (content_source == "desktop")
+    # Only the rendered page has the app's content; the HTTP fetch sees the empty shell
+    assert bool(tester.scraped_content["paragraphs"]) == (content_source == "desktop")
+
+
+def test_final_url_comes_from_the_browser(server):
+    landed = url_of(server) + "landing?from=redirect"
+    tester = make_tester("desktop")
+    tester.computer = AsyncComputer(FaultInjectingComputer(exec_outputs={"xclip": f"{landed}\n{fixture_page(0)}"}))
+
+    assert asyncio.run(tester.scrape_desktop_content(url_of(server)))
+    # The saved page has its head, so nothing is fetched over HTTP
+    assert server.page_requests == 0
+    assert tester.scraped_content["url"] == url_of(server)
+    assert tester.scraped_content["final_url"] == landed
+    assert tester.scraped_content["title"] == "Page 0 - shop.example.com"
+
+
+def test_a_body_fragment_gets_its_head_over_http():
+    page = ("<html><head><title>Shop</title><meta name='description' content='Shoes and more'></head>"
+            "<body><p>Hand-made leather shoes, shipped within two days.</p></body></html>")
+    fragment = "<title>Shop</title><p>Hand-made leather shoes, shipped within two days.</p>"
+    server, _ = start_fixture_server(links=0, page=page)
+    tester = make_tester("desktop")
+    tester.computer = AsyncComputer(FaultInjectingComputer(exec_outputs={"xclip": f"{url_of(server)}\n{fragment}"}))
+    try:
+        assert asyncio.run(tester.scrape_desktop_content(url_of(server)))
+    finally:
+        server.shutdown()
+
+    assert server.page_requests == 1
+    assert tester.scraped_content["meta_description"] == "Shoes and more"
+    assert tester.scraped_content["title"] == "Shop"
+    assert tester.scraped_content["paragraphs"] == ["Hand-made leather shoes, shipped within two days."]
@@ -0,0 +1,94 @@
+from bs4 import BeautifulSoup
+
+from intelligent_website_tester import AsyncIntelligentWebsiteTester
+from text_dedup import BoilerplateFilter, dedupe_near_duplicates, extract_blocks, fixture_page, maximal_blocks
+
+NAV = "<div class='nav'><span>Home section of the whole store</span><span>Pricing section of the whole store</span></div>"
+FOOTER = "<div class='footer'><p>Copyright 2026 Example Shop Ltd. All rights reserved worldwide.</p></div>"
+
+
+def soup(body):
+    return BeautifulSoup(f"<html><body>{body}</body></html>", "html.parser")
+
+
+def page(article):
+    return soup(f"{NAV}<div class='main'><p>{article}</p></div>{FOOTER}")
+
+
+def test_wrappers_give_way_to_their_blocks():
+    blocks, candidates = maximal_blocks(soup(
+        "<div><div><p>First paragraph with enough text to count.</p><p>Second paragraph with enough text too.</p></div></div>"
+    ))
+    assert blocks == ["First paragraph with enough text to count.", "Second paragraph with enough text too."]
+    # The old extraction took both wrappers as well, each repeating the paragraphs
+    assert len(candidates) == 4
+
+
+def test_block_with_its_own_text_is_kept_whole():
+    blocks, _ = maximal_blocks(soup(
+        "<p>Our team tests every product by hand. <span>Updated for the spring season.</span></p><p>tiny</p>"
+    ))
+    assert blocks == ["Our team tests every product by hand. Updated for the spring season."]
+
+
+def test_exact_and_near_duplicates_collapse_to_the_longest_first():
+    text = "Sign up for our newsletter and get ten percent off your first order from the shop today"
+    blocks = ["Welcome to the example shop home page", text, text.upper(),
+              "Completely different text about shipping times and returns", text + " only"]
+    kept, signatures = dedupe_near_duplicates(blocks)
+
+    assert kept == ["Welcome to the example shop home page", text + " only",
+                    "Completely different text about shipping times and returns"]
+    assert len(signatures) == len(kept)
+
+
+def test_filter_drops_boilerplate_from_later_pages_only():
+    boilerplate = BoilerplateFilter()
+    home, _, stats = extract_blocks(page("The home page article introduces the shop and its products."),
+                                    "https://shop.example.com/", boilerplate)
+    # Revisiting a page does not filter it against itself
+    again, _, _ = extract_blocks(page("The home page article introduces the shop and its products."),
+                                 "https://shop.example.com/#top", boilerplate)
+    assert again == home
+
+    about, own, about_stats = extract_blocks(page("The about page tells the story of the team behind the shop."),
+                                             "https://shop.example.com/about", boilerplate)
+
+    assert len(home) == 4 and stats["boilerplate"] == 0
+    assert about == ["The about page tells the story of the team behind the shop."]
+    assert about_stats["boilerplate"] == 3
+    # Change detection sees the page's own blocks, boilerplate included
+    assert len(own) == 4
+
+    # Other sites are unaffected
+    other, _, _ = extract_blocks(page("Another site that happens to use the same template."),
+                                 "https://other.example.com/", boilerplate)
+    assert len(other) == 4
+
+
+def test_a_copy_of_a_seen_page_is_not_boilerplate():
+    boilerplate = BoilerplateFilter()
+    extract_blocks(page("The home page article introduces the shop and its products."), "https://shop.example.com/", boilerplate)
+    copy, _, stats = extract_blocks(page("The home page article introduces the shop and its products."),
+                                    "https://shop.example.com/?utm_source=mail", boilerplate)
+    assert len(copy) == 4 and stats["boilerplate"] == 0
+
+
+def test_separate_runs_do_not_filter_each_other():
+    home, about = fixture_page(0), fixture_page(1)
+
+    def extract(url, html, tester=None):
+        tester = tester or AsyncIntelligentWebsiteTester(renderer="none", model=object())
+        return tester.extract_content(url, url, html)["paragraphs"]
+
+    alone = extract("https://shop.example.com/", home)
+    extract("https://shop.example.com/about", about)
+    assert extract("https://shop.example.com/", home) == alone
+
+    # Pages of one multi-page run share a filter
+    boilerplate = BoilerplateFilter()
+    extract("https://shop.example.com/about", about,
+            AsyncIntelligentWebsiteTester(renderer="none", model=object(), boilerplate=boilerplate))
+    shared = extract("https://shop.example.com/", home,
+                     AsyncIntelligentWebsiteTester(renderer="none", model=object(), boilerplate=boilerplate))
+    assert len(shared) < len(alone)
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+from visual_regression import TILE_SIZE, BaselineStore, check_screenshot, compare_frames, tile_hashes
+
+URL = "https://shop.example.com/"
+CHROME = 90
+
+
+def screenshot(clock=0, height=400, width=300):
+    """Browser chrome with a clock on top of a page of flat, distinct bands"""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:CHROME] = 225
+    frame[CHROME - 20:CHROME - 10, 250:290] = clock
+    for i, y in enumerate(range(CHROME, height, 40)):
+        frame[y:y + 40] = (i * 30) % 256
+    return frame
+
+
+def test_identical_frames_skip_every_tile():
+    frame = screenshot()
+    result = compare_frames(frame, frame.copy())
+    assert (result["score"], result["changed_tiles"], result["regression"]) == (0.0, 0, False)
+    assert result["total_tiles"] == 13 * 10
+    assert not result["heatmap"].any()
+
+
+def test_score_counts_changed_pixels_exactly():
+    baseline = screenshot()
+    current = baseline.copy()
+    # A 32x16 patch inside one tile, and a change under the tolerance elsewhere
+    current[96:112, 32:64] = 255
+    current[224:256, 224:256] += 5
+
+    result = compare_frames(current, baseline)
+    assert result["changed_tiles"] == 2
+    assert result["score"] == round(32 * 16 / (400 * 300), 5)
+    assert result["heatmap"][3, 1] == 0.5
+    assert result["heatmap"].sum() == 0.5
+
+
+def test_hashes_cover_frames_that_are_not_a_multiple_of_the_tile():
+    frame = screenshot(height=100, width=70)
+    assert tile_hashes(frame).shape == (4, 3)
+    changed = frame.copy()
+    changed[-1, -1] = 0 if changed[-1, -1, 0] else 255
+    assert (tile_hashes(changed) != tile_hashes(frame)).sum() == 1
+
+
+def test_size_change_is_a_regression():
+    result = compare_frames(screenshot(height=320), screenshot())
+    assert result["regression"] and result["reason"] == "size changed from 300x400 to 300x320"
+
+
+def test_baseline_then_compare_ignores_the_browser_chrome(tmp_path):
+    store = BaselineStore(root=str(tmp_path))
+    status, details, summary = check_screenshot(store, URL, screenshot(), top_margin=CHROME)
+    assert (status, details) == ("PASS", "Baseline saved (300x310)")
+
+    # A fresh store reads the baseline back from disk
+    store = BaselineStore(root=str(tmp_path))
+    status, _, summary = check_screenshot(store, URL, screenshot(clock=255), top_margin=CHROME)
+    assert status == "PASS" and summary["changed_tiles"] == 0
+    # The same change in the chrome would have counted against a full-frame baseline
+    assert compare_frames(screenshot(clock=255), screenshot())["changed_tiles"] > 0
+
+
+def test_page_change_fails_with_a_heatmap(tmp_path):
+    store = BaselineStore(root=str(tmp_path), tile=TILE_SIZE)
+    check_screenshot(store, URL, screenshot(), top_margin=CHROME)
+
+    changed = screenshot()
+    changed[150:250, 50:250] = 255
+    status, details, summary = check_screenshot(store, URL, changed, top_margin=CHROME)
+    assert status == "FAIL" and "of pixels changed" in details
+    assert os.path.exists(summary["heatmap_path"])
+
+    # Re-recording accepts the new page
+    assert check_screenshot(store, URL, changed, update_baseline=True, top_margin=CHROME)[0] == "PASS"
+    assert check_screenshot(store, URL, changed, top_margin=CHROME)[2]["score"] == 0.0
+
+
+def test_blank_page_fails_without_touching_the_baseline(tmp_path):
+    store = BaselineStore(root=str(tmp_path))
+    blank = screenshot()
+    blank[CHROME:] = 255
+    assert check_screenshot(store, URL, blank, top_margin=CHROME)[0] == "FAIL"
+    assert store.entries() == []
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import zlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import numpy as np
+
+# Blocks whose estimated Jaccard similarity reaches this count as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+# Set to 0 to keep blocks (nav, footer, cookie banners) already seen on other pages of the site
+BOILERPLATE_FILTER = os.getenv("BOILERPLATE_FILTER", "1") != "0"
+
+BLOCK_TAGS = ("p", "div", "span")
+# Blocks need more text than this to be extracted at all, as before
+MIN_BLOCK_CHARS = 20
+# A container needs this much text outside its child blocks to be kept whole
+MIN_OWN_CHARS = 10
+
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 similarity become candidates, then the
+# signatures decide. A pair at 0.8 is missed with probability ~0.0002.
+LSH_BANDS = 16
+# A page sharing more than this share of its blocks with other pages is the
+# same page under another URL (query string, trailing slash), not boilerplate
+MAX_BOILERPLATE_SHARE = 0.8
+
+_WORD_PATTERN = re.compile(r"\w+")
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_PERM_A = _rng.randint(1, _PRIME, NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, NUM_PERM).astype(np.uint64)
+
+
+def shingles(text, size=SHINGLE_WORDS):
+    """Hashes of the text's overlapping word n-grams; short texts are one shingle"""
+    words = _WORD_PATTERN.findall(text.lower())
+    grams = [" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return np.unique(np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams)))
+
+
+def minhash(text):
+    """MinHash signature: for each of NUM_PERM hash permutations, the smallest shingle hash"""
+    hashes = shingles(text)
+    return ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(left, right):
+    """Estimated Jaccard similarity of two signatures' shingle sets"""
+    return float(np.count_nonzero(left == right)) / NUM_PERM
+
+
+class MinHashLSH:
+    """Banded index of MinHash signatures that finds stored keys similar to a query"""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, bands=LSH_BANDS):
+        self.threshold = threshold
+        self.rows = NUM_PERM // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(len(self.buckets))]
+
+    def query(self, signature):
+        """Stored keys at or above the threshold, most similar first"""
+        candidates = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        scored = [(similarity(signature, self.signatures[key]), key) for key in candidates]
+        return [key for score, key in sorted(scored, key=lambda item: -item[0]) if score >= self.threshold]
+
+    def insert(self, key, signature):
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+
+def maximal_blocks(soup, tags=BLOCK_TAGS, min_chars=MIN_BLOCK_CHARS, min_own_chars=MIN_OWN_CHARS):
+    """Text of the outermost blocks that carry text of their own, in document order.
+
+    Nested containers repeat their children's text. A block whose text all
+    sits in child blocks is a wrapper and gives way to the children; a block
+    with text of its own is kept whole and the blocks inside it are dropped.
+    Returns (blocks, candidates), candidates being every block's text as the
+    old one-block-per-element extraction produced them.
+    """
+    elements, texts = [], []
+    for element in soup.find_all(tags):
+        text = " ".join(element.get_text(" ").split())
+        if len(text) > min_chars:
+            elements.append(element)
+            texts.append(text)
+
+    positions = {id(element): index for index, element in enumerate(elements)}
+    parents = []
+    for element in elements:
+        parents.append(next((positions[id(a)] for a in element.parents if id(a) in positions), None))
+
+    # Text outside child blocks: the block's length less its children's (and their separating spaces)
+    own_chars = [len(text) for text in texts]
+    for index, parent in enumerate(parents):
+        if parent is not None:
+            own_chars[parent] -= len(texts[index]) + 1
+
+    # find_all walks the tree in document order, so a parent is decided before its children
+    kept, covered = [False] * len(texts), [False] * len(texts)
+    for index, parent in enumerate(parents):
+        if parent is not None and (kept[parent] or covered[parent]):
+            covered[index] = True
+        elif own_chars[index] >= min_own_chars:
+            kept[index] = True
+    return [text for text, keep in zip(texts, kept) if keep], texts
+
+
+def dedupe_near_duplicates(blocks, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Collapse exact and near-duplicate blocks; each group keeps its longest text at its first position.
+
+    Returns (blocks, signatures) so callers can index the survivors further.
+    """
+    index = MinHashLSH(threshold)
+    kept, signatures, exact = [], [], set()
+    for text in blocks:
+        key = text.lower()
+        if key in exact:
+            continue
+        exact.add(key)
+        signature = minhash(text)
+        matches = index.query(signature)
+        if matches:
+            if len(text) > len(kept[matches[0]]):
+                kept[matches[0]] = text
+            continue
+        index.insert(len(kept), signature)
+        kept.append(text)
+        signatures.append(signature)
+    return kept, signatures
+
+
+def page_key(url):
+    """Site and page a URL belongs to; fragments and trailing slashes don't make a new page"""
+    parts = urlsplit(url)
+    page = f"{parts.path.rstrip('/') or '/'}?{parts.query}" if parts.query else parts.path.rstrip("/") or "/"
+    return parts.netloc.lower(), page
+
+
+class BoilerplateFilter:
+    """Drops blocks already seen on another page of the same site: nav, footers, banners.
+
+    Shared by the pages of one multi-page run (e.g. a run plan), so the run
+    keeps the site's boilerplate on the first page it sees and drops it from
+    the rest. Never shared between runs: a page's content must not depend on
+    what some other run tested before it. Repeat visits to one page never
+    filter themselves.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, max_sites=256, max_blocks_per_site=5000):
+        self.threshold = threshold
+        self.max_sites = max_sites
+        self.max_blocks_per_site = max_blocks_per_site
+        # netloc -> (MinHashLSH of the site's blocks, block key -> pages it was seen on)
+        self._sites = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, url, blocks, signatures):
+        """Return (blocks not seen on other pages of url's site, number dropped) and remember this page's blocks"""
+        site, page = page_key(url)
+        with self._lock:
+            if site not in self._sites:
+                self._sites[site] = (MinHashLSH(self.threshold), {})
+                if len(self._sites) > self.max_sites:
+                    self._sites.popitem(last=False)
+            self._sites.move_to_end(site)
+            index, pages = self._sites[site]
+
+            matches = [index.query(signature) for signature in signatures]
+            shared = [any(pages[key] - {page} for key in keys) for keys in matches]
+            for signature, keys in zip(signatures, matches):
+                if keys:
+                    for key in keys:
+                        pages[key].add(page)
+                elif len(pages) < self.max_blocks_per_site:
+                    index.insert(len(pages), signature)
+                    pages[len(pages)] = {page}
+
+        if not blocks or sum(shared) > MAX_BOILERPLATE_SHARE * len(blocks):
+            return list(blocks), 0
+        return [text for text, seen in zip(blocks, shared) if not seen], sum(shared)
+
+
+def new_boilerplate_filter():
+    """A filter for one multi-page run, or None when BOILERPLATE_FILTER=0"""
+    return BoilerplateFilter() if BOILERPLATE_FILTER else None
+
+
+def extract_blocks(soup, url=None, boilerplate=None):
+    """Deduplicated text blocks of a parsed page, plus counts of what each stage removed"""
+    blocks, candidates = maximal_blocks(soup)
+    unique, signatures = dedupe_near_duplicates(blocks)
+    # The page's own blocks, before anything other pages contributed, for stable change detection
+    page_blocks = list(unique)
+    dropped = 0
+    if boilerplate is not None and url:
+        unique, dropped = boilerplate.filter(url, unique, signatures)
+    stats = {
+        "candidates": len(candidates),
+        "nested": len(candidates) - len(blocks),
+        "near_duplicates": len(blocks) - len(page_blocks),
+        "boilerplate": dropped,
+        "kept": len(unique),
+        "chars_before": sum(len(text) for text in candidates),
+        "chars_after": sum(len(text) for text in unique),
+    }
+    return unique, page_blocks, stats
+
+
+ADJECTIVES = ("a durable everyday", "a lightweight travel", "a handmade ceramic", "a refurbished")
+
+
+def fixture_page(index, products=12, site="shop.example.com"):
+    """A page shaped like a typical CMS/SPA build: wrapper divs, nav, repeated cards and a footer"""
+    nav = "".join(f'<span><a href="/{name.lower()}">{name} section of the store</a></span>'
+                  for name in ("Home", "Products", "Pricing", "About", "Contact"))
+    cards = "".join(
+        f'<div class="card"><div class="card-body"><p>Product {i}: {ADJECTIVES[i % len(ADJECTIVES)]} item number {i} '
+        f'with free shipping and a {30 + i % 60}-day return window.</p><span class="badge">Bestseller in category {i % 3}</span></div></div>'
+        for i in range(index * products, (index + 1) * products)
+    )
+    promo = '<div class="promo"><p>Sign up for our newsletter and get 10% off your first order today.</p></div>'
+    article = (f"<p>Page {index} overview. " + "Our team tests every product by hand before it ships. " * 4
+               + f"<span>Updated for season {index}.</span></p>")
+    footer = ('<div class="footer"><div><p>Copyright 2026 Example Shop Ltd. All rights reserved worldwide.</p>'
+              '<p>Privacy policy, terms of service and cookie settings for this site.</p></div></div>')
+    return (f"<html><head><title>Page {index} - {site}</title></head><body><div id='app'><div class='layout'>"
+            f"<div class='nav'>{nav}</div><div class='main'><div class='content'>{article}{promo}{cards}{promo}</div></div>"
+            f"{footer}</div></div></body></html>")
+
+
+def benchmark(pages=10, runs=5):
+    """Blocks and characters kept, and parse plus extraction milliseconds per page, old extraction vs deduplicated"""
+    import time
+    from bs4 import BeautifulSoup
+
+    htmls = [fixture_page(i) for i in range(pages)]
+
+    def old(html):
+        soup = BeautifulSoup(html, "html.parser")
+        return [p.get_text().strip() for p in soup.find_all(["p", "div", "span"]) if p.get_text().strip() and len(p.get_text().strip()) > 20]
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        old_blocks = [old(html) for html in htmls]
+    old_ms = (time.perf_counter() - started) / (runs * pages) * 1000
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        boilerplate = BoilerplateFilter()
+        results = [extract_blocks(BeautifulSoup(html, "html.parser"), f"https://shop.example.com/page/{i}", boilerplate)
+                   for i, html in enumerate(htmls)]
+    new_ms = (time.perf_counter() - started) / (runs * pages) * 1000
+
+    old_count = sum(len(blocks) for blocks in old_blocks)
+    old_chars = sum(len(text) for blocks in old_blocks for text in blocks)
+    stats = [result[2] for result in results]
+    new_count = sum(s["kept"] for s in stats)
+    new_chars = sum(s["chars_after"] for s in stats)
+    return {
+        "pages": pages,
+        "blocks_before": old_count,
+        "blocks_after": new_count,
+        "nested_removed": sum(s["nested"] for s in stats),
+        "near_duplicates_removed": sum(s["near_duplicates"] for s in stats),
+        "boilerplate_removed": sum(s["boilerplate"] for s in stats),
+        "chars_before": old_chars,
+        "chars_after": new_chars,
+        "char_reduction": round(old_chars / new_chars, 1) if new_chars else None,
+        "extract_ms_before": round(old_ms, 2),
+        "extract_ms_after": round(new_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    print(f"🧹 Block dedup on fixtures: {benchmark()}")
@@ -1,6 +1,11 @@
 import os
 import json
+import time
+from string import Template
 from datetime import datetime
+from report_sink import get_report_sink
+
+_REPORT_ENCODER = json.JSONEncoder(indent=2)
 
 def create_test_report(test_name, url, success, messages, error=None):
     report = {
@@ -14,12 +19,17 @@ def create_test_report(test_name, url, success, messages, error=None):
     return report
 
 def save_test_report(report, filename=None):
+    """Append the report to the shared JSONL sink, or write a standalone JSON file when filename is given"""
     if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"test_report_{timestamp}.json"
+        sink = get_report_sink()
+        sink.append(report)
+        # The sink buffers for batch writers; a saved report should be on disk when we say so
+        sink.flush()
+        print(f"Test report appended to: {sink.path}")
+        return sink.path
     
     with open(filename, 'w') as f:
-        json.dump(report, f, indent=2)
+        f.writelines(_REPORT_ENCODER.iterencode(report))
     
     print(f"Test report saved to: {filename}")
     return filename
@@ -49,44 +59,175 @@ def validate_environment():
     print("✅ Environment validation passed")
     return True
 
+class ScenarioTemplate:
+    """A test scenario written once as $placeholder steps and compiled when defined.
+
+    Compiling splits the text into literal and placeholder segments so rendering
+    is a single join, and checks that every placeholder has a value or default.
+    """
+    
+    def __init__(self, name, title, steps, defaults=None, required=("url",)):
+        self.name = name
+        self.title = title
+        self.defaults = dict(defaults or {})
+        self.required = tuple(required)
+        self.steps = tuple(steps)
+        self.text = "\n".join([f"{title}:"] + [f"{i}. {step}" for i, step in enumerate(self.steps, 1)])
+        self.segments = self._compile(self.text)
+        self.variables = {value for is_var, value in self.segments if is_var}
+        
+        missing = self.variables - set(self.defaults) - set(self.required)
+        if missing:
+            raise ValueError(f"Scenario '{name}' has no value for: {', '.join(sorted(missing))}")
+        unused = (set(self.defaults) | set(self.required)) - self.variables
+        if unused:
+            raise ValueError(f"Scenario '{name}' declares unused variables: {', '.join(sorted(unused))}")
+    
+    @staticmethod
+    def _compile(text):
+        segments, position = [], 0
+        for match in Template.pattern.finditer(text):
+            if match.start() > position:
+                segments.append((False, text[position:match.start()]))
+            if match.group("escaped") is not None:
+                segments.append((False, "$"))
+            elif match.group("invalid") is not None:
+                raise ValueError(f"Invalid placeholder at position {match.start()}: {text[match.start():match.start() + 10]!r}")
+            else:
+                segments.append((True, match.group("named") or match.group("braced")))
+            position = match.end()
+        if position < len(text):
+            segments.append((False, text[position:]))
+        return tuple(segments)
+    
+    def render(self, **values):
+        unknown = set(values) - self.variables
+        if unknown:
+            raise ValueError(f"Scenario '{self.name}' has no variables: {', '.join(sorted(unknown))}")
+        missing = [name for name in self.required if name not in values]
+        if missing:
+            raise ValueError(f"Scenario '{self.name}' needs: {', '.join(missing)}")
+        merged = {**self.defaults, **values}
+        return "".join(merged[value] if is_var else value for is_var, value in self.segments)
+    
+    def render_steps(self, **values):
+        return self.render(**values).split("\n")[1:]
+    
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "title": self.title,
+            "steps": list(self.steps),
+            "defaults": self.defaults,
+            "required": list(self.required)
+        }
+
+class TemplateRegistry:
+    """Named, compiled scenarios shared by the CLI testers and the backend"""
+    
+    def __init__(self):
+        self._templates = {}
+    
+    def register(self, template):
+        if template.name in self._templates:
+            raise ValueError(f"Scenario '{template.name}' is already registered")
+        self._templates[template.name] = template
+        return template
+    
+    def get(self, name):
+        if name not in self._templates:
+            raise KeyError(f"Unknown scenario '{name}'. Available: {', '.join(self.names())}")
+        return self._templates[name]
+    
+    def names(self):
+        return sorted(self._templates)
+    
+    def __contains__(self, name):
+        return name in self._templates
+    
+    def render(self, name, **values):
+        return self.get(name).render(**values)
+    
+    def render_many(self, name, urls, **values):
+        template = self.get(name)
+        return [template.render(url=url, **values) for url in urls]
+
+SCENARIOS = TemplateRegistry()
+
+SCENARIOS.register(ScenarioTemplate(
+    "login_test", "Perform a login test",
+    [
+        "Open Firefox browser",
+        "Navigate to $url",
+        "Look for login form fields (username/email and password)",
+        "Fill username field with '$username'",
+        "Fill password field with '$password'",
+        "Click the login/submit button",
+        "Wait for page to load",
+        "Take a screenshot",
+        "Check if login was successful (look for dashboard, welcome message, or error)",
+        "Report the result"
+    ],
+    defaults={"username": "testuser", "password": "testpass"}
+))
+
+SCENARIOS.register(ScenarioTemplate(
+    "navigation_test", "Perform a navigation test",
+    [
+        "Open Firefox browser",
+        "Navigate to $url",
+        "Take a screenshot of the initial page",
+        "Check if the page loads correctly",
+        "Look for navigation elements (menu, links)",
+        "Click on a main navigation link if available",
+        "Take another screenshot",
+        "Verify the navigation worked",
+        "Report the result"
+    ]
+))
+
+SCENARIOS.register(ScenarioTemplate(
+    "form_test", "Perform a form submission test",
+    [
+        "Open Firefox browser",
+        "Navigate to $url",
+        "Look for any form on the page",
+        "Fill out form fields with $form_data",
+        "Submit the form",
+        "Take a screenshot of the result",
+        "Check if submission was successful",
+        "Report the result"
+    ],
+    defaults={"form_data": "test data"}
+))
+
+# Rendered once at import; templates are immutable so the prompts never change
+_COMMON_TEST_PROMPTS = {name: SCENARIOS.render(name, url="the provided URL") for name in SCENARIOS.names()}
+
 def get_common_test_prompts():
+    return dict(_COMMON_TEST_PROMPTS)
+
+def benchmark_templates(instances=100000):
+    """Scenario renders per second, compiled templates vs string.Template substitution"""
+    urls = [f"https://site{i % 500}.example.com/page/{i}" for i in range(instances)]
+    template = SCENARIOS.get("login_test")
+    reference = Template(template.text)
+    
+    started = time.perf_counter()
+    for url in urls:
+        reference.substitute(template.defaults, url=url)
+    baseline = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    SCENARIOS.render_many("login_test", urls)
+    compiled = time.perf_counter() - started
+    
     return {
-        "login_test": """
-        Perform a login test:
-        1. Open Firefox browser
-        2. Navigate to the provided URL
-        3. Look for login form fields (username/email and password)
-        4. Fill username field with 'testuser'
-        5. Fill password field with 'testpass'
-        6. Click the login/submit button
-        7. Wait for page to load
-        8. Take a screenshot
-        9. Check if login was successful (look for dashboard, welcome message, or error)
-        10. Report the result
-        """,
-        
-        "navigation_test": """
-        Perform a navigation test:
-        1. Open Firefox browser
-        2. Navigate to the provided URL
-        3. Take a screenshot of the initial page
-        4. Check if the page loads correctly
-        5. Look for navigation elements (menu, links)
-        6. Click on a main navigation link if available
-        7. Take another screenshot
-        8. Verify the navigation worked
-        9. Report the result
-        """,
-        
-        "form_test": """
-        Perform a form submission test:
-        1. Open Firefox browser
-        2. Navigate to the provided URL
-        3. Look for any form on the page
-        4. Fill out form fields with test data
-        5. Submit the form
-        6. Take a screenshot of the result
-        7. Check if submission was successful
-        8. Report the result
-        """
-    } 
\ No newline at end of file
+        "instances": instances,
+        "compiled_per_s": round(instances / compiled),
+        "string_template_per_s": round(instances / baseline),
+        "speedup": round(baseline / compiled, 2)
+    }
+
+if __name__ == "__main__":
+    print(f"🧩 Scenario template rendering: {benchmark_templates()}")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import hashlib
+import numpy as np
+from click_targets import BROWSER_CHROME_HEIGHT
+
+BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", "visual_baselines")
+TILE_SIZE = 32
+# Per-pixel channel difference below this is treated as rendering noise
+PIXEL_TOLERANCE = 24
+# Share of changed pixels above which a frame counts as a regression
+REGRESSION_THRESHOLD = 0.01
+
+
+def as_frame(image):
+    """PIL image or array -> HxWx3 uint8 array"""
+    frame = np.asarray(image)
+    if frame.ndim == 2:
+        frame = np.stack([frame] * 3, axis=2)
+    return np.ascontiguousarray(frame[..., :3], dtype=np.uint8)
+
+
+def _tiles(frame, tile):
+    height, width = frame.shape[:2]
+    pad_y, pad_x = (-height) % tile, (-width) % tile
+    if pad_y or pad_x:
+        frame = np.pad(frame, ((0, pad_y), (0, pad_x), (0, 0)))
+    rows, cols = frame.shape[0] // tile, frame.shape[1] // tile
+    return frame.reshape(rows, tile, cols, tile * 3)
+
+
+def tile_hashes(frame, tile=TILE_SIZE):
+    """One 64-bit hash per tile, from wrapping integer sums of each tile row's bytes"""
+    tiles = _tiles(frame, tile)
+    rows, _, cols, row_bytes = tiles.shape
+    words = np.ascontiguousarray(tiles).view(np.uint64).reshape(rows, tile, cols, row_bytes // 8)
+    weights = np.random.default_rng(row_bytes).integers(1, 2 ** 63, size=(tile, 1, row_bytes // 8), dtype=np.uint64) | np.uint64(1)
+    return (words * weights).sum(axis=(1, 3))
+
+
+def page_area(frame, top_margin=BROWSER_CHROME_HEIGHT):
+    """The page below the browser chrome; the tab strip, URL bar and clock change on every run"""
+    return as_frame(frame)[top_margin:]
+
+
+def is_blank(frame, top_margin=0, min_std=2.0):
+    """True when the page area is a single flat colour"""
+    return float(frame[top_margin:].std()) < min_std
+
+
+def compare_frames(current, baseline, baseline_hashes=None, tile=TILE_SIZE,
+                   pixel_tolerance=PIXEL_TOLERANCE, threshold=REGRESSION_THRESHOLD):
+    """Compare two frames of the same size.
+
+    Tiles whose hashes match are skipped; only differing tiles get a
+    pixel-level diff. Returns the share of changed pixels as the regression
+    score and a per-tile heatmap of changed-pixel shares.
+    """
+    current, baseline = as_frame(current), as_frame(baseline)
+    if current.shape != baseline.shape:
+        return {
+            "score": 1.0, "regression": True, "changed_tiles": None, "total_tiles": None,
+            "heatmap": None, "reason": f"size changed from {baseline.shape[1]}x{baseline.shape[0]} to {current.shape[1]}x{current.shape[0]}"
+        }
+
+    if baseline_hashes is None:
+        baseline_hashes = tile_hashes(baseline, tile)
+    changed = tile_hashes(current, tile) != baseline_hashes
+    heatmap = np.zeros(changed.shape, dtype=np.float32)
+
+    ty, tx = np.nonzero(changed)
+    if len(ty):
+        a = _tiles(current, tile)[ty, :, tx]
+        b = _tiles(baseline, tile)[ty, :, tx]
+        # |a - b| without widening: max - min stays within uint8
+        delta = np.maximum(a, b)
+        delta -= np.minimum(a, b)
+        over = (delta > pixel_tolerance).reshape(len(ty), tile, tile, 3)
+        # OR the channels and count in integers; any()/mean() over small axes are several times slower
+        differs = over[..., 0] | over[..., 1] | over[..., 2]
+        heatmap[ty, tx] = differs.sum(axis=(1, 2), dtype=np.int32) / (tile * tile)
+
+    # Padding pixels never differ, so counting over padded tiles is exact
+    changed_pixels = float(heatmap.sum()) * tile * tile
+    score = changed_pixels / (current.shape[0] * current.shape[1])
+    return {
+        "score": round(score, 5),
+        "regression": score > threshold,
+        "changed_tiles": int(changed.sum()),
+        "total_tiles": int(changed.size),
+        "heatmap": heatmap,
+        "reason": None,
+    }
+
+
+def heatmap_image(frame, heatmap, tile=TILE_SIZE, alpha=0.6):
+    """Frame dimmed to grey with changed tiles tinted red by how much they changed"""
+    frame = as_frame(frame)
+    height, width = frame.shape[:2]
+    intensity = np.kron(heatmap, np.ones((tile, tile), dtype=np.float32))[:height, :width, None]
+    grey = frame.mean(axis=2, keepdims=True) * 0.5 + 64
+    red = np.array([255, 0, 0], dtype=np.float32)
+    blend = np.minimum(1.0, intensity * 4) * alpha
+    return (grey * (1 - blend) + red * blend).astype(np.uint8)
+
+
+class BaselineStore:
+    """Baseline frames per URL and viewport, with their tile hashes precomputed"""
+
+    def __init__(self, root=BASELINE_DIR, tile=TILE_SIZE):
+        self.root = root
+        self.tile = tile
+        self._cache = {}
+
+    def key(self, url, viewport):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        return f"{digest}_{viewport[0]}x{viewport[1]}"
+
+    def _path(self, url, viewport, suffix):
+        return os.path.join(self.root, self.key(url, viewport) + suffix)
+
+    def save(self, url, image):
+        frame = as_frame(image)
+        viewport = (frame.shape[1], frame.shape[0])
+        os.makedirs(self.root, exist_ok=True)
+        hashes = tile_hashes(frame, self.tile)
+        np.savez(self._path(url, viewport, ".npz"), frame=frame, hashes=hashes, tile=self.tile)
+        with open(self._path(url, viewport, ".json"), "w") as f:
+            json.dump({"url": url, "viewport": viewport, "updated_at": time.time()}, f)
+        self._cache[self.key(url, viewport)] = (frame, hashes)
+        return self._path(url, viewport, ".npz")
+
+    def load(self, url, viewport):
+        key = self.key(url, viewport)
+        if key not in self._cache:
+            path = self._path(url, viewport, ".npz")
+            if not os.path.exists(path):
+                return None
+            with np.load(path) as data:
+                hashes = data["hashes"] if int(data["tile"]) == self.tile else tile_hashes(data["frame"], self.tile)
+                self._cache[key] = (data["frame"], hashes)
+        return self._cache[key]
+
+    def compare(self, url, image, **options):
+        """compare_frames against the stored baseline, or None if there is none yet"""
+        frame = as_frame(image)
+        baseline = self.load(url, (frame.shape[1], frame.shape[0]))
+        if baseline is None:
+            return None
+        return compare_frames(frame, baseline[0], baseline_hashes=baseline[1], tile=self.tile, **options)
+
+    def entries(self):
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self.root)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.root, name)) as f:
+                    entries.append(json.load(f))
+        return entries
+
+
+def check_screenshot(store, url, screenshot, update_baseline=False, top_margin=BROWSER_CHROME_HEIGHT):
+    """Blank-page check plus comparison with the URL's baseline -> (status, details, summary).
+
+    Only the page area below `top_margin` is compared and stored. Saves it as the
+    baseline when asked to or when there is none yet, and writes a heatmap next
+    to the baselines when a regression is found.
+    """
+    frame = page_area(screenshot, top_margin)
+    if is_blank(frame):
+        return "FAIL", "Page area is blank", {"blank": True}
+
+    result = None if update_baseline else store.compare(url, frame)
+    if result is None:
+        store.save(url, frame)
+        return "PASS", f"Baseline saved ({frame.shape[1]}x{frame.shape[0]})", {"baseline_updated": True}
+
+    summary = {k: v for k, v in result.items() if k != "heatmap"}
+    if not result["regression"]:
+        return "PASS", f"{result['score']:.2%} of pixels changed", summary
+
+    details = result["reason"] or f"{result['score']:.2%} of pixels changed in {result['changed_tiles']}/{result['total_tiles']} tiles"
+    if result["heatmap"] is not None:
+        from PIL import Image
+        heatmap_dir = os.path.join(store.root, "heatmaps")
+        os.makedirs(heatmap_dir, exist_ok=True)
+        path = os.path.join(heatmap_dir, f"{store.key(url, (frame.shape[1], frame.shape[0]))}_{time.strftime('%Y%m%d_%H%M%S')}.png")
+        Image.fromarray(heatmap_image(frame, result["heatmap"])).save(path)
+        summary["heatmap_path"] = path
+        details += f", heatmap: {path}"
+    return "FAIL", details, summary
+
+
+def benchmark(frames=50, size=(768, 1024)):
+    """Milliseconds per 1024x768 comparison against a stored baseline"""
+    import tempfile
+    from click_targets import make_synthetic_screenshot
+
+    store = BaselineStore(root=tempfile.mkdtemp(prefix="visual_baselines_"))
+    baseline, _ = make_synthetic_screenshot(0, size=size)
+    store.save("https://benchmark.local", baseline)
+
+    rng = np.random.default_rng(1)
+    cases = []
+    for i in range(frames):
+        frame = baseline.copy()
+        if i % 2:
+            # A moved or restyled element somewhere on the page
+            y, x = int(rng.integers(100, size[0] - 80)), int(rng.integers(0, size[1] - 200))
+            frame[y:y + 60, x:x + 180] = rng.integers(0, 255, size=3)
+        cases.append(frame)
+
+    started = time.perf_counter()
+    results = [store.compare("https://benchmark.local", frame) for frame in cases]
+    elapsed = time.perf_counter() - started
+
+    # Worst case: every tile differs, e.g. the page rendered blank
+    blank = np.full_like(baseline, 255)
+    started = time.perf_counter()
+    for _ in range(10):
+        store.compare("https://benchmark.local", blank)
+    worst = (time.perf_counter() - started) / 10
+
+    return {
+        "frames": frames,
+        "ms_per_compare": round(elapsed / frames * 1000, 2),
+        "ms_all_tiles_changed": round(worst * 1000, 2),
+        "identical_flagged": sum(r["regression"] for r in results[0::2]),
+        "changed_flagged": sum(r["regression"] for r in results[1::2]),
+    }
+
+
+if __name__ == "__main__":
+    from PIL import Image
+
+    usage = ("Usage: python3 visual_regression.py update <url> <image.png>\n"
+             "       python3 visual_regression.py compare <url> <image.png> [heatmap.png]\n"
+             "       python3 visual_regression.py list | benchmark")
+    command = sys.argv[1] if len(sys.argv) > 1 else "benchmark"
+    store = BaselineStore()
+
+    if command == "update" and len(sys.argv) >= 4:
+        path = store.save(sys.argv[2], page_area(Image.open(sys.argv[3]).convert("RGB")))
+        print(f"✅ Baseline updated for {sys.argv[2]}: {path}")
+    elif command == "compare" and len(sys.argv) >= 4:
+        frame = page_area(Image.open(sys.argv[3]).convert("RGB"))
+        result = store.compare(sys.argv[2], frame)
+        if result is None:
+            print(f"⚠️  No baseline for {sys.argv[2]} at {frame.shape[1]}x{frame.shape[0]}")
+            sys.exit(1)
+        print(f"{'❌' if result['regression'] else '✅'} Score {result['score']:.4f} "
+              f"({result['changed_tiles']}/{result['total_tiles']} tiles changed) {result['reason'] or ''}")
+        if len(sys.argv) >= 5 and result["heatmap"] is not None:
+            Image.fromarray(heatmap_image(frame, result["heatmap"])).save(sys.argv[4])
+            print(f"🔥 Heatmap saved to {sys.argv[4]}")
+        sys.exit(1 if result["regression"] else 0)
+    elif command == "list":
+        for entry in store.entries():
+            print(f"🖼️  {entry['url']} {entry['viewport'][0]}x{entry['viewport'][1]} "
+                  f"(updated {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['updated_at']))})")
+    elif command == "benchmark":
+        print(f"🖼️  Visual comparison benchmark: {benchmark()}")
+    else:
+        print(usage)
+        sys.exit(1)
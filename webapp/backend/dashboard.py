@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+# Removed sessions are kept as tombstones, up to this many, so deltas can tell clients to drop them
+MAX_TOMBSTONES = 1000
+
+
+def summarize_session(session_id: str, session: Dict) -> Dict:
+    """Small per-session view for the dashboard; results and scraped content stay behind /test-status"""
+    report = session.get("results", {}).get("report") or {}
+    return {
+        "session_id": session_id,
+        "status": session["status"],
+        "url": session["url"],
+        "test_name": session["test_name"],
+        "client_id": session.get("client_id"),
+        "priority": session.get("priority"),
+        "completed": session.get("completed", False),
+        "output_count": len(session.get("output", [])),
+        "total_tests": report.get("total_tests"),
+        "passed": report.get("passed"),
+        "failed": report.get("failed"),
+        "error": session.get("error"),
+    }
+
+
+class DashboardSubscriber:
+    def __init__(self):
+        self.dirty: Set[str] = set()
+        self.changed = asyncio.Event()
+
+
+class Dashboard:
+    """Incrementally maintained session summaries with a version-based ETag.
+
+    Every change bumps a global version and stamps the session with it, so
+    clients can ask only for sessions changed since the version they hold.
+    The serialized full payload is cached until the next change. All methods
+    run on the event loop thread.
+
+    Versions only mean something within one API process, so the ETag and every
+    payload carry the dashboard's instance id; behind a load balancer a client
+    that lands on another process gets a full snapshot instead of a delta.
+
+    Removed sessions appear in deltas and streamed changes as tombstones,
+    {"session_id": ..., "removed": True, "version": v}. Only the latest
+    MAX_TOMBSTONES are kept; a client older than that gets a full snapshot.
+    """
+
+    def __init__(self, instance: Optional[str] = None):
+        self.instance = instance or uuid.uuid4().hex[:12]
+        self.version = 0
+        self._summaries: Dict[str, Dict] = {}
+        self._tombstones: Dict[str, Dict] = {}
+        # Deltas since an older version could miss a pruned tombstone
+        self._oldest_delta = 0
+        self._payload: Optional[bytes] = None
+        self._subscribers: List[DashboardSubscriber] = []
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.instance}-{self.version}"'
+
+    def update(self, session_id: str, summary: Dict) -> bool:
+        previous = self._summaries.get(session_id)
+        if previous and {k: v for k, v in previous.items() if k not in ("version", "updated_at")} == summary:
+            return False
+
+        self.version += 1
+        self._summaries[session_id] = dict(summary, version=self.version, updated_at=time.time())
+        self._tombstones.pop(session_id, None)
+        self._changed(session_id)
+        return True
+
+    def remove(self, session_id: str):
+        if self._summaries.pop(session_id, None) is None:
+            return
+        self.version += 1
+        self._tombstones[session_id] = {"session_id": session_id, "removed": True, "version": self.version}
+        while len(self._tombstones) > MAX_TOMBSTONES:
+            oldest = next(iter(self._tombstones))
+            self._oldest_delta = self._tombstones.pop(oldest)["version"]
+        self._changed(session_id)
+
+    def _changed(self, session_id: str):
+        self._payload = None
+        for subscriber in self._subscribers:
+            subscriber.dirty.add(session_id)
+            subscriber.changed.set()
+
+    def _current(self, session_id: str) -> Optional[Dict]:
+        return self._summaries.get(session_id) or self._tombstones.get(session_id)
+
+    def sessions_since(self, version: int = 0) -> List[Dict]:
+        """Summaries and tombstones changed after `version`"""
+        changed = [s for s in self._summaries.values() if s["version"] > version]
+        return changed + [t for t in self._tombstones.values() if t["version"] > version]
+
+    def payload(self) -> Tuple[bytes, str]:
+        if self._payload is None:
+            self._payload = json.dumps({
+                "instance": self.instance,
+                "version": self.version,
+                "sessions": list(self._summaries.values())
+            }).encode("utf-8")
+        return self._payload, self.etag
+
+    def delta_payload(self, version: int, instance: Optional[str] = None) -> bytes:
+        """Sessions changed after `version` of this instance; a version from another instance gets the full payload"""
+        if instance != self.instance or version < self._oldest_delta:
+            return self.payload()[0]
+        return json.dumps({
+            "instance": self.instance,
+            "version": self.version,
+            "since": version,
+            "sessions": self.sessions_since(version)
+        }).encode("utf-8")
+
+    def changes_payload(self, sessions: List[Dict]) -> Dict:
+        return {"instance": self.instance, "version": self.version, "sessions": sessions}
+
+    def subscribe(self) -> DashboardSubscriber:
+        subscriber = DashboardSubscriber()
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: DashboardSubscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    async def changes(self, subscriber: DashboardSubscriber, heartbeat: float = 15.0):
+        """Yield batches of changed summaries; an empty batch is a heartbeat.
+
+        Changes that arrive while the client is busy are coalesced so a slow
+        client only ever receives the latest summary (or tombstone) per session.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(subscriber.changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield []
+                continue
+            subscriber.changed.clear()
+            dirty, subscriber.dirty = subscriber.dirty, set()
+            yield [self._current(sid) for sid in dirty if self._current(sid)]
@@ -0,0 +1,215 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+PRIORITY_CLASSES = ("high", "normal", "low")
+
+
+def parse_client_weights(spec: str) -> Dict[str, int]:
+    """Parse "client=weight,client=weight" into a dict"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        client_id, _, weight = item.partition("=")
+        weights[client_id.strip()] = max(1, int(weight or 1))
+    return weights
+
+
+class Job:
+    def __init__(self, job_id: str, client_id: str, priority: str, run: Callable[[], Awaitable]):
+        self.job_id = job_id
+        self.client_id = client_id
+        self.priority = priority
+        self.run = run
+        self.enqueued_at = time.time()
+        self.started_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        now = time.time()
+        return {
+            "job_id": self.job_id,
+            "client_id": self.client_id,
+            "priority": self.priority,
+            "enqueued_at": self.enqueued_at,
+            "started_at": self.started_at,
+            "waited_s": round((self.started_at or now) - self.enqueued_at, 3),
+        }
+
+
+class JobScheduler:
+    """Priority classes with weighted round robin between clients and a global concurrency cap.
+
+    Higher priority classes are always served first. Within a class each client
+    gets up to `weight` consecutive starts per turn, so one client submitting
+    hundreds of URLs cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int, client_weights: Optional[Dict[str, int]] = None,
+                 default_weight: int = 1, wait_samples: int = 1000):
+        self.max_concurrency = max(1, max_concurrency)
+        self.client_weights = client_weights or {}
+        self.default_weight = default_weight
+        self._queues: Dict[str, Dict[str, Deque[Job]]] = {p: {} for p in PRIORITY_CLASSES}
+        self._rotation: Dict[str, Deque[str]] = {p: deque() for p in PRIORITY_CLASSES}
+        self._credits: Dict[str, int] = {p: 0 for p in PRIORITY_CLASSES}
+        self._pending: Dict[str, Job] = {}
+        self._running: Dict[str, Job] = {}
+        # The event loop only keeps weak references to tasks; these keep running jobs alive
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self._wait_times: Deque[float] = deque(maxlen=wait_samples)
+        self._counters = {"submitted": 0, "started": 0, "completed": 0, "cancelled": 0}
+
+    def set_max_concurrency(self, max_concurrency: int):
+        """Resize the cap, e.g. as workers join or leave; queued jobs start if there is room"""
+        self.max_concurrency = max(1, max_concurrency)
+        self._dispatch()
+
+    def weight(self, client_id: str) -> int:
+        return self.client_weights.get(client_id, self.default_weight)
+
+    def submit(self, job_id: str, client_id: str, priority: str, run: Callable[[], Awaitable]) -> Job:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        job = Job(job_id, client_id, priority, run)
+        client_queues = self._queues[priority]
+        if client_id not in client_queues:
+            client_queues[client_id] = deque()
+            self._rotation[priority].append(client_id)
+        client_queues[client_id].append(job)
+        self._pending[job_id] = job
+        self._counters["submitted"] += 1
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a job that has not started yet"""
+        job = self._pending.pop(job_id, None)
+        if not job:
+            return False
+        client_queue = self._queues[job.priority][job.client_id]
+        client_queue.remove(job)
+        if not client_queue:
+            self._drop_client(job.priority, job.client_id)
+        self._counters["cancelled"] += 1
+        return True
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position in the order jobs would start right now"""
+        if job_id not in self._pending:
+            return None
+        for index, job in enumerate(self._preview_order(), start=1):
+            if job.job_id == job_id:
+                return index
+        return None
+
+    def _drop_client(self, priority: str, client_id: str):
+        del self._queues[priority][client_id]
+        rotation = self._rotation[priority]
+        if rotation and rotation[0] == client_id:
+            self._credits[priority] = 0
+        rotation.remove(client_id)
+
+    def _next_job(self) -> Optional[Job]:
+        for priority in PRIORITY_CLASSES:
+            rotation = self._rotation[priority]
+            if not rotation:
+                continue
+
+            client_id = rotation[0]
+            if self._credits[priority] <= 0:
+                self._credits[priority] = self.weight(client_id)
+
+            client_queue = self._queues[priority][client_id]
+            job = client_queue.popleft()
+            self._credits[priority] -= 1
+
+            if not client_queue:
+                self._drop_client(priority, client_id)
+            elif self._credits[priority] <= 0:
+                rotation.rotate(-1)
+            return job
+        return None
+
+    def _preview_order(self) -> List[Job]:
+        # Simulate _next_job on copies without touching the live queues
+        order = []
+        for priority in PRIORITY_CLASSES:
+            queues = {client: list(jobs) for client, jobs in self._queues[priority].items()}
+            rotation = deque(self._rotation[priority])
+            credits = self._credits[priority]
+            while rotation:
+                client_id = rotation[0]
+                if credits <= 0:
+                    credits = self.weight(client_id)
+                order.append(queues[client_id].pop(0))
+                credits -= 1
+                if not queues[client_id]:
+                    rotation.popleft()
+                    credits = 0
+                elif credits <= 0:
+                    rotation.rotate(-1)
+        return order
+
+    def _dispatch(self):
+        while not self._closed and len(self._running) < self.max_concurrency:
+            job = self._next_job()
+            if not job:
+                return
+            del self._pending[job.job_id]
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.enqueued_at)
+            self._running[job.job_id] = job
+            self._counters["started"] += 1
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Job):
+        try:
+            await job.run()
+        finally:
+            self._running.pop(job.job_id, None)
+            self._counters["completed"] += 1
+            self._dispatch()
+
+    async def shutdown(self):
+        """Drop queued jobs, cancel running ones and wait for them to finish"""
+        self._closed = True
+        for job_id in list(self._pending):
+            self.cancel(job_id)
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self) -> Dict:
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p / 100 * len(waits)))], 3)
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": len(self._running),
+            "queue_depth": len(self._pending),
+            "queue_depth_by_priority": {
+                p: sum(len(q) for q in self._queues[p].values()) for p in PRIORITY_CLASSES
+            },
+            "queue_depth_by_client": {
+                client: sum(len(self._queues[p].get(client, ())) for p in PRIORITY_CLASSES)
+                for client in {job.client_id for job in self._pending.values()}
+            },
+            "wait_time_s": {"p50": percentile(50), "p95": percentile(95), "max": waits[-1] if waits else None},
+            **self._counters,
+        }
+
+    def snapshot(self) -> Dict:
+        return {
+            "pending": [job.to_dict() for job in self._preview_order()],
+            "running": [job.to_dict() for job in self._running.values()],
+            "metrics": self.metrics(),
+        }
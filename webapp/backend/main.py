@@ -1,12 +1,14 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import subprocess
 import asyncio
 import json
 import re
 import uuid
+import time
 from typing import Dict, List, Optional
 import os
 import sys
@@ -14,7 +16,21 @@ from pathlib import Path
 
 # Add parent directory to path to import the tester
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from intelligent_website_tester import IntelligentWebsiteTester
+from run_history import get_history_store
+from site_metrics import tracked_metrics
+from resilience import get_resilience_metrics
+from run_planner import build_plan
+from job_scheduler import JobScheduler, PRIORITY_CLASSES, parse_client_weights
+from utils import SCENARIOS
+from dashboard import Dashboard, summarize_session
+from payloads import PayloadCache, canonical_fields, parse_fields, select_fields, json_bytes, json_response
+from bus import get_bus, InProcessBus, EVENTS_CHANNEL, CONTROL_CHANNEL
+from worker import TesterWorker, WORKER_HEARTBEAT_INTERVAL
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 app = FastAPI(
     title="Intelligent Website Tester API",
@@ -31,12 +47,162 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store active test sessions
+# Session payloads carry scraped page content and compress well; brotli when
+# available (it also falls back to gzip for clients that do not accept br)
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1000"))
+# Server-sent event routes; EventSource also announces itself with Accept: text/event-stream
+EVENT_STREAM_PATHS = {"/dashboard/stream"}
+
+class CompressionExceptEventStreams:
+    """Compress responses except event streams, which the compressor would hold back until the stream ends"""
+    
+    def __init__(self, app, compressor, minimum_size=RESPONSE_COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.compressed = compressor(app, minimum_size=minimum_size)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not is_event_stream_request(scope):
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+def is_event_stream_request(scope) -> bool:
+    if scope["path"] in EVENT_STREAM_PATHS:
+        return True
+    accept = dict(scope.get("headers") or []).get(b"accept", b"")
+    return b"text/event-stream" in accept
+
+app.add_middleware(CompressionExceptEventStreams, compressor=BrotliMiddleware or GZipMiddleware)
+
+# Mirror of every session, built from worker events so any API process can serve any session
 active_sessions: Dict[str, Dict] = {}
 
+# Sessions this process dispatched, resolved when their worker reports back
+pending_runs: Dict[str, asyncio.Future] = {}
+
+# Abandoned web sessions must not hold a desktop forever
+DEFAULT_RUN_DEADLINE = float(os.getenv("RUN_DEADLINE_SECONDS", "900"))
+# Extra time a worker gets past the deadline to report back before its job is written off
+WORKER_REPORT_GRACE = float(os.getenv("WORKER_REPORT_GRACE_SECONDS", "60"))
+
+# Tests run on tester workers connected through the job bus: in this process
+# when JOB_BUS_URL is empty, otherwise in separate worker.py processes
+bus = get_bus()
+MAX_CONCURRENT_DESKTOPS = int(os.getenv("MAX_CONCURRENT_DESKTOPS", "3"))
+LOCAL_WORKERS = int(os.getenv("LOCAL_WORKERS", str(MAX_CONCURRENT_DESKTOPS if isinstance(bus, InProcessBus) else 0)))
+local_worker: Optional[TesterWorker] = None
+# worker_id -> {"slots", "completed", "last_seen"}
+workers: Dict[str, Dict] = {}
+
+# Every running test holds one Orgo desktop, so concurrency is capped at desktop
+# capacity; the cap follows the slots of live workers, up to MAX_CONCURRENT_DESKTOPS
+scheduler = JobScheduler(
+    max_concurrency=MAX_CONCURRENT_DESKTOPS,
+    client_weights=parse_client_weights(os.getenv("CLIENT_WEIGHTS", ""))
+)
+
+# Completed sessions never change, so their responses are serialized once per field selection
+payload_cache = PayloadCache(max_entries=int(os.getenv("PAYLOAD_CACHE_ENTRIES", "512")))
+# Completed sessions are dropped from memory (and the payload cache) this long after finishing
+SESSION_TTL = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+STATUS_FIELDS = ("session_id", "status", "url", "test_name", "scenario", "scenario_steps", "completed",
+                 "output_count", "cancel_latency_s", "results")
+PARSED_REPORT_FIELDS = ("session_id", "structured_data", "test_results", "scraped_content", "report")
+
+# Per-session summaries for /dashboard, updated whenever a session changes
+dashboard = Dashboard()
+
+def sync_dashboard(session_id: str):
+    if session_id in active_sessions:
+        dashboard.update(session_id, summarize_session(session_id, active_sessions[session_id]))
+
+# Completed runs are written to the shared history store in batches
+history_store = get_history_store()
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "5"))
+
+async def flush_history_periodically():
+    while True:
+        await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+        await asyncio.get_running_loop().run_in_executor(None, history_store.flush)
+
+@app.on_event("startup")
+async def start_history_flusher():
+    if history_store:
+        asyncio.create_task(flush_history_periodically())
+
+@app.on_event("startup")
+async def connect_to_workers():
+    global local_worker
+    loop = asyncio.get_running_loop()
+    # Bus callbacks arrive on bus threads; session state is only touched on the event loop
+    bus.subscribe(EVENTS_CHANNEL, lambda event: loop.call_soon_threadsafe(apply_worker_event, event))
+    
+    # Sessions other API processes finished before this one started
+    for session_id, snapshot in (await loop.run_in_executor(None, bus.load_sessions)).items():
+        if session_id not in active_sessions:
+            active_sessions[session_id] = snapshot
+            sync_dashboard(session_id)
+    
+    if LOCAL_WORKERS:
+        local_worker = TesterWorker(bus, LOCAL_WORKERS, worker_id=f"api-{os.getpid()}")
+        local_worker.start()
+    asyncio.create_task(expire_workers_periodically())
+    asyncio.create_task(expire_sessions_periodically())
+
+@app.on_event("shutdown")
+async def flush_history_on_shutdown():
+    if history_store:
+        history_store.flush()
+
+@app.on_event("shutdown")
+async def stop_scheduled_jobs():
+    await scheduler.shutdown()
+
+@app.on_event("shutdown")
+async def stop_local_worker():
+    if local_worker:
+        local_worker.stop()
+
+def record_session_history(session_id: str, session: Dict, started_at: float):
+    if not history_store:
+        return
+    results = session.get("results", {})
+    performance = results.get("performance")
+    try:
+        history_store.record_run(
+            session["url"], session["status"] if session["status"] != "completed" else "passed",
+            test_name=session["test_name"],
+            tester="IntelligentWebsiteTester",
+            run_id=session_id,
+            timestamp=started_at,
+            duration_s=time.time() - started_at,
+            test_results=results.get("test_results", []),
+            stage_timings=results.get("stage_timings", {}),
+            site_metrics=tracked_metrics(performance) if performance else None,
+            fingerprint=results.get("fingerprint"),
+            report=results.get("report")
+        )
+    except Exception as e:
+        print(f"⚠️  Warning: Could not record run history: {e}")
+
 class TestRequest(BaseModel):
     url: str
     test_name: str = "Web Test"
+    deadline_seconds: Optional[float] = None
+    priority: str = "normal"
+    client_id: Optional[str] = None
+    scenario: Optional[str] = None
+    scenario_vars: Dict[str, str] = {}
+    # Optional checks to leave out, e.g. as chosen by a run plan: "links", "visual"
+    skip_checks: List[str] = []
+    # "desktop" scrapes the page Firefox rendered instead of fetching it again; default CONTENT_SOURCE
+    content_source: Optional[str] = None
+
+class PlanRequest(BaseModel):
+    urls: List[str]
+    budget_s: Optional[float] = None
+    lanes: Optional[int] = None
 
 class TestResponse(BaseModel):
     session_id: str
@@ -48,115 +214,327 @@ async def root():
     return {"message": "Intelligent Website Tester API", "status": "running"}
 
 @app.post("/run-test", response_model=TestResponse)
-async def run_test(request: TestRequest):
-    """Start a new website test"""
+async def run_test(request: TestRequest, http_request: Request, x_client_id: Optional[str] = Header(None)):
+    """Queue a new website test"""
+    if request.priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=422, detail=f"priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    if request.content_source not in (None, "http", "desktop"):
+        raise HTTPException(status_code=422, detail="content_source must be one of http, desktop")
+    
     session_id = str(uuid.uuid4())
+    client_id = request.client_id or x_client_id or (http_request.client.host if http_request.client else "anonymous")
     
     # Validate URL
     if not request.url.startswith(('http://', 'https://')):
         request.url = 'https://' + request.url
     
+    scenario_steps = None
+    if request.scenario:
+        if request.scenario not in SCENARIOS:
+            raise HTTPException(status_code=422, detail=f"scenario must be one of {', '.join(SCENARIOS.names())}")
+        try:
+            scenario_steps = SCENARIOS.get(request.scenario).render_steps(**{**request.scenario_vars, "url": request.url})
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
     # Initialize session
     active_sessions[session_id] = {
-        "status": "starting",
+        "status": "queued",
         "url": request.url,
         "test_name": request.test_name,
+        "client_id": client_id,
+        "priority": request.priority,
+        "scenario": request.scenario,
+        "scenario_steps": scenario_steps,
         "output": [],
         "results": {},
         "completed": False
     }
+    sync_dashboard(session_id)
+    # Let other API processes mirror the session too
+    bus.publish(EVENTS_CHANNEL, {"type": "created", "session_id": session_id, "session": active_sessions[session_id]})
     
-    # Start test in background
-    asyncio.create_task(run_test_background(session_id, request.url, request.test_name))
+    # The scheduler starts the test once a desktop slot is free and it is this client's turn
+    job_spec = {
+        "session_id": session_id,
+        "url": request.url,
+        "test_name": request.test_name,
+        "deadline_seconds": request.deadline_seconds or DEFAULT_RUN_DEADLINE,
+        "skip_checks": request.skip_checks,
+        "content_source": request.content_source,
+        "scenario_steps": scenario_steps
+    }
+    job = scheduler.submit(session_id, client_id, request.priority, lambda: run_test_background(job_spec))
     
+    started = job.started_at is not None
     return TestResponse(
         session_id=session_id,
-        status="started",
-        message="Test started successfully"
+        status="started" if started else "queued",
+        message="Test started successfully" if started else f"Test queued at position {scheduler.position(session_id)}"
     )
 
-async def run_test_background(session_id: str, url: str, test_name: str):
-    """Run the test in background and capture output"""
+async def run_test_background(job_spec: Dict):
+    """Hand the test to a worker and wait until it reports back"""
+    session_id = job_spec["session_id"]
+    loop = asyncio.get_running_loop()
+    pending_runs[session_id] = loop.create_future()
     try:
-        session = active_sessions[session_id]
-        session["status"] = "running"
-        
-        # Create a custom output capture class
-        class OutputCapture:
-            def __init__(self, session_id: str):
-                self.session_id = session_id
-                self.output_buffer = []
-            
-            def write(self, text: str):
-                if text.strip():
-                    self.output_buffer.append(text.strip())
-                    # Send to WebSocket if connected
-                    asyncio.create_task(broadcast_output(self.session_id, text))
-            
-            def flush(self):
-                pass
-        
-        # Capture stdout
-        import io
-        import contextlib
-        
-        # Run the test with output capture
-        tester = IntelligentWebsiteTester()
-        
-        # Override the console print method to capture output
-        original_print = tester.console.print
-        
-        def capture_print(*args, **kwargs):
-            # Convert Rich objects to plain text
-            text = " ".join(str(arg) for arg in args)
-            session["output"].append(text)
-            asyncio.create_task(broadcast_output(session_id, text))
-            original_print(*args, **kwargs)
-        
-        tester.console.print = capture_print
-        
-        # Run the test
-        success = tester.run_intelligent_test(url, test_name)
-        
-        # Store results
-        session["results"] = {
-            "success": success,
-            "test_results": tester.test_results,
-            "scraped_content": tester.scraped_content,
-            "report": tester.get_test_report()
-        }
-        
-        session["status"] = "completed" if success else "failed"
+        await loop.run_in_executor(None, bus.enqueue, job_spec)
+        await asyncio.wait_for(asyncio.shield(pending_runs[session_id]), job_spec["deadline_seconds"] + WORKER_REPORT_GRACE)
+    except asyncio.TimeoutError:
+        # The worker died or lost its connection; free the slot and say so
+        apply_worker_event({
+            "type": "finished", "session_id": session_id, "status": "error",
+            "error": "No result from the tester worker before the deadline"
+        })
+    except Exception as e:
+        apply_worker_event({"type": "finished", "session_id": session_id, "status": "error", "error": str(e)})
+    finally:
+        pending_runs.pop(session_id, None)
+
+def apply_worker_event(event: Dict):
+    """Fold one bus event into the local session mirror and push it to connected clients"""
+    kind = event.get("type")
+    if kind == "worker":
+        track_worker(event)
+        return
+    
+    session_id = event.get("session_id")
+    if kind == "created":
+        if session_id not in active_sessions:
+            active_sessions[session_id] = event["session"]
+            sync_dashboard(session_id)
+        return
+    
+    session = active_sessions.get(session_id)
+    if session is None or session.get("completed"):
+        return
+    
+    if kind == "status":
+        session["status"] = event["status"]
+        session["worker_id"] = event.get("worker_id")
+        sync_dashboard(session_id)
+    
+    elif kind == "output":
+        session["output"].append(event["message"])
+        asyncio.create_task(broadcast_output(session_id, event["message"]))
+    
+    elif kind == "analysis_chunk":
+        asyncio.create_task(manager.broadcast_event(session_id, {"type": "analysis_chunk", "message": event["message"]}))
+    
+    elif kind == "finished":
+        results = event.get("results") or {}
+        session["results"] = results
+        session["status"] = event["status"]
+        if event["status"] == "cancelled":
+            session["cancel_reason"] = event.get("cancel_reason")
+            session["cancel_latency_s"] = results.get("cancel_latency_s", event.get("cancel_latency_s"))
+            completion_msg = f"\n🛑 Test cancelled: {event.get('cancel_reason')}"
+        elif event["status"] == "error":
+            session["error"] = event.get("error")
+            completion_msg = f"\n❌ Error: {event.get('error')}"
+        else:
+            success = results.get("success")
+            completion_msg = f"\n🎉 Test {'completed successfully' if success else 'completed with issues'}"
         session["completed"] = True
+        session["completed_at"] = time.time()
         
         # Send completion message
-        completion_msg = f"\n🎉 Test {'completed successfully' if success else 'completed with issues'}"
         session["output"].append(completion_msg)
         asyncio.create_task(broadcast_output(session_id, completion_msg))
+        sync_dashboard(session_id)
         
-    except Exception as e:
-        session = active_sessions.get(session_id, {})
-        session["status"] = "error"
-        session["error"] = str(e)
-        error_msg = f"\n❌ Error: {str(e)}"
-        session["output"].append(error_msg)
-        asyncio.create_task(broadcast_output(session_id, error_msg))
+        future = pending_runs.get(session_id)
+        if future:
+            # Only the dispatching process records history and persists the snapshot
+            if not future.done():
+                future.set_result(event["status"])
+            record_session_history(session_id, session, event.get("started_at") or time.time())
+            asyncio.get_running_loop().run_in_executor(None, bus.save_session, session_id, session)
+
+def track_worker(event: Dict):
+    if event.get("state") == "down":
+        workers.pop(event["worker_id"], None)
+    else:
+        workers[event["worker_id"]] = {
+            "slots": event.get("slots", 1),
+            "completed": event.get("completed", 0),
+            "last_seen": time.time()
+        }
+    update_capacity()
+
+def update_capacity():
+    slots = sum(worker["slots"] for worker in workers.values())
+    if slots:
+        # Desktops are the capacity; the adaptive Orgo limit bounds calls in flight, not desktops
+        scheduler.set_max_concurrency(min(MAX_CONCURRENT_DESKTOPS, slots))
+
+async def expire_workers_periodically():
+    while True:
+        await asyncio.sleep(WORKER_HEARTBEAT_INTERVAL)
+        cutoff = time.time() - 3 * WORKER_HEARTBEAT_INTERVAL
+        for worker_id in [w for w, info in workers.items() if info["last_seen"] < cutoff]:
+            del workers[worker_id]
+        update_capacity()
+
+def expire_sessions(now: Optional[float] = None) -> List[str]:
+    """Forget completed sessions older than SESSION_TTL, with their cached payloads and dashboard rows"""
+    now = now or time.time()
+    expired = []
+    for session_id, session in list(active_sessions.items()):
+        if not session.get("completed"):
+            continue
+        # Snapshots loaded from the bus at startup get a full TTL from then
+        if now - session.setdefault("completed_at", now) >= SESSION_TTL:
+            del active_sessions[session_id]
+            payload_cache.discard(session_id)
+            dashboard.remove(session_id)
+            expired.append(session_id)
+    return expired
+
+async def expire_sessions_periodically():
+    while True:
+        await asyncio.sleep(max(1, min(SESSION_TTL, 60)))
+        expire_sessions()
 
 @app.get("/test-status/{session_id}")
-async def get_test_status(session_id: str):
+async def get_test_status(session_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. status,test_results")):
     """Get the current status of a test"""
     if session_id not in active_sessions:
         raise HTTPException(status_code=404, detail="Test session not found")
     
     session = active_sessions[session_id]
+    selected = canonical_fields(parse_fields(fields), STATUS_FIELDS, session.get("results", {}))
+    
+    def build():
+        return select_fields({
+            "session_id": session_id,
+            "status": session["status"],
+            "url": session["url"],
+            "test_name": session["test_name"],
+            "scenario": session.get("scenario"),
+            "scenario_steps": session.get("scenario_steps"),
+            "completed": session.get("completed", False),
+            "output_count": len(session.get("output", [])),
+            "cancel_latency_s": session.get("cancel_latency_s"),
+            "results": session.get("results", {})
+        }, selected, nested_key="results")
+    
+    if session.get("completed"):
+        return json_response(payload_cache.get_or_build((session_id, "status", selected), build))
+    return json_response(json_bytes(build()))
+
+@app.delete("/test/{session_id}")
+async def cancel_test(session_id: str):
+    """Cancel a running test and release its desktop immediately"""
+    if session_id not in active_sessions:
+        raise HTTPException(status_code=404, detail="Test session not found")
+    
+    session = active_sessions[session_id]
+    if session.get("completed"):
+        return {"session_id": session_id, "status": session["status"], "cancelled": False}
+    
+    # A job that never left the queue holds no resources
+    if scheduler.cancel(session_id):
+        apply_worker_event({
+            "type": "finished", "session_id": session_id, "status": "cancelled",
+            "cancel_reason": "cancelled by client", "cancel_latency_s": 0.0
+        })
+        return {"session_id": session_id, "status": "cancelled", "cancelled": True, "cancel_latency_s": 0.0}
+    
+    # The worker running it destroys the desktop and reports the cancel latency when done
+    await asyncio.get_running_loop().run_in_executor(
+        None, bus.publish, CONTROL_CHANNEL, {"type": "cancel", "session_id": session_id, "reason": "cancelled by client"}
+    )
+    # An in-process worker may already have reported the cancelled run
+    if not session.get("completed"):
+        session["status"] = "cancelling"
+        sync_dashboard(session_id)
+    
     return {
         "session_id": session_id,
         "status": session["status"],
-        "url": session["url"],
-        "test_name": session["test_name"],
-        "completed": session.get("completed", False),
-        "output_count": len(session.get("output", [])),
-        "results": session.get("results", {})
+        "cancelled": True,
+        "cancel_latency_s": session.get("cancel_latency_s")
+    }
+
+@app.get("/workers")
+async def get_workers():
+    """Live tester workers and the capacity they give the scheduler"""
+    return {
+        "workers": workers,
+        "total_slots": sum(worker["slots"] for worker in workers.values()),
+        "max_concurrency": scheduler.max_concurrency,
+        "bus": type(bus).__name__,
+        "bus_queue_depth": bus.queue_depth()
+    }
+
+@app.get("/dashboard")
+async def get_dashboard(since: Optional[int] = Query(None, ge=0), instance: Optional[str] = Query(None),
+                        if_none_match: Optional[str] = Header(None)):
+    """Summaries of all sessions, or only those changed after version `since` of the same `instance`"""
+    headers = {"ETag": dashboard.etag, "Cache-Control": "no-cache"}
+    if if_none_match == dashboard.etag:
+        return Response(status_code=304, headers=headers)
+    body = dashboard.delta_payload(since, instance) if since is not None else dashboard.payload()[0]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/dashboard/stream")
+async def stream_dashboard(request: Request):
+    """Server-sent events: a full snapshot, then changed session summaries as they happen"""
+    subscriber = dashboard.subscribe()
+    
+    async def events():
+        try:
+            yield f"event: snapshot\ndata: {dashboard.payload()[0].decode()}\n\n"
+            async for sessions in dashboard.changes(subscriber):
+                if await request.is_disconnected():
+                    break
+                if not sessions:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: sessions\ndata: {json.dumps(dashboard.changes_payload(sessions))}\n\n"
+        finally:
+            dashboard.unsubscribe(subscriber)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/scenarios")
+async def list_scenarios():
+    """Registered test scenario templates"""
+    return {"scenarios": [SCENARIOS.get(name).to_dict() for name in SCENARIOS.names()]}
+
+@app.get("/scenarios/{name}")
+async def render_scenario(name: str, url: str, request: Request):
+    """Render one scenario for a URL; other query parameters fill its variables"""
+    if name not in SCENARIOS:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    template = SCENARIOS.get(name)
+    values = {k: v for k, v in request.query_params.items() if k in template.variables and k != "url"}
+    return {"name": name, "url": url, "steps": template.render_steps(url=url, **values)}
+
+@app.get("/queue")
+async def get_queue():
+    """Pending jobs in start order, running jobs and queue metrics"""
+    return scheduler.snapshot()
+
+@app.get("/queue/metrics")
+async def get_queue_metrics():
+    """Queue depth, wait time percentiles and throughput counters"""
+    return scheduler.metrics()
+
+@app.get("/queue/{session_id}")
+async def get_queue_position(session_id: str):
+    """Where a session currently sits in the queue"""
+    if session_id not in active_sessions:
+        raise HTTPException(status_code=404, detail="Test session not found")
+    session = active_sessions[session_id]
+    return {
+        "session_id": session_id,
+        "status": session["status"],
+        "priority": session.get("priority"),
+        "client_id": session.get("client_id"),
+        "position": scheduler.position(session_id)
     }
 
 @app.get("/test-output/{session_id}")
@@ -173,7 +551,7 @@ async def get_test_output(session_id: str):
     }
 
 @app.get("/parsed-report/{session_id}")
-async def get_parsed_report(session_id: str):
+async def get_parsed_report(session_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. structured_data,test_results")):
     """Get structured report data"""
     if session_id not in active_sessions:
         raise HTTPException(status_code=404, detail="Test session not found")
@@ -182,17 +560,97 @@ async def get_parsed_report(session_id: str):
     if not session.get("completed", False):
         raise HTTPException(status_code=400, detail="Test not completed yet")
     
-    results = session.get("results", {})
+    selected = canonical_fields(parse_fields(fields), PARSED_REPORT_FIELDS)
     
-    # Parse the output to extract structured data
-    structured_data = parse_output_to_structured(session.get("output", []))
+    def build():
+        results = session.get("results", {})
+        
+        # Runs that produced summary data need no output parsing
+        summary = results.get("summary")
+        structured_data = structured_from_summary(summary) if summary else parse_output_to_structured(session.get("output", []))
+        
+        return select_fields({
+            "session_id": session_id,
+            "structured_data": structured_data,
+            "test_results": results.get("test_results", []),
+            "scraped_content": results.get("scraped_content", {}),
+            "report": results.get("report", {})
+        }, selected)
     
+    return json_response(payload_cache.get_or_build((session_id, "parsed-report", selected), build))
+
+@app.get("/metrics/payloads")
+async def get_payload_cache_stats():
+    """Size and hit rate of the precomputed completed-session payloads"""
+    return payload_cache.stats()
+
+@app.get("/history")
+async def get_history(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    url: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """Paginated run history, newest first"""
+    if not history_store:
+        raise HTTPException(status_code=503, detail="Run history is disabled")
+    return history_store.history(page=page, page_size=page_size, url=url, status=status)
+
+@app.get("/history/trends")
+async def get_history_trends(url: str, days: int = Query(30, ge=1, le=365)):
+    """Daily pass rate for a URL"""
+    if not history_store:
+        raise HTTPException(status_code=503, detail="Run history is disabled")
+    return {"url": url, "days": days, "trend": history_store.pass_rate_trend(url, days=days)}
+
+@app.get("/history/latency")
+async def get_history_latency(
+    stage: Optional[str] = None,
+    url: Optional[str] = None,
+    days: Optional[int] = Query(None, ge=1, le=365)
+):
+    """Stage latency percentiles (p50/p90/p99)"""
+    if not history_store:
+        raise HTTPException(status_code=503, detail="Run history is disabled")
+    return {"stages": history_store.stage_percentiles(stage=stage, url=url, days=days)}
+
+@app.get("/history/performance")
+async def get_history_performance(
+    url: str,
+    metric: Optional[str] = None,
+    days: Optional[int] = Query(None, ge=1, le=365)
+):
+    """Site performance percentiles (p50/p90/p99) for a URL: DNS, connect, TLS, TTFB, download, sizes"""
+    if not history_store:
+        raise HTTPException(status_code=503, detail="Run history is disabled")
+    return {"url": url, "metrics": history_store.site_metric_percentiles(url, metric=metric, days=days)}
+
+@app.post("/history/plan")
+async def plan_runs(request: PlanRequest):
+    """Which URLs to test and in what order, from past pass rates, flakiness, durations and page changes"""
+    if not history_store:
+        raise HTTPException(status_code=503, detail="Run history is disabled")
+    return await asyncio.get_running_loop().run_in_executor(
+        None, lambda: build_plan(request.urls, store=history_store, budget_s=request.budget_s,
+                                 lanes=request.lanes or scheduler.max_concurrency)
+    )
+
+@app.get("/metrics/resilience")
+async def get_resilience_stats():
+    """Retry, deadline and circuit breaker counters, and adaptive concurrency limits, for Orgo, LLM and HTTP calls"""
+    return get_resilience_metrics()
+
+def structured_from_summary(summary: Dict) -> Dict:
+    """The tester's summary data in the shape parse_output_to_structured produces"""
     return {
-        "session_id": session_id,
-        "structured_data": structured_data,
-        "test_results": results.get("test_results", []),
-        "scraped_content": results.get("scraped_content", {}),
-        "report": results.get("report", {})
+        "website_info": summary["website_info"],
+        "content_statistics": summary["content_statistics"],
+        "test_results": [
+            {"test": r["test"], "status": r["status"], "details": r["details"], "time": r["timestamp"]}
+            for r in summary["test_results"]
+        ],
+        "ai_analysis": summary.get("ai_analysis") or "",
+        "final_assessment": {key: summary["final_assessment"][key] for key in ("overall", "success_rate", "recommendation")},
     }
 
 def parse_output_to_structured(output_lines: List[str]) -> Dict:
@@ -292,14 +750,15 @@ class ConnectionManager:
         await websocket.send_text(message)
     
     async def broadcast_to_session(self, message: str, session_id: str):
+        await self.broadcast_event(session_id, {"type": "output", "message": message})
+    
+    async def broadcast_event(self, session_id: str, event: Dict):
+        """Send a typed event (output, analysis_chunk, ...) to every client of a session"""
         if session_id in self.active_connections:
-            for connection in self.active_connections[session_id]:
+            payload = json.dumps(dict(event, timestamp=asyncio.get_event_loop().time()))
+            for connection in list(self.active_connections[session_id]):
                 try:
-                    await connection.send_text(json.dumps({
-                        "type": "output",
-                        "message": message,
-                        "timestamp": asyncio.get_event_loop().time()
-                    }))
+                    await connection.send_text(payload)
                 except:
                     # Remove dead connections
                     self.active_connections[session_id].remove(connection)
@@ -308,8 +767,25 @@ manager = ConnectionManager()
 
 async def broadcast_output(session_id: str, message: str):
     """Broadcast output to all connected WebSocket clients for this session"""
+    sync_dashboard(session_id)
     await manager.broadcast_to_session(message, session_id)
 
+@app.websocket("/dashboard/ws")
+async def dashboard_websocket(websocket: WebSocket):
+    """WebSocket variant of /dashboard/stream"""
+    await websocket.accept()
+    subscriber = dashboard.subscribe()
+    try:
+        await websocket.send_text(json.dumps({"type": "snapshot", **json.loads(dashboard.payload()[0])}))
+        async for sessions in dashboard.changes(subscriber):
+            # Heartbeats double as disconnect detection
+            event = {"type": "sessions", **dashboard.changes_payload(sessions)} if sessions else {"type": "keep-alive"}
+            await websocket.send_text(json.dumps(event))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        dashboard.unsubscribe(subscriber)
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await manager.connect(websocket, session_id)
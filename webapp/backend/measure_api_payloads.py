@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Payload size and latency of the session endpoints under concurrent polling.
+
+Runs the app in-process against synthetic completed sessions with realistic
+scraped_content, so no Orgo desktop or network is needed:
+
+    python measure_api_payloads.py --sessions 50 --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+import main
+
+
+def make_session(index: int) -> dict:
+    paragraphs = [f"Paragraph {i} of page {index}: " + "lorem ipsum dolor sit amet " * 12 for i in range(40)]
+    return {
+        "status": "completed",
+        "url": f"https://site{index}.example.com",
+        "test_name": "Load Test",
+        "client_id": "load",
+        "priority": "normal",
+        "output": [f"✅ Step {i}: PASS" for i in range(120)],
+        "completed": True,
+        "results": {
+            "success": True,
+            "test_results": [{"test": f"Test {i}", "status": "PASS", "details": "ok", "timestamp": "12:00:00"} for i in range(8)],
+            "scraped_content": {
+                "title": f"Site {index}",
+                "headings": [f"Heading {i}" for i in range(30)],
+                "paragraphs": paragraphs,
+                "links": [{"text": f"Link {i}", "href": f"https://site{index}.example.com/{i}"} for i in range(150)],
+                "buttons": [f"Button {i}" for i in range(20)],
+                "total_text": " ".join(paragraphs)[:5000],
+            },
+            "ai_analysis": "Analysis " * 300,
+            "report": {"total_tests": 8, "passed": 8, "failed": 0},
+        },
+    }
+
+
+async def measure(client, session_ids, path, params, headers, requests, concurrency):
+    latencies, sizes = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path.format(session=session_ids[i % len(session_ids)]), params=params, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            # Bytes on the wire, before httpx decompresses the body
+            sizes.append(response.num_bytes_downloaded)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    latencies.sort()
+    return {
+        "bytes": round(sum(sizes) / len(sizes)),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+    }
+
+
+async def run(sessions, requests, concurrency):
+    session_ids = []
+    for index in range(sessions):
+        session_id = str(uuid.uuid4())
+        main.active_sessions[session_id] = make_session(index)
+        session_ids.append(session_id)
+
+    scenarios = [
+        ("/test-status/{session}", None, {"Accept-Encoding": "identity"}),
+        ("/test-status/{session}", None, {"Accept-Encoding": "gzip, br"}),
+        ("/test-status/{session}", {"fields": "status,completed,test_results"}, {"Accept-Encoding": "gzip, br"}),
+        ("/parsed-report/{session}", None, {"Accept-Encoding": "identity"}),
+        ("/parsed-report/{session}", None, {"Accept-Encoding": "gzip, br"}),
+        ("/parsed-report/{session}", {"fields": "structured_data"}, {"Accept-Encoding": "gzip, br"}),
+    ]
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        for path, params, headers in scenarios:
+            result = await measure(client, session_ids, path, params, headers, requests, concurrency)
+            label = f"{path.split('/')[1]} fields={params['fields'] if params else '*'} {headers['Accept-Encoding']}"
+            print(f"📦 {label:<70} {result['bytes']:>8} B  p50 {result['p50_ms']:>7} ms  p99 {result['p99_ms']:>7} ms")
+
+    print(f"🗄️  Payload cache: {main.payload_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.requests, args.concurrency))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Throughput of the API tier as tester worker processes are added.
+
+Starts the Redis stand-in, runs the API in-process against it and, for each
+worker count, launches that many `worker.py --simulate` processes, submits a
+batch of tests and times how long they take to finish:
+
+    python measure_worker_scaling.py --workers 1 2 4 --jobs 40 --job-seconds 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_workers(main, slots: int, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while sum(w["slots"] for w in main.workers.values()) < slots:
+        if time.time() > deadline:
+            raise RuntimeError(f"Only {len(main.workers)} workers registered")
+        await asyncio.sleep(0.1)
+
+
+async def run_batch(client, main, jobs: int) -> float:
+    started = time.perf_counter()
+    session_ids = []
+    for index in range(jobs):
+        response = await client.post("/run-test", json={"url": f"https://site{index}.example.com", "client_id": f"c{index % 4}"})
+        session_ids.append(response.json()["session_id"])
+    while not all(main.active_sessions[sid].get("completed") for sid in session_ids):
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    failed = [sid for sid in session_ids if main.active_sessions[sid]["status"] != "completed"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} jobs did not complete: {main.active_sessions[failed[0]]['status']}")
+    return elapsed
+
+
+async def run(worker_counts, jobs, job_seconds, concurrency):
+    import httpx
+    import main
+
+    await main.app.router.startup()
+    transport = httpx.ASGITransport(app=main.app)
+    env = dict(os.environ)
+    baseline = None
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        for count in worker_counts:
+            processes = [
+                subprocess.Popen([sys.executable, str(HERE / "worker.py"), "--simulate", str(job_seconds),
+                                  "--concurrency", str(concurrency)], env=env, stdout=subprocess.DEVNULL)
+                for _ in range(count)
+            ]
+            try:
+                await wait_for_workers(main, count * concurrency)
+                elapsed = await run_batch(client, main, jobs)
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait()
+                main.workers.clear()
+
+            throughput = jobs / elapsed
+            baseline = baseline or throughput
+            ideal = count * concurrency / job_seconds
+            print(f"👷 {count} worker(s) x {concurrency} slot(s): {jobs} jobs in {elapsed:.2f}s = "
+                  f"{throughput:.1f} jobs/s ({throughput / baseline:.2f}x, ideal {ideal:.1f} jobs/s)")
+
+    await main.app.router.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--job-seconds", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=1, help="Slots per worker process")
+    args = parser.parse_args()
+
+    port = free_port()
+    standin = subprocess.Popen([sys.executable, str(HERE / "redis_standin.py"), "--port", str(port)], stdout=subprocess.DEVNULL)
+    os.environ["JOB_BUS_URL"] = f"redis://127.0.0.1:{port}/0"
+    os.environ["LOCAL_WORKERS"] = "0"
+    os.environ["WORKER_HEARTBEAT_INTERVAL"] = "0.5"
+    os.environ["MAX_CONCURRENT_DESKTOPS"] = str(max(args.workers) * args.concurrency)
+    os.environ["RUN_HISTORY_DB"] = ""
+    time.sleep(0.5)
+    try:
+        asyncio.run(run(args.workers, args.jobs, args.job_seconds, args.concurrency))
+    finally:
+        standin.terminate()
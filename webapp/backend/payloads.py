@@ -0,0 +1,114 @@
+import json
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from fastapi.responses import Response
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """"status, results.test_results" -> ("results.test_results", "status"); None means everything"""
+    if not fields:
+        return None
+    return tuple(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+
+
+def canonical_fields(fields: Optional[Tuple[str, ...]], known, nested=()) -> Optional[Tuple[str, ...]]:
+    """Drop requested fields that name no known key, so misspelt or made-up names share one cache entry.
+
+    known are the payload's top-level keys, nested the keys under its nested_key.
+    """
+    if fields is None:
+        return None
+    return tuple(f for f in fields if f.split(".")[0] in known or f.split(".")[0] in nested)
+
+
+def select_fields(payload: Dict, fields: Optional[Tuple[str, ...]], nested_key: Optional[str] = None) -> Dict:
+    """Keep only the requested fields.
+
+    Dotted names reach into nested dicts. A plain name that is not a top-level
+    key is looked up under nested_key, so ?fields=test_results works on
+    /test-status where test results live under "results".
+    """
+    if fields is None:
+        return payload
+
+    selected: Dict = {}
+    for field in fields:
+        path = field.split(".")
+        if path[0] not in payload and nested_key and isinstance(payload.get(nested_key), dict):
+            if path[0] not in payload[nested_key]:
+                continue
+            path = [nested_key] + path
+
+        source, target = payload, selected
+        for key in path[:-1]:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+            target = target.setdefault(key, {})
+        else:
+            if isinstance(source, dict) and path[-1] in source:
+                target[path[-1]] = source[path[-1]]
+    return selected
+
+
+def json_bytes(payload: Dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class PayloadCache:
+    """Serialized responses for sessions that can no longer change.
+
+    Keys are (session_id, endpoint, canonical fields). At most max_entries are
+    kept, least recently used first out; discard drops a session's entries
+    when it expires.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._payloads: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._by_session: Dict[str, Set[Tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: Tuple, build: Callable[[], Dict]) -> bytes:
+        body = self._payloads.get(key)
+        if body is not None:
+            self.hits += 1
+            self._payloads.move_to_end(key)
+            return body
+
+        self.misses += 1
+        body = self._payloads[key] = json_bytes(build())
+        self._by_session.setdefault(key[0], set()).add(key)
+        while len(self._payloads) > self.max_entries:
+            oldest, _ = self._payloads.popitem(last=False)
+            self._forget(oldest)
+            self.evictions += 1
+        return body
+
+    def _forget(self, key: Tuple):
+        keys = self._by_session.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_session[key[0]]
+
+    def discard(self, session_id: str):
+        for key in self._by_session.pop(session_id, ()):
+            self._payloads.pop(key, None)
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._payloads),
+            "max_entries": self.max_entries,
+            "bytes": sum(len(body) for body in self._payloads.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
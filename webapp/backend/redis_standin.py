@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Minimal Redis-compatible server for running the API and workers locally.
+
+Speaks RESP2 and implements only the commands RedisBus uses (lists with
+blocking pops, pub/sub, hashes), all in memory:
+
+    python redis_standin.py --port 6390
+    JOB_BUS_URL=redis://localhost:6390/0 python worker.py
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set
+
+
+def encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b"+OK\r\n" if value else b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class RedisStandin:
+    def __init__(self):
+        self.lists: Dict[bytes, deque] = defaultdict(deque)
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = defaultdict(dict)
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = defaultdict(set)
+        self.waiters: Dict[bytes, deque] = defaultdict(deque)
+
+    async def read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: Set[bytes] = set()
+        try:
+            while True:
+                args = await self.read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                command = args[0].upper().decode()
+                handler = getattr(self, f"cmd_{command.lower()}", None)
+                if command in ("SUBSCRIBE", "UNSUBSCRIBE"):
+                    self.pubsub(command, args[1:], writer, subscriptions)
+                elif command == "BLPOP":
+                    writer.write(encode(await self.blpop(reader, *args[1:])))
+                elif handler is None:
+                    writer.write(f"-ERR unknown command '{command}'\r\n".encode())
+                else:
+                    reply = handler(*args[1:])
+                    if asyncio.iscoroutine(reply):
+                        reply = await reply
+                    writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self.channels[channel].discard(writer)
+            writer.close()
+
+    def pubsub(self, command, channels, writer, subscriptions):
+        if command == "UNSUBSCRIBE" and not channels:
+            channels = list(subscriptions)
+        for channel in channels:
+            if command == "SUBSCRIBE":
+                subscriptions.add(channel)
+                self.channels[channel].add(writer)
+            else:
+                subscriptions.discard(channel)
+                self.channels[channel].discard(writer)
+            writer.write(encode([command.lower(), channel, len(subscriptions)]))
+
+    def cmd_ping(self, message=None):
+        return message if message is not None else True
+
+    def cmd_echo(self, message):
+        return message
+
+    def cmd_client(self, *args):
+        return True
+
+    def cmd_select(self, db):
+        return True
+
+    def cmd_rpush(self, key, *values):
+        for value in values:
+            self._push(key, value)
+        return len(self.lists[key])
+
+    def _push(self, key, value):
+        # Hand the value straight to the oldest blocked BLPOP whose client is still connected
+        waiters = self.waiters[key]
+        while waiters:
+            waiter, reader = waiters.popleft()
+            if not waiter.done() and not reader.at_eof():
+                waiter.set_result([key, value])
+                return
+        self.lists[key].append(value)
+
+    async def blpop(self, reader, *args):
+        keys, timeout = args[:-1], float(args[-1])
+        for key in keys:
+            if self.lists[key]:
+                return [key, self.lists[key].popleft()]
+
+        waiter = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self.waiters[key].append((waiter, reader))
+        try:
+            return await asyncio.wait_for(waiter, timeout=timeout or None)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            for key in keys:
+                if (waiter, reader) in self.waiters[key]:
+                    self.waiters[key].remove((waiter, reader))
+
+    def cmd_llen(self, key):
+        return len(self.lists[key])
+
+    def cmd_publish(self, channel, message):
+        subscribers = list(self.channels[channel])
+        for subscriber in subscribers:
+            subscriber.write(encode([b"message", channel, message]))
+        return len(subscribers)
+
+    def cmd_hset(self, key, *pairs):
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in self.hashes[key]
+            self.hashes[key][field] = value
+        return added
+
+    def cmd_hgetall(self, key):
+        return [item for pair in self.hashes[key].items() for item in pair]
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += bool(self.lists.pop(key, None) or self.hashes.pop(key, None))
+        return removed
+
+
+async def serve(host: str, port: int):
+    standin = RedisStandin()
+    server = await asyncio.start_server(standin.handle, host, port)
+    print(f"🧱 Redis stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
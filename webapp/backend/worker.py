@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Tester worker: takes test jobs from the bus and publishes their progress.
+
+The API runs these in-process when JOB_BUS_URL is empty. With a shared bus,
+start as many worker processes as there are desktops to spare:
+
+    JOB_BUS_URL=redis://localhost:6390/0 python worker.py --concurrency 2
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from run_control import CancelToken, RunCancelled
+from bus import get_bus, InProcessBus, EVENTS_CHANNEL, CONTROL_CHANNEL
+
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "5"))
+# Clients get status lines and the summary as data, so nothing needs drawing on the worker
+WORKER_RENDERER = os.getenv("WORKER_RENDERER", "none")
+
+
+def run_intelligent_job(job: Dict, emit: Callable[[Dict], None], cancel_token: CancelToken) -> Dict:
+    """Run IntelligentWebsiteTester for one job, streaming its status messages as events"""
+    from intelligent_website_tester import IntelligentWebsiteTester
+
+    session_id = job["session_id"]
+    tester = IntelligentWebsiteTester(cancel_token=cancel_token, renderer=WORKER_RENDERER, skip_checks=job.get("skip_checks", ()),
+                                      content_source=job.get("content_source"), scenario_steps=job.get("scenario_steps"))
+    # The API records history itself so runs are batched and keyed by session
+    tester.history_store = None
+    tester.console.on_message = lambda message: emit({"type": "output", "session_id": session_id, "message": message})
+    tester.on_analysis_chunk = lambda text: emit({"type": "analysis_chunk", "session_id": session_id, "message": text})
+
+    success = tester.run_intelligent_test(job["url"], job["test_name"])
+    return {
+        "success": success,
+        "test_results": tester.test_results,
+        "scraped_content": tester.scraped_content,
+        "ai_analysis": tester.ai_analysis,
+        "analysis_metrics": tester.analysis_metrics,
+        "stage_timings": tester.stage_timings,
+        "performance": tester.performance,
+        "resource_usage": tester.resource_usage,
+        "summary": tester.summary,
+        "fingerprint": tester.content_fingerprint(),
+        "report": tester.get_test_report(),
+        "cancel_latency_s": tester.cancel_latency()
+    }
+
+
+def simulated_job(duration: float) -> Callable:
+    """Stand-in for a desktop run that only takes time, for load tests"""
+    def run(job: Dict, emit: Callable[[Dict], None], cancel_token: CancelToken) -> Dict:
+        steps = 5
+        for step in range(1, steps + 1):
+            cancel_token.sleep(duration / steps)
+            emit({"type": "output", "session_id": job["session_id"], "message": f"✅ Simulated step {step}/{steps}"})
+        return {
+            "success": True,
+            "test_results": [{"test": "Simulated", "status": "PASS", "details": f"{duration}s"}],
+            "report": {"total_tests": 1, "passed": 1, "failed": 0},
+            "stage_timings": {"simulated": duration}
+        }
+    return run
+
+
+class TesterWorker:
+    """Pulls jobs from the bus on `concurrency` threads, one desktop per thread"""
+
+    def __init__(self, bus, concurrency: int = 1, run_job: Callable = run_intelligent_job,
+                 worker_id: Optional[str] = None):
+        self.bus = bus
+        self.concurrency = max(1, concurrency)
+        self.run_job = run_job
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.completed = 0
+        self._tokens: Dict[str, CancelToken] = {}
+        # Cancels that arrive before the job is picked up
+        self._cancelled_early = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._unsubscribe = None
+
+    def emit(self, event: Dict):
+        self.bus.publish(EVENTS_CHANNEL, dict(event, worker_id=self.worker_id))
+
+    def start(self):
+        self._unsubscribe = self.bus.subscribe(CONTROL_CHANNEL, self.on_control)
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, name=f"tester-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="tester-worker-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        print(f"👷 Worker {self.worker_id} started with {self.concurrency} slot(s)")
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            tokens = list(self._tokens.values())
+        for token in tokens:
+            token.cancel("worker shutting down")
+        if self._unsubscribe:
+            self._unsubscribe()
+        self.emit({"type": "worker", "state": "down", "slots": 0})
+
+    def _heartbeat(self):
+        while not self._stopped.is_set():
+            self.emit({"type": "worker", "state": "up", "slots": self.concurrency, "completed": self.completed})
+            self._stopped.wait(WORKER_HEARTBEAT_INTERVAL)
+
+    def on_control(self, message: Dict):
+        if message.get("type") != "cancel":
+            return
+        session_id = message["session_id"]
+        with self._lock:
+            token = self._tokens.get(session_id)
+            if not token:
+                self._cancelled_early.append(session_id)
+                return
+        # Cancel callbacks destroy the desktop synchronously; keep the bus thread free
+        threading.Thread(target=token.cancel, args=(message.get("reason", "cancelled"),), daemon=True).start()
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            try:
+                job = self.bus.dequeue(timeout=1.0)
+            except Exception as e:
+                print(f"⚠️  Warning: Could not read job queue: {e}")
+                self._stopped.wait(1.0)
+                continue
+            if job:
+                self.process(job)
+
+    def process(self, job: Dict):
+        session_id = job["session_id"]
+        token = CancelToken(job.get("deadline_seconds"))
+        with self._lock:
+            self._tokens[session_id] = token
+            if session_id in self._cancelled_early:
+                self._cancelled_early.remove(session_id)
+                token.cancel("cancelled by client")
+
+        started_at = time.time()
+        event = {"type": "finished", "session_id": session_id, "started_at": started_at}
+        try:
+            self.emit({"type": "status", "session_id": session_id, "status": "running"})
+            token.check()
+            results = self.run_job(job, self.emit, token)
+            event["results"] = results
+            event["status"] = "completed" if results.get("success") else "failed"
+        except RunCancelled:
+            event["status"] = "cancelled"
+        except Exception as e:
+            event["status"] = "error"
+            event["error"] = str(e)
+        finally:
+            token.finish()
+            with self._lock:
+                self._tokens.pop(session_id, None)
+            if token.cancelled:
+                event.update(status="cancelled", cancel_reason=token.reason)
+            self.completed += 1
+            self.emit(event)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run tester jobs from the shared job bus")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("WORKER_CONCURRENCY", "1")),
+                        help="Tests run at once by this worker (one Orgo desktop each)")
+    parser.add_argument("--simulate", type=float, default=None, metavar="SECONDS",
+                        help="Replace real desktop runs with jobs that just take this long (load testing)")
+    args = parser.parse_args()
+
+    bus = get_bus()
+    if isinstance(bus, InProcessBus):
+        print("❌ Set JOB_BUS_URL so the worker can reach the API's job queue")
+        sys.exit(1)
+
+    worker = TesterWorker(bus, args.concurrency, simulated_job(args.simulate) if args.simulate else run_intelligent_job)
+    worker.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("🛑 Stopping worker...")
+    finally:
+        worker.stop()
+        bus.close()
@@ -27,6 +27,7 @@ function App() {
   const [currentSession, setCurrentSession] = useState<TestSession | null>(null);
   const [terminalOutput, setTerminalOutput] = useState<string[]>([]);
   const [structuredData, setStructuredData] = useState<StructuredData | null>(null);
+  const [streamingAnalysis, setStreamingAnalysis] = useState('');
   const [wsConnection, setWsConnection] = useState<WebSocket | null>(null);
   const terminalRef = useRef<HTMLDivElement>(null);
 
@@ -46,6 +47,7 @@ function App() {
     setIsRunning(true);
     setTerminalOutput([]);
     setStructuredData(null);
+    setStreamingAnalysis('');
 
     try {
       // Start the test
@@ -75,8 +77,8 @@ function App() {
         // Connect to WebSocket for real-time updates
         connectWebSocket(data.session_id);
         
-        // Start polling for status updates
-        pollTestStatus(data.session_id);
+        // Follow status updates from the dashboard stream
+        watchDashboard(data.session_id);
       }
     } catch (error) {
       console.error('Error starting test:', error);
@@ -97,6 +99,8 @@ function App() {
         const data = JSON.parse(event.data);
         if (data.type === 'output') {
           setTerminalOutput(prev => [...prev, data.message]);
+        } else if (data.type === 'analysis_chunk') {
+          setStreamingAnalysis(prev => prev + data.message);
         }
       } catch (error) {
         console.error('Error parsing WebSocket message:', error);
@@ -114,39 +118,92 @@ function App() {
     setWsConnection(ws);
   };
 
-  const pollTestStatus = async (sessionId: string) => {
-    const pollInterval = setInterval(async () => {
-      try {
-        const response = await fetch(`/test-status/${sessionId}`);
-        const data = await response.json();
-        
-        setCurrentSession(prev => prev ? { ...prev, ...data } : null);
+  const watchDashboard = (sessionId: string) => {
+    // One shared stream of session summaries replaces per-session status polling;
+    // the full report is fetched once, when the session completes
+    const events = new EventSource('/dashboard/stream');
+    // Set once the session completes; instance and version let polling ask for changes only
+    let done = false;
+    let instance: string | null = null;
+    let version: number | null = null;
+
+    const handleSummaries = async (sessions: any[]) => {
+      const summary = sessions.find((s: any) => s.session_id === sessionId);
+      if (!summary) return;
+
+      // A tombstone: the session expired on the server before we saw it complete
+      if (summary.removed) {
+        if (done) return;
+        done = true;
+        events.close();
+        setIsRunning(false);
+        setTerminalOutput(prev => [...prev, '❌ The test session expired before it completed']);
+        return;
+      }
 
-        if (data.completed) {
-          clearInterval(pollInterval);
-          setIsRunning(false);
-          
-          // Get structured report
-          try {
-            const reportResponse = await fetch(`/parsed-report/${sessionId}`);
-            const reportData = await reportResponse.json();
-            setStructuredData(reportData.structured_data);
-          } catch (error) {
-            console.error('Error fetching report:', error);
-          }
-
-          // Close WebSocket
-          if (wsConnection) {
-            wsConnection.close();
-            setWsConnection(null);
-          }
+      setCurrentSession(prev => prev ? { ...prev, ...summary } : null);
+
+      if (summary.completed) {
+        if (done) return;
+        done = true;
+        events.close();
+        setIsRunning(false);
+
+        // Get structured report
+        try {
+          const reportResponse = await fetch(`/parsed-report/${sessionId}`);
+          const reportData = await reportResponse.json();
+          setStructuredData(reportData.structured_data);
+        } catch (error) {
+          console.error('Error fetching report:', error);
         }
+
+        // Close WebSocket
+        if (wsConnection) {
+          wsConnection.close();
+          setWsConnection(null);
+        }
+      }
+    };
+
+    const onMessage = (event: MessageEvent) => {
+      try {
+        const data = JSON.parse(event.data);
+        instance = data.instance;
+        version = data.version;
+        handleSummaries(data.sessions);
       } catch (error) {
-        console.error('Error polling status:', error);
-        clearInterval(pollInterval);
+        console.error('Error parsing dashboard event:', error);
+      }
+    };
+
+    // Without the stream (proxy timeout, API restart), poll the dashboard for changes instead
+
+    const pollDashboard = async () => {
+      try {
+        const query = version !== null && instance ? `?since=${version}&instance=${instance}` : '';
+        const response = await fetch(`/dashboard${query}`);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const data = await response.json();
+        // A delta only makes sense against the same API instance; otherwise this is a full snapshot
+        instance = data.instance;
+        version = data.version;
+        await handleSummaries(data.sessions);
+        if (!done) setTimeout(pollDashboard, 2000);
+      } catch (error) {
+        console.error('Error polling dashboard:', error);
+        setTerminalOutput(prev => [...prev, `❌ Lost track of the test: ${error}`]);
         setIsRunning(false);
       }
-    }, 1000);
+    };
+
+    events.addEventListener('snapshot', onMessage as EventListener);
+    events.addEventListener('sessions', onMessage as EventListener);
+    events.onerror = (error) => {
+      console.error('Dashboard stream error:', error);
+      events.close();
+      if (!done) pollDashboard();
+    };
   };
 
   const copyToClipboard = (text: string) => {
@@ -328,6 +385,20 @@ function App() {
           </div>
         )}
 
+        {/* Live AI Analysis */}
+        {streamingAnalysis && !structuredData && (
+          <div className="card max-w-4xl mx-auto mb-8">
+            <div className="card-header">
+              <h2 className="card-title">AI Analysis (live)</h2>
+            </div>
+            <div className="bg-gray-50 p-4 rounded-lg">
+              <pre className="whitespace-pre-wrap text-sm text-gray-700">
+                {streamingAnalysis}
+              </pre>
+            </div>
+          </div>
+        )}
+
         {/* Structured Results */}
         {structuredData && (
           <div className="card max-w-4xl mx-auto mb-8">
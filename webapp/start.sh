@@ -17,6 +17,17 @@ cp ../.env backend/
 # Start backend
 echo "🔧 Starting backend server..."
 cd backend
+if [ -n "$WORKERS" ]; then
+    # Scale out: API tier plus $WORKERS tester worker processes on a local Redis stand-in
+    export JOB_BUS_URL=${JOB_BUS_URL:-redis://127.0.0.1:6390/0}
+    python redis_standin.py --port 6390 &
+    BUS_PID=$!
+    sleep 1
+    for i in $(seq "$WORKERS"); do
+        python worker.py &
+        WORKER_PIDS="$WORKER_PIDS $!"
+    done
+fi
 python main.py &
 BACKEND_PID=$!
 cd ..
@@ -39,5 +50,5 @@ echo ""
 echo "Press Ctrl+C to stop both servers"
 
 # Wait for user to stop
-trap "echo ''; echo '🛑 Stopping servers...'; kill $BACKEND_PID $FRONTEND_PID; exit" INT
+trap "echo ''; echo '🛑 Stopping servers...'; kill $BACKEND_PID $FRONTEND_PID $WORKER_PIDS $BUS_PID; exit" INT
 wait 
\ No newline at end of file